@@ -15,12 +15,12 @@ Provides access to commonly used functions.
 import logging
 from cablemap.core.models import cable_from_file, cable_from_html, cable_from_row
 from cablemap.core.handler import handle_source
-from cablemap.core.utils import cables_from_source, cables_from_directory, cables_from_csv, cable_by_id, cable_by_url
+from cablemap.core.utils import cables_from_source, cables_from_directory, cables_from_csv, cable_by_id, cables_by_ids, cable_by_url
 from logging import NullHandler
 
 __all__ = ['cable_from_file', 'cable_from_html', 'cable_from_row',
            'cables_from_source', 'cables_from_directory', 'cables_from_csv',
-           'cable_by_id', 'cable_by_url', 'handle_source'
+           'cable_by_id', 'cables_by_ids', 'cable_by_url', 'handle_source'
            ]
 
 _nh = NullHandler()
@@ -14,6 +14,7 @@ Canonicalization utility functions.
 """
 from __future__ import absolute_import
 import re
+from collections import namedtuple
 from cablemap.core.consts import MALFORMED_CABLE_IDS, INVALID_CABLE_IDS
 
 _STATION_C14N = {
@@ -181,10 +182,100 @@ def canonicalize_origin(origin):
     return _STATION_C14N.get(origin, origin)
 
 
+CacheInfo = namedtuple('CacheInfo', 'hits misses maxsize currsize')
+
+
+class Cache(object):
+    """\
+    Caches the results of a function with one argument.
+
+    The cache keeps two generations of at most `maxsize` entries each, so it
+    holds up to ``2 * maxsize`` entries. If the current generation is full,
+    it becomes the previous generation and the entries of the previous
+    generation are dropped unless they are used again. This approximates a
+    LRU cache without bookkeeping per lookup. Equal arguments share the
+    cached result object.
+
+    `func`
+        The function which computes the result of an argument. It must not
+        return ``None``.
+    `maxsize`
+        The max. number of entries per generation.
+    """
+    def __init__(self, func, maxsize):
+        self._func = func
+        self.maxsize = maxsize
+        self.clear()
+
+    def __call__(self, key):
+        try:
+            value = self._current[key]
+            self.hits += 1
+            return value
+        except KeyError:
+            pass
+        value = self._previous.pop(key, None)
+        if value is None:
+            self.misses += 1
+            value = self._func(key)
+        else:
+            self.hits += 1
+        self._store(key, value)
+        return value
+
+    def map(self, keys):
+        """\
+        Returns a list of the results for the provided `keys`.
+        """
+        current, func, res = self._current, self._func, []
+        append = res.append
+        hits = 0
+        for key in keys:
+            value = current.get(key)
+            if value is not None:
+                hits += 1
+            else:
+                value = self._previous.pop(key, None)
+                if value is None:
+                    self.misses += 1
+                    value = func(key)
+                else:
+                    hits += 1
+                self._store(key, value)
+                current = self._current
+            append(value)
+        self.hits += hits
+        return res
+
+    def _store(self, key, value):
+        if len(self._current) >= self.maxsize:
+            self._previous, self._current = self._current, {}
+        self._current[key] = value
+
+    def info(self):
+        """\
+        Returns the statistics of the cache as `CacheInfo`.
+
+        The ``currsize`` counts the entries of both generations and may
+        exceed ``maxsize`` (the size of a generation).
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._current) + len(self._previous))
+
+    def clear(self):
+        """\
+        Removes all entries and resets the statistics.
+        """
+        self._current, self._previous = {}, {}
+        self.hits = self.misses = 0
+
+
 def canonicalize_id(reference_id):
     """\
     Returns the canonicalized form of the provided reference_id.
 
+    The results of up to 200000 identifiers are cached (c.f. `Cache`),
+    c.f. ``canonicalize_id.cache_info()`` and ``canonicalize_id.cache_clear()``.
+
     WikiLeaks provides some malformed cable identifiers. If the provided `reference_id`
     is not valid, this method returns the valid reference identifier equivalent.
     If the reference identifier is valid, the reference id is returned unchanged.
@@ -197,6 +288,21 @@ def canonicalize_id(reference_id):
     `reference_id`
         The cable identifier to canonicalize
     """
+    return _ID_CACHE(reference_id)
+
+
+def canonicalize_ids(reference_ids):
+    """\
+    Returns a list of the canonicalized forms of the provided reference
+    identifiers, c.f. `canonicalize_id`.
+
+    `reference_ids`
+        An iterable of cable identifiers to canonicalize.
+    """
+    return _ID_CACHE.map(reference_ids)
+
+
+def _canonicalize_id(reference_id):
     rid = MALFORMED_CABLE_IDS.get(reference_id, None) or INVALID_CABLE_IDS.get(reference_id, None)
     if rid:
         reference_id = rid
@@ -206,6 +312,10 @@ def canonicalize_id(reference_id):
         return reference_id.replace(origin, canonicalize_origin(origin))
     return reference_id
 
+_ID_CACHE = Cache(_canonicalize_id, 100000)
+canonicalize_id.cache_info = _ID_CACHE.info
+canonicalize_id.cache_clear = _ID_CACHE.clear
+
 _SURNAME_C14N = {
     u'ADDELTON': u'ADDLETON',
     u'ALLGEIR': u'ALLGEIER',
@@ -144,6 +144,44 @@ _STATIONS = (
 
 REFERENCE_ID_PATTERN = re.compile(r'^([0-9]{2})(%s)([0-9]{%d,%d})$' % ('|'.join(_STATIONS), MIN_SERIAL_LENGTH, MAX_SERIAL_LENGTH), re.UNICODE)
 
+_STATION_SET = frozenset(_STATIONS)
+
+# Matches the structure of a reference identifier, the station is looked up
+# in `_STATION_SET` instead of matching the alternation of all stations
+_REFERENCE_ID_PARTS = re.compile(r'([0-9]{2})([^0-9]+)([0-9]{%d,%d})$' % (MIN_SERIAL_LENGTH, MAX_SERIAL_LENGTH), re.UNICODE)
+
+def split_reference_id(reference_id, _match=_REFERENCE_ID_PARTS.match, _stations=_STATION_SET):
+    """\
+    Returns a ``(year, station, serial number)`` tuple of the provided
+    `reference_id` or ``None`` if it is not a valid reference identifier.
+
+    Accepts the same identifiers as `REFERENCE_ID_PATTERN`.
+
+    `reference_id`
+        A reference identifier, i.e. ``09BERLIN1167``.
+    """
+    m = _match(reference_id)
+    if m and m.group(2) in _stations:
+        return m.groups()
+    return None
+
+
+def split_reference_ids(reference_ids):
+    """\
+    Returns a list of ``(year, station, serial number)`` tuples or ``None``
+    values for the provided reference identifiers, c.f. `split_reference_id`.
+
+    `reference_ids`
+        An iterable of reference identifiers.
+    """
+    match, stations = _REFERENCE_ID_PARTS.match, _STATION_SET
+    res = []
+    append = res.append
+    for reference_id in reference_ids:
+        m = match(reference_id)
+        append(m.groups() if m and m.group(2) in stations else None)
+    return res
+
 # Wrong WikiLeaks cable identifiers
 # These cable identifiers are cables which exist in two versions: One with the
 # correct cable identifier and one with the incorrect cable id.
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+A binary log of cable events.
+
+The `EventLogCableHandler` records the events of the cables, `replay` issues
+the recorded events to another handler without parsing the cables again::
+
+    handle_source('cables.csv', EventLogCableHandler('cables.events.gz'))
+    replay('cables.events.gz', handler)
+
+The log keeps one record per cable: the length of the record followed by
+the marshalled events of the cable.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+from __future__ import absolute_import, with_statement
+import gzip
+import struct
+import marshal
+from .models import Reference, Recipient
+from .handler import CABLE_EVENTS, consumed_events, resolve_event
+from .interfaces import ICableHandler, implements
+
+_MAGIC = 'cablemap-events-1'
+_GZIP_MAGIC = '\x1f\x8b'
+
+_LENGTH = struct.Struct('<I')
+
+# The recorded events, the position of an event is its code in the log
+_EVENT_NAMES = ('start_cable',) + tuple(sorted(CABLE_EVENTS))
+_EVENT_CODES = dict((name, code) for code, name in enumerate(_EVENT_NAMES))
+
+# Events which are issued with tuple subclasses which cannot be marshalled
+_ARGUMENT_TYPES = {
+    'handle_reference': Reference,
+    'handle_recipient': Recipient,
+    'handle_info_recipient': Recipient,
+}
+
+
+def _open(log, mode, compress):
+    """\
+    Returns a file object and if the file was opened by this function.
+    """
+    if not isinstance(log, basestring):
+        return log, False
+    if compress is None:
+        if 'r' in mode:
+            with open(log, 'rb') as f:
+                compress = f.read(2) == _GZIP_MAGIC
+        else:
+            compress = log.endswith('.gz')
+    return (gzip.open if compress else open)(log, mode), True
+
+
+class EventLogCableHandler(object):
+    """\
+    `ICableHandler` which writes all events into a binary log, c.f. `replay`.
+    """
+    implements(ICableHandler)
+
+    def __init__(self, log, compress=None):
+        """\
+
+        `log`
+            A filename or a file object opened in binary mode.
+        `compress`
+            Indicates if the log should be compressed with gzip. By default
+            (``None``), a log is compressed if the filename ends with ``.gz``.
+            Ignored if `log` is a file object.
+        """
+        self._log = log
+        self._compress = compress
+        self._file = None
+        self._close = False
+        self._events = []
+
+    consumed_events = CABLE_EVENTS
+
+    def start(self):
+        self._file, self._close = _open(self._log, 'wb', self._compress)
+        self._file.write('%s\n%s\n' % (_MAGIC, '\t'.join(_EVENT_NAMES)))
+
+    def end(self):
+        if self._close:
+            self._file.close()
+        else:
+            self._file.flush()
+        self._file = None
+
+    def end_cable(self):
+        data = marshal.dumps(self._events)
+        self._file.write(_LENGTH.pack(len(data)))
+        self._file.write(data)
+        del self._events[:]
+
+    def resolve_event(self, name):
+        if name in ('start', 'end', 'end_cable'):
+            return getattr(self, name)
+        code = _EVENT_CODES.get(name)
+        if code is None:
+            raise AttributeError(name)
+        append = self._events.append
+        if name in _ARGUMENT_TYPES:
+            def record(value):
+                append((code, (tuple(value),)))
+        else:
+            def record(*args):
+                append((code, args))
+        return record
+
+    def __getattr__(self, name):
+        return self.resolve_event(name)
+
+
+def replay(log, handler, predicate=None):
+    """\
+    Issues the events of the provided `log` to the `handler`.
+
+    `log`
+        A filename or a file object opened in binary mode. Compressed
+        logs are detected automatically.
+    `handler`
+        The `ICableHandler` instance which should receive the events.
+        Only the events the handler consumes are issued, c.f.
+        `cablemap.core.handler.consumed_events`.
+    `predicate`
+        A predicate that is invoked for each cable reference identifier.
+        If the predicate evaluates to ``False`` the cable is ignored.
+        By default, all cables are used.
+    """
+    f, close = _open(log, 'rb', None)
+    try:
+        magic = f.readline().rstrip('\n')
+        if magic != _MAGIC:
+            raise ValueError('Unsupported event log format "%s"' % magic)
+        names = f.readline().rstrip('\n').split('\t')
+        wanted = consumed_events(handler)
+        funcs = []
+        for name in names:
+            if name in CABLE_EVENTS and name not in wanted:
+                funcs.append(None)
+                continue
+            func = resolve_event(handler, name)
+            cls = _ARGUMENT_TYPES.get(name)
+            if cls:
+                func = _decoding(func, cls)
+            funcs.append(func)
+        end_cable = resolve_event(handler, 'end_cable')
+        read, unpack, loads, size = f.read, _LENGTH.unpack, marshal.loads, _LENGTH.size
+        resolve_event(handler, 'start')()
+        while True:
+            data = read(size)
+            if not data:
+                break
+            events = loads(read(unpack(data)[0]))
+            if predicate and not predicate(events[0][1][0]):
+                continue
+            for code, args in events:
+                func = funcs[code]
+                if func:
+                    func(*args)
+            end_cable()
+        resolve_event(handler, 'end')()
+    finally:
+        if close:
+            f.close()
+
+
+def _decoding(func, cls):
+    def decode(value):
+        func(tuple.__new__(cls, value))
+    return decode
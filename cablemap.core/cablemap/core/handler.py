@@ -13,21 +13,93 @@ This module defines a event handlers to process cables.
 :license:      BSD license
 """
 from __future__ import absolute_import
+import os
+import sys
+import codecs
+import socket
+import httplib
 import logging
 import urllib2
-from .utils import cables_from_source, titlefy
+import threading
+import time
+from Queue import Queue
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+from .models import cable_from_row, cable_from_file
+from .utils import cables_from_source, rows_from_csv, cablefiles_from_directory, titlefy
+from .store import is_store, cables_from_store, cable_from_columns, COLUMNS
+from .predicates import cable_filter
+from .tags import tag_kind
 from .interfaces import ICableHandler, implements
 
+# Maps the events to the cable attributes they are based on
+_EVENT_ATTRIBUTES = {
+    'handle_wikileaks_iri': 'wl_uris',
+    'handle_creation_datetime': 'created',
+    'handle_release_date': 'released',
+    'handle_nondisclosure_deadline': 'nondisclosure_deadline',
+    'handle_transmission_id': 'transmission_id',
+    'handle_subject': 'subject',
+    'handle_summary': 'summary',
+    'handle_comment': 'comment',
+    'handle_header': 'header',
+    'handle_content': 'content',
+    'handle_origin': 'origin',
+    'handle_classification': 'classification',
+    'handle_partial': 'is_partial',
+    'handle_classification_category': 'classification_categories',
+    'handle_classificationist': 'classified_by',
+    'handle_signer': 'signed_by',
+    'handle_tag': 'tags',
+    'handle_media_iri': 'media_uris',
+    'handle_recipient': 'recipients',
+    'handle_info_recipient': 'info_recipients',
+    'handle_reference': 'references',
+}
+
+# The events which are issued per cable, between start_cable and end_cable
+CABLE_EVENTS = frozenset(_EVENT_ATTRIBUTES)
+
+# The events which frame the cables and the events of a cable
+_FRAME_EVENTS = ('start', 'end', 'start_cable', 'end_cable')
+
+
+def _noop(*args):
+    pass
+
 
 class NoopCableHandler(object):
     """\
     `ICableHandler` implementation which does nothing.
     """
     implements(ICableHandler)
-    
+
+    @property
+    def consumed_events(self):
+        """\
+        Returns the events for which the handler (or a subclass) provides
+        a method or the handler instance provides a callable.
+        """
+        cls, attrs = type(self), getattr(self, '__dict__', {})
+        # Events which were answered by `__getattr__` are kept as `_noop`
+        return frozenset(name for name in CABLE_EVENTS
+                         if hasattr(cls, name) or attrs.get(name, _noop) is not _noop)
+
+    def resolve_event(self, name):
+        """\
+        Returns the method of the handler (or a subclass) for the event `name`.
+        """
+        if _overrides_getattr(self, NoopCableHandler):
+            return _late_bound(self, name)
+        try:
+            return object.__getattribute__(self, name)
+        except AttributeError:
+            return _noop
+
     def __getattr__(self, name):
-        def noop(*args): pass
-        return noop
+        return _cache_event(self, name)
 
 
 class DelegatingCableHandler(object):
@@ -44,8 +116,20 @@ class DelegatingCableHandler(object):
         """
         self._handler = handler
 
+    @property
+    def consumed_events(self):
+        return consumed_events(self._handler)
+
+    def resolve_event(self, name):
+        if _overrides_getattr(self, DelegatingCableHandler):
+            return _late_bound(self, name)
+        try:
+            return object.__getattribute__(self, name)
+        except AttributeError:
+            return resolve_event(self._handler, name)
+
     def __getattr__(self, name):
-        return getattr(self._handler, name)
+        return _cache_event(self, name)
 
 
 class LoggingCableHandler(object):
@@ -66,12 +150,20 @@ class LoggingCableHandler(object):
         self._handler = handler
         self.level = level
 
-    def __getattr__(self, name):
+    @property
+    def consumed_events(self):
+        return consumed_events(self._handler)
+
+    def resolve_event(self, name):
+        func = resolve_event(self._handler, name)
         def logme(*args):
             getattr(logging, self.level)('%s%r' % (name, args))
-            getattr(self._handler, name)(*args)
+            func(*args)
         return logme
 
+    def __getattr__(self, name):
+        return _cache_event(self, name)
+
 
 class TeeCableHandler(object):
     """\
@@ -91,11 +183,15 @@ class TeeCableHandler(object):
         self._first = first
         self._second = second
 
+    @property
+    def consumed_events(self):
+        return consumed_events(self._first) | consumed_events(self._second)
+
+    def resolve_event(self, name):
+        return _combine([resolve_event(self._first, name), resolve_event(self._second, name)])
+
     def __getattr__(self, name):
-        def delegate(*args):
-            getattr(self._first, name)(*args)
-            getattr(self._second, name)(*args)
-        return delegate
+        return _cache_event(self, name)
 
 
 class MultipleCableHandler(object):
@@ -113,11 +209,117 @@ class MultipleCableHandler(object):
         """
         self._handlers = tuple(handlers)
 
+    @property
+    def consumed_events(self):
+        return frozenset().union(*[consumed_events(handler) for handler in self._handlers])
+
+    def resolve_event(self, name):
+        return _combine([resolve_event(handler, name) for handler in self._handlers])
+
     def __getattr__(self, name):
-        def delegate(*args):
-            for handler in self._handlers:
-                getattr(handler, name)(*args)
-        return delegate
+        return _cache_event(self, name)
+
+
+# Stops the thread of a ParallelMultipleCableHandler child
+_STOP = object()
+
+class ParallelMultipleCableHandler(object):
+    """\
+    A `ICableHandler` which delegates the events to multiple underlying
+    `ICableHandler` instances. Each handler receives the events within
+    its own thread, so a slow handler does not block the others.
+
+    The events of a cable are queued when the cable ends; each handler
+    receives them in the order they were issued. If a queue is full,
+    issuing further events blocks until the handler caught up.
+    An exception raised by a handler is re-raised by `end`, the handler
+    does not receive further events.
+    """
+    implements(ICableHandler)
+
+    def __init__(self, handlers, queue_size=64):
+        """\
+
+        `handlers`
+            An iterable of ICableMapHandler instances.
+        `queue_size`
+            The max. number of cables which are queued per handler
+            (default: ``64``).
+        """
+        self._handlers = tuple(handlers)
+        self._queue_size = queue_size
+        self._queues = ()
+        self._threads = ()
+        self._errors = []
+        self._events = []
+
+    @property
+    def consumed_events(self):
+        return frozenset().union(*[consumed_events(handler) for handler in self._handlers])
+
+    def start(self):
+        self._errors = []
+        del self._events[:]
+        self._queues = tuple(Queue(self._queue_size) for _ in self._handlers)
+        self._threads = tuple(threading.Thread(target=self._run, args=(handler, queue))
+                              for handler, queue in zip(self._handlers, self._queues))
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+        self._put([('start', ())])
+
+    def end(self):
+        self._flush('end')
+        self._put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._queues, self._threads = (), ()
+        if self._errors:
+            exc_type, exc_value, tb = self._errors[0]
+            raise exc_type, exc_value, tb
+
+    def end_cable(self):
+        self._flush('end_cable')
+
+    def resolve_event(self, name):
+        if name in ('start', 'end', 'end_cable'):
+            return getattr(self, name)
+        append = self._events.append
+        def enqueue(*args):
+            append((name, args))
+        return enqueue
+
+    def __getattr__(self, name):
+        return _cache_event(self, name)
+
+    def _flush(self, name):
+        self._events.append((name, ()))
+        events = self._events[:]
+        del self._events[:]
+        self._put(events)
+
+    def _put(self, item):
+        for queue in self._queues:
+            queue.put(item)
+
+    def _run(self, handler, queue):
+        dispatch = {}
+        failed = False
+        while True:
+            events = queue.get()
+            if events is _STOP:
+                break
+            if failed:
+                continue
+            try:
+                for name, args in events:
+                    func = dispatch.get(name)
+                    if func is None:
+                        func = dispatch[name] = resolve_event(handler, name)
+                    func(*args)
+            except Exception:
+                self._errors.append(sys.exc_info())
+                failed = True
 
 
 class CableIdFilter(DelegatingCableHandler):
@@ -154,13 +356,48 @@ class CableIdFilter(DelegatingCableHandler):
         if self._accept:
             self._handler.start_cable(reference_id, canonical_id)
 
+    def resolve_event(self, name):
+        if name in ('start', 'end', 'start_cable'):
+            return getattr(self, name)
+        func = resolve_event(self._handler, name)
+        if func is _noop:
+            return _noop
+        def delegate(*args):
+            if self._accept:
+                func(*args)
+        return delegate
+
     def __getattr__(self, name):
-        def noop(*args): pass
         if self._accept:
-            return super(CableIdFilter, self).__getattr__(name)
-        return noop
+            return getattr(self._handler, name)
+        return _noop
 
 
+class TagKindFilter(DelegatingCableHandler):
+    """\
+    `DelegatingCableHandler` which passes only TAGs of the provided kinds to
+    the underlying handler, c.f. `cablemap.core.tags.tag_kind`.
+    """
+    def __init__(self, handler, kinds):
+        """\
+        Creates the `TagKindFilter` handler.
+
+        `handler`
+            The `ICableHandler` which should receive the events.
+        `kinds`
+            An iterable of TAG kinds, i.e. ``(consts.TAG_KIND_PERSON,)``.
+        """
+        super(TagKindFilter, self).__init__(handler)
+        self._kinds = frozenset(kinds)
+
+    def handle_tag(self, tag):
+        if tag_kind(tag) in self._kinds:
+            self._handler.handle_tag(tag)
+
+
+# Events which are swallowed by the DefaultMetadataOnlyFilter
+_METADATA_ONLY_OMITTED_EVENTS = frozenset(['handle_release_date', 'handle_content', 'handle_header'])
+
 class DefaultMetadataOnlyFilter(DelegatingCableHandler):
     """\
     ICableHandler implementation that acts as filter to omit the
@@ -179,6 +416,10 @@ class DefaultMetadataOnlyFilter(DelegatingCableHandler):
         if titlefy_subject:
             self.handle_subject = self._handle_subject_titlefy
 
+    @property
+    def consumed_events(self):
+        return consumed_events(self._handler) - _METADATA_ONLY_OMITTED_EVENTS
+
     def handle_wikileaks_iri(self, iri):
         if iri.startswith(u'http://wikileaks.org') and iri.endswith(u'html'):
             self._handler.handle_wikileaks_iri(iri)
@@ -201,12 +442,34 @@ class DefaultMetadataOnlyFilter(DelegatingCableHandler):
 class DebitlyFilter(DelegatingCableHandler):
     """\
     `DelegatingCableHandler` implementation that expands `bit.ly <http://bit.ly>`_ media IRIs
+
+    The IRIs are expanded by a pool of threads. The expansion of a media IRI
+    starts as soon as the IRI is received, the media IRIs are issued before
+    the next other event. Hence, all shortened IRIs of a cable are expanded
+    concurrently and the order of the events is kept. An IRI which cannot be
+    expanded within the `budget` is issued as it is.
     """
-    def __init__(self, handler):
+    def __init__(self, handler, cache=None, workers=8, timeout=10, budget=3,
+                 shorteners=(u'http://bit.ly',)):
         """\
 
         `handler`
             The ICableHandler which should receive the (filtered) events.
+        `cache`
+            A filename of a file which keeps the expanded IRIs across runs
+            (default: ``None``, the IRIs are kept in memory only).
+            The file is created if it does not exist.
+        `workers`
+            The max. number of concurrent requests (default: ``8``).
+        `timeout`
+            The timeout of a request in seconds (default: ``10``).
+        `budget`
+            The max. number of seconds a cable waits for the expansion of
+            its IRIs (default: ``3``). An IRI which is not expanded within
+            the budget keeps expanding, ``end`` waits for it and writes it
+            into the `cache`.
+        `shorteners`
+            The IRI prefixes of the shortened IRIs.
         """
         super(DebitlyFilter, self).__init__(handler)
         self._bitly2url = {
@@ -214,21 +477,325 @@ class DebitlyFilter(DelegatingCableHandler):
             # the IRI is:
             u'http://bit.ly/mDfYBE': u'http://www.haiti-liberte.com/archives/volume4-46/Les%20c%C3%A2bles%20de%20WikiLeaks%20sur%20Ha%C3%AFti%20publi%C3%A9s%20par%20Ha%C3%AFti%20Libert%C3%A9.asp'
         }
+        self._cache = cache
+        if cache and os.path.isfile(cache):
+            self._bitly2url.update(_read_iri_cache(cache))
+        self._expanded = {}
+        self._workers = workers
+        self._timeout = timeout
+        self._budget = budget
+        self._shorteners = tuple(shorteners)
+        self._pool = None
+        self._pending = {}
+        self._iris = []
+
+    def prefetch(self, iris):
+        """\
+        Starts the expansion of the provided IRIs.
+
+        `iris`
+            An iterable of IRIs. IRIs which are not shortened or which
+            are known are ignored.
+        """
+        for iri in iris:
+            if iri.startswith(self._shorteners) and iri not in self._bitly2url and iri not in self._pending:
+                if self._pool is None:
+                    self._pool = ThreadPool(self._workers)
+                self._pending[iri] = self._pool.apply_async(_expand_iri, (iri, self._timeout))
+
+    def resolve_event(self, name):
+        func = super(DebitlyFilter, self).resolve_event(name)
+        if name not in CABLE_EVENTS or name == 'handle_media_iri' or func is _noop:
+            return func
+        def issue_iris_first(*args):
+            if self._iris:
+                self._issue_iris()
+            func(*args)
+        return issue_iris_first
+
+    def start(self):
+        self._handler.start()
+
+    def end(self):
+        self._issue_iris()
+        self._close()
+        self._handler.end()
+
+    def end_cable(self):
+        self._issue_iris()
+        self._handler.end_cable()
 
     def handle_media_iri(self, iri):
-        class HeadRequest(urllib2.Request):
-            def get_method(self):
-                return 'HEAD'
-        if iri.startswith(u'http://bit.ly'):
-            if not iri in self._bitly2url:
-                request = HeadRequest(iri)
-                try:
-                    response = urllib2.urlopen(request)
-                    self._bitly2url[iri] = response.geturl()
-                except urllib2.HTTPError:
-                    pass
-            iri = self._bitly2url.get(iri, iri)
-        self._handler.handle_media_iri(iri)
+        self.prefetch((iri,))
+        self._iris.append(iri)
+
+    def _issue_iris(self):
+        """\
+        Issues the collected media IRIs. Waits at most `budget` seconds for
+        all expansions.
+        """
+        if not self._iris:
+            return
+        iris, self._iris = self._iris, []
+        deadline = time.time() + self._budget
+        for iri in iris:
+            result = self._pending.get(iri)
+            if result is not None:
+                result.wait(max(deadline - time.time(), 0))
+                if result.ready():
+                    self._collect(iri)
+        handle_media_iri = self._handler.handle_media_iri
+        for iri in iris:
+            handle_media_iri(self._bitly2url.get(iri, iri))
+
+    def _collect(self, iri):
+        url = self._pending.pop(iri).get()
+        if url:
+            self._bitly2url[iri] = url
+            self._expanded[iri] = url
+
+    def _close(self):
+        if self._pool is not None:
+            # Let the pending requests finish, they are bound by the timeout
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        for iri in list(self._pending):
+            self._collect(iri)
+        if self._cache and self._expanded:
+            _write_iri_cache(self._cache, self._expanded)
+        self._expanded = {}
+
+
+class _HeadRequest(urllib2.Request):
+    def get_method(self):
+        return 'HEAD'
+
+
+def _expand_iri(iri, timeout):
+    """\
+    Returns the IRI the provided `iri` redirects to or ``None`` if the
+    request failed.
+    """
+    try:
+        response = urllib2.urlopen(_HeadRequest(iri), timeout=timeout)
+        try:
+            return response.geturl().decode('utf-8')
+        finally:
+            response.close()
+    except (urllib2.URLError, httplib.HTTPException, socket.error):
+        return None
+
+
+def _read_iri_cache(filename):
+    """\
+    Returns a dict of the IRIs of the provided cache file.
+    """
+    with codecs.open(filename, 'rb', 'utf-8') as f:
+        return dict(line.rstrip(u'\n').split(u'\t', 1) for line in f if u'\t' in line)
+
+
+def _write_iri_cache(filename, iris):
+    """\
+    Appends the provided dict of IRIs to the cache file.
+    """
+    with codecs.open(filename, 'ab', 'utf-8') as f:
+        for iri, url in sorted(iris.iteritems()):
+            f.write(u'%s\t%s\n' % (iri, url))
+
+
+def consumed_events(handler):
+    """\
+    Returns the names of the per-cable events (c.f. `CABLE_EVENTS`) which
+    the `handler` consumes.
+
+    A handler declares the events by a ``consumed_events`` class attribute
+    or property. If the handler does not declare them, all events are
+    returned.
+
+    `handler`
+        An `ICableHandler` instance.
+    """
+    # Check the type, many handlers answer every attribute by __getattr__
+    if hasattr(type(handler), 'consumed_events'):
+        return frozenset(handler.consumed_events)
+    return CABLE_EVENTS
+
+
+def resolve_event(handler, name):
+    """\
+    Returns a function which issues the event `name` to the `handler`.
+
+    A handler may provide a ``resolve_event(name)`` method which returns
+    the function, i.e. the methods of the underlying handlers instead of
+    a function which looks them up for each event. Otherwise, the method
+    of the `handler` is returned. If the `handler` answers the event by
+    ``__getattr__``, the event is looked up whenever it is issued.
+
+    `handler`
+        An `ICableHandler` instance.
+    `name`
+        The event name, i.e. ``start`` or ``handle_subject``.
+    """
+    # Check the type, many handlers answer every attribute by __getattr__
+    if hasattr(type(handler), 'resolve_event'):
+        return handler.resolve_event(name)
+    try:
+        return object.__getattribute__(handler, name)
+    except (AttributeError, TypeError):
+        return _late_bound(handler, name)
+
+
+def _late_bound(handler, name):
+    def dispatch(*args):
+        getattr(handler, name)(*args)
+    return dispatch
+
+
+def _overrides_getattr(handler, cls):
+    """\
+    Returns if a subclass of `cls` answers the events by its own ``__getattr__``.
+    """
+    return type(handler).__getattr__.im_func is not cls.__dict__['__getattr__']
+
+
+def _cache_event(handler, name):
+    """\
+    Resolves the event `name` and keeps the function as attribute of the
+    `handler`, the ``__getattr__`` of the handler is not invoked again for
+    the event.
+    """
+    func = handler.resolve_event(name)
+    if not name.startswith('__'):
+        handler.__dict__[name] = func
+    return func
+
+
+def _combine(funcs):
+    """\
+    Returns a function which invokes all provided functions.
+    """
+    funcs = tuple(func for func in funcs if func is not _noop)
+    if not funcs:
+        return _noop
+    if len(funcs) == 1:
+        return funcs[0]
+    if len(funcs) == 2:
+        first, second = funcs
+        def delegate(*args):
+            first(*args)
+            second(*args)
+        return delegate
+    def delegate(*args):
+        for func in funcs:
+            func(*args)
+    return delegate
+
+
+def _dispatcher(handler, events):
+    """\
+    Returns a dict which maps the frame events and the provided `events`
+    to the functions of the `handler`, c.f. `resolve_event`.
+    """
+    return dict((name, resolve_event(handler, name)) for name in _FRAME_EVENTS + tuple(events))
+
+
+def events_from_cable(cable, events=None):
+    """\
+    Returns a generator which yields ``(event-name, args)`` tuples for the
+    provided `cable`.
+
+    The first event is ``start_cable`` and the last event is ``end_cable``.
+
+    `cable`
+        A cable object.
+    `events`
+        A collection of event names (c.f. `CABLE_EVENTS`) which should be
+        issued. The cable properties of other events are not computed.
+        By default, all events are issued.
+    """
+    def datetime(dt):
+        date, time = dt.split(u' ')
+        if len(time) == 5:
+            time += u':00'
+        time += u'Z'
+        return u'T'.join([date, time])
+    wanted = CABLE_EVENTS if events is None else events
+    yield 'start_cable', (cable.reference_id, cable.canonical_id)
+    if 'handle_wikileaks_iri' in wanted:
+        for iri in cable.wl_uris:
+            yield 'handle_wikileaks_iri', (iri,)
+    if 'handle_creation_datetime' in wanted:
+        yield 'handle_creation_datetime', (datetime(cable.created),)
+    if 'handle_release_date' in wanted and cable.released:
+        yield 'handle_release_date', (cable.released[:10],)
+    if 'handle_nondisclosure_deadline' in wanted and cable.nondisclosure_deadline:
+        yield 'handle_nondisclosure_deadline', (cable.nondisclosure_deadline,)
+    if 'handle_transmission_id' in wanted and cable.transmission_id:
+        yield 'handle_transmission_id', (cable.transmission_id,)
+    if 'handle_subject' in wanted and cable.subject:
+        yield 'handle_subject', (cable.subject,)
+    if 'handle_summary' in wanted and cable.summary:
+        yield 'handle_summary', (cable.summary,)
+    if 'handle_comment' in wanted and cable.comment:
+        yield 'handle_comment', (cable.comment,)
+    if 'handle_header' in wanted:
+        yield 'handle_header', (cable.header,)
+    if 'handle_content' in wanted:
+        yield 'handle_content', (cable.content,)
+    if 'handle_origin' in wanted:
+        yield 'handle_origin', (cable.origin,)
+    if 'handle_classification' in wanted:
+        yield 'handle_classification', (cable.classification,)
+    if 'handle_partial' in wanted:
+        yield 'handle_partial', (cable.is_partial,)
+    if 'handle_classification_category' in wanted:
+        for cat in cable.classification_categories:
+            yield 'handle_classification_category', (cat,)
+    if 'handle_classificationist' in wanted:
+        for classificationist in cable.classified_by:
+            yield 'handle_classificationist', (classificationist,)
+    if 'handle_signer' in wanted:
+        for signer in cable.signed_by:
+            yield 'handle_signer', (signer,)
+    if 'handle_tag' in wanted:
+        for tag in cable.tags:
+            yield 'handle_tag', (tag,)
+    if 'handle_media_iri' in wanted:
+        for iri in cable.media_uris:
+            yield 'handle_media_iri', (iri,)
+    if 'handle_recipient' in wanted:
+        for rec in cable.recipients:
+            yield 'handle_recipient', (rec,)
+    if 'handle_info_recipient' in wanted:
+        for rec in cable.info_recipients:
+            yield 'handle_info_recipient', (rec,)
+    if 'handle_reference' in wanted:
+        for ref in cable.references:
+            yield 'handle_reference', (ref,)
+    yield 'end_cable', ()
+
+
+def handle_events(events, handler):
+    """\
+    Issues the provided `events` to the `handler`.
+
+    `events`
+        An iterable of ``(event-name, args)`` tuples, c.f. `events_from_cable`.
+    `handler`
+        The `ICableHandler` instance which should receive the events.
+    """
+    dispatch = {}
+    for name, args in events:
+        func = dispatch.get(name)
+        if func is None:
+            func = dispatch[name] = resolve_event(handler, name)
+        func(*args)
+
+
+def _dispatch_events(events, dispatch):
+    for name, args in events:
+        dispatch[name](*args)
 
 
 def handle_cable(cable, handler, standalone=True):
@@ -245,54 +812,13 @@ def handle_cable(cable, handler, standalone=True):
         If `standalone` is set to ``False``, no ``handler.start()``
         and ``handler.end()`` event will be issued.
     """
-    def datetime(dt):
-        date, time = dt.split(u' ')
-        if len(time) == 5:
-            time += u':00'
-        time += u'Z'
-        return u'T'.join([date, time])
+    events = consumed_events(handler)
+    dispatch = _dispatcher(handler, events)
     if standalone:
-        handler.start()
-    handler.start_cable(cable.reference_id, cable.canonical_id)
-    for iri in cable.wl_uris:
-        handler.handle_wikileaks_iri(iri)
-    handler.handle_creation_datetime(datetime(cable.created))
-    if cable.released:
-        handler.handle_release_date(cable.released[:10])
-    if cable.nondisclosure_deadline:
-        handler.handle_nondisclosure_deadline(cable.nondisclosure_deadline)
-    if cable.transmission_id:
-        handler.handle_transmission_id(cable.transmission_id)
-    if cable.subject:
-        handler.handle_subject(cable.subject)
-    if cable.summary:
-        handler.handle_summary(cable.summary)
-    if cable.comment:
-        handler.handle_comment(cable.comment)
-    handler.handle_header(cable.header)
-    handler.handle_content(cable.content)
-    handler.handle_origin(cable.origin)
-    handler.handle_classification(cable.classification)
-    handler.handle_partial(cable.partial)
-    for cat in cable.classification_categories:
-        handler.handle_classification_category(cat)
-    for classificationist in cable.classificationists:
-        handler.handle_classificationist(classificationist)
-    for signer in cable.signers:
-        handler.handle_signer(signer)
-    for tag in cable.tags:
-        handler.handle_tag(tag)
-    for iri in cable.media_uris:
-        handler.handle_media_iri(iri)
-    for rec in cable.recipients:
-        handler.handle_recipient(rec)
-    for rec in cable.info_recipients:
-        handler.handle_info_recipient(rec)
-    for ref in cable.references:
-        handler.handle_reference(ref)
-    handler.end_cable()
+        dispatch['start']()
+    _dispatch_events(events_from_cable(cable, events), dispatch)
     if standalone:
-        handler.end()
+        dispatch['end']()
 
 def handle_cables(cables, handler):
     """\
@@ -304,19 +830,72 @@ def handle_cables(cables, handler):
     `handler`
         The `ICableHandler` instance which should receive the events.
     """
-    handler.start()
+    events = consumed_events(handler)
+    dispatch = _dispatcher(handler, events)
+    dispatch['start']()
     for cable in cables:
-        handle_cable(cable, handler, False)
+        _dispatch_events(events_from_cable(cable, events), dispatch)
+    dispatch['end']()
+
+
+def handle_cables_batch(cables, handler, batch_size):
+    """\
+    Issues one ``handler.start()`` event, delivers the `cables` in lists
+    of `batch_size` cables to ``handler.handle_cable_batch`` and issues a
+    ``handler.end()`` event.
+
+    `cables`
+        An iterable of Cable objects.
+    `handler`
+        The `ICableBatchHandler` instance which should receive the cables.
+    `batch_size`
+        The max. number of cables per batch.
+    """
+    handle_batch = handler.handle_cable_batch
+    handler.start()
+    for batch in _chunks(cables, batch_size):
+        handle_batch(batch)
     handler.end()
 
 
-def handle_source(path, handler, predicate=None):
+def supports_batches(handler):
+    """\
+    Returns if the `handler` implements `ICableBatchHandler`, i.e. provides
+    a ``handle_cable_batch`` method.
+
+    `handler`
+        A handler instance.
+    """
+    # Check the type, many handlers answer every attribute by __getattr__
+    return hasattr(type(handler), 'handle_cable_batch')
+
+
+def consumed_attributes(handler):
+    """\
+    Returns the cable attributes (c.f. `cablemap.core.store.COLUMNS`) which
+    the `ICableBatchHandler` reads.
+
+    A handler declares the attributes by a ``consumed_attributes`` class
+    attribute or property. If the handler does not declare them, all
+    attributes are returned. The ``reference_id`` is returned always.
+
+    `handler`
+        An `ICableBatchHandler` instance.
+    """
+    if hasattr(type(handler), 'consumed_attributes'):
+        return frozenset(handler.consumed_attributes) | frozenset(['reference_id'])
+    return frozenset(COLUMNS)
+
+
+def handle_source(path, handler, predicate=None, workers=None, window=None, batch_size=None):
     """\
     Reads all cables from the provided source and issues events to
     the `handler`.
 
     `path`
-        Either a directory with cable files or a CSV file.
+        Either a directory with cable files, a cable store (c.f.
+        `cablemap.core.store`) or a CSV file. Cables from a store are
+        not parsed again.
     `handler`
         The `ICableHandler` instance which should receive the events.
     `predicate`
@@ -325,5 +904,115 @@ def handle_source(path, handler, predicate=None):
         By default, all cables are used.
         I.e. ``handle_source('cables.csv', handler, lambda r: r.startswith('09'))``
         would return cables where the reference identifier starts with ``09``.
+        Predicates from `cablemap.core.predicates` (i.e. ``year_in('09') & tag_in('PREL')``)
+        may depend on other attributes and let indexed sources skip cables.
+    `workers`
+        The number of worker processes which parse the cables. If `workers`
+        is ``None`` (default) or smaller than ``2``, the cables are parsed
+        by the current process. Ignored if `path` is a cable store.
+        The `handler` receives the events always within the current process
+        and in the order of the source.
+    `window`
+        The max. number of cables which are parsed by the workers but
+        not yet issued to the `handler` (default: ``workers * 64``).
+        Ignored if `workers` is not provided.
+    `batch_size`
+        If provided and the `handler` implements `ICableBatchHandler`
+        (c.f. `supports_batches`), the `handler` receives lists of
+        `batch_size` cables instead of events, c.f. `handle_cables_batch`.
+        Handlers which do not support batches receive the events.
+    """
+    if batch_size and supports_batches(handler):
+        _handle_source_batch(path, handler, predicate, workers, window, batch_size)
+    elif is_store(path):
+        events = consumed_events(handler)
+        columns = set(['canonical_id'])
+        columns.update(_EVENT_ATTRIBUTES[name] for name in events)
+        handle_cables(cables_from_store(path, predicate, columns), handler)
+    elif workers and workers > 1:
+        events = consumed_events(handler)
+        dispatch = _dispatcher(handler, events)
+        dispatch['start']()
+        for cable_events in _from_source_parallel(path, predicate, _events, events, workers, window or workers * 64):
+            _dispatch_events(cable_events, dispatch)
+        dispatch['end']()
+    else:
+        handle_cables(cables_from_source(path, predicate), handler)
+
+
+def _handle_source_batch(path, handler, predicate, workers, window, batch_size):
+    attributes = consumed_attributes(handler)
+    if is_store(path):
+        cables = cables_from_store(path, predicate, attributes.intersection(COLUMNS))
+    elif workers and workers > 1:
+        values = _from_source_parallel(path, predicate, _values, tuple(attributes), workers, window or workers * 64)
+        cables = (cable_from_columns(v) for v in values)
+    else:
+        cables = cables_from_source(path, predicate)
+    handle_cables_batch(cables, handler, batch_size)
+
+
+_CHUNK_SIZE = 16
+
+def _events(cable, events):
+    return list(events_from_cable(cable, events))
+
+
+def _values(cable, attributes):
+    return dict((name, getattr(cable, name)) for name in attributes)
+
+
+def _from_rows(rows, func, arg, predicate):
+    cables = (cable_from_row(row) for row in rows)
+    return [func(cable, arg) for cable in cables if not predicate or predicate.accepts(cable)]
+
+
+def _from_files(filenames, func, arg, predicate):
+    cables = (cable_from_file(filename) for filename in filenames)
+    return [func(cable, arg) for cable in cables if not predicate or predicate.accepts(cable)]
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    chunk = list(islice(it, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(it, size))
+
+
+def _from_source_parallel(path, predicate, func, arg, workers, window):
+    """\
+    Returns a generator which yields ``func(cable, arg)`` per cable. The cables
+    are parsed by a pool of `workers` processes, the order of the source is
+    kept. `func` must be a module-level function, i.e. `_events` which
+    returns the `arg` events of a cable, c.f. `events_from_cable`.
+
+    At most `window` cables are in-flight.
+
+    If the `predicate` depends on other attributes than the reference
+    identifier, the workers apply it to the parsed cables. Such a predicate
+    must be picklable.
     """
-    handle_cables(cables_from_source(path, predicate), handler)
+    accept = predicate if cable_filter(predicate) else None
+    if os.path.isdir(path):
+        items, convert = cablefiles_from_directory(path, predicate), _from_files
+    else:
+        items, convert = rows_from_csv(path, predicate), _from_rows
+    # Small windows use smaller chunks, a chunk is in-flight as a whole
+    chunk_size = max(1, min(window, _CHUNK_SIZE))
+    max_pending = max(1, window // chunk_size)
+    pool = Pool(workers)
+    try:
+        pending = deque()
+        for chunk in _chunks(items, chunk_size):
+            if len(pending) >= max_pending:
+                for result in pending.popleft().get():
+                    yield result
+            pending.append(pool.apply_async(convert, (chunk, func, arg, accept)))
+        while pending:
+            for result in pending.popleft().get():
+                yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
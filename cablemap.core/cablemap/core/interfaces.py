@@ -285,6 +285,15 @@ class ICableHandler(Interface):
 
     ``None`` values are not accepted by handler. If something is ``None`` (like
     the subject), the event must not be issued.
+
+    A handler may declare the events it consumes by a ``consumed_events``
+    class attribute or property, c.f. `cablemap.core.handler.consumed_events`.
+    Other events, except `start`, `end`, `start_cable` and `end_cable`, are
+    not issued and the cable properties they belong to are not parsed.
+
+    The functions which receive the events are resolved once when the
+    processing starts. A handler may provide them by a ``resolve_event(name)``
+    method, c.f. `cablemap.core.handler.resolve_event`.
     """
 
     def start():
@@ -483,3 +492,38 @@ class ICableHandler(Interface):
         `iri`
             The IRI to add.
         """
+
+
+class ICableBatchHandler(Interface):
+    """\
+    Defines an interface for classes which process lists of cables instead
+    of the events of `ICableHandler`, c.f. `cablemap.core.handler.handle_cables_batch`.
+
+    The first event is `start` and the last event must be `end`.
+    Between these events, the cables are delivered by `handle_cable_batch`
+    in the order of the source.
+
+    A handler may declare the cable attributes it reads by a ``consumed_attributes``
+    class attribute or property, c.f. `cablemap.core.handler.consumed_attributes`.
+    If the cables are read from a cable store or parsed by worker processes,
+    other attributes raise an ``AttributeError``. Parsed properties are
+    computed from the header and content if these attributes are consumed.
+    """
+
+    def start():
+        """\
+        First event.
+        """
+
+    def end():
+        """\
+        Last event.
+        """
+
+    def handle_cable_batch(cables):
+        """\
+        Processes the provided cables.
+
+        `cables`
+            A list of `ICable` instances.
+        """
@@ -13,7 +13,6 @@ This module provides models to keep data about cables.
 :license:      BSD license
 """
 from __future__ import absolute_import
-import codecs
 from itertools import chain
 from operator import itemgetter
 from cablemap.core import reader, c14n, consts
@@ -31,7 +30,8 @@ def cable_from_file(filename):
     `filename`
         An absolute path to the cable file.
     """
-    html = codecs.open(filename, 'rb', 'utf-8').read()
+    with open(filename, 'rb') as f:
+        html = f.read()
     return cable_from_html(html, reader.reference_id_from_filename(filename))
 
 
@@ -40,7 +40,8 @@ def cable_from_html(html, reference_id=None):
     Returns a cable from the provided HTML page.
     
     `html`
-        The HTML page of the cable
+        The HTML page of the cable, either an unicode string or UTF-8
+        encoded bytes.
     `reference_id`
         The reference identifier of the cable. If the reference_id is ``None``
         this function tries to detect it.
@@ -50,10 +51,7 @@ def cable_from_html(html, reference_id=None):
     if not reference_id:
         reference_id = reader.reference_id_from_html(html)
     cable = Cable(reference_id)
-    reader.parse_meta(html, cable)
-    cable.header = reader.get_header_as_text(html, reference_id)
-    cable.content = reader.get_content_as_text(html, reference_id)
-    return cable
+    return reader.parse_html(html, cable)
 
 
 def cable_from_row(row):
@@ -84,6 +82,31 @@ def cable_from_row(row):
     return cable
 
 
+def cable_from_values(values, cls=None):
+    """\
+    Returns a cable from the provided `values`.
+
+    The parsed properties (i.e. ``subject``, ``tags``) are taken as they are
+    and are not computed from the header or content.
+
+    `values`
+        A dict which maps the names of the attributes and properties
+        of a cable to their values. The ``reference_id`` is required.
+    `cls`
+        The class of the cable, a subclass of `Cable` (default: `Cable`).
+    """
+    cable = (cls or Cable)(values['reference_id'])
+    cache = {}
+    for name, value in values.iteritems():
+        if name in Cable.__slots__:
+            setattr(cable, name, value)
+        else:
+            cache[name] = value
+    # Must be set after the attributes, changing them clears the cache
+    cable._cache = cache
+    return cable
+
+
 # Commonly used base URIs for Wikileaks Cablegate
 # Formats: 
 # * BASE/<year>/<month>/<reference-id>
@@ -108,6 +131,9 @@ class Reference(tuple):
     def __new__(cls, value, kind, bullet=None, title=None):
         return tuple.__new__(cls, (value, kind, bullet.upper() if bullet else None, title.strip('"') if title else None))
 
+    def __getnewargs__(self):
+        return tuple(self)
+
     def is_cable(self):
         return self.kind == consts.REF_KIND_CABLE
 
@@ -127,6 +153,9 @@ class Recipient(tuple):
     def __new__(cls, route, name, precedence=None, mcn=None, excluded=None):
         return tuple.__new__(cls, (route or None, name, precedence or None, mcn or None, excluded or _EMPTY))
 
+    def __getnewargs__(self):
+        return tuple(self)
+
     route = property(itemgetter(0))
     name = property(itemgetter(1))
     excluded = property(itemgetter(4))
@@ -140,11 +169,39 @@ class Recipient(tuple):
     mcn = property(itemgetter(3))
 
 
+# Attributes which invalidate the cached properties of a cable if they're changed
+_CABLE_SOURCE_ATTRIBUTES = frozenset(['reference_id', 'header', 'content', 'created'])
+
+def _cached_property(func):
+    """\
+    Returns a read-only property which computes its value once per cable.
+
+    The value is cached until one of the `_CABLE_SOURCE_ATTRIBUTES` of the
+    cable is changed.
+    """
+    name = func.__name__
+    def get(self):
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        try:
+            return cache[name]
+        except KeyError:
+            value = cache[name] = func(self)
+            return value
+    return property(get, doc=func.__doc__)
+
+
 class Cable(object):
     """\
     Holds data about a cable.
+
+    The properties which are parsed from the header or the content are
+    computed on demand and cached.
     """
     implements(ICable)
+    __slots__ = ('reference_id', 'origin', 'header', 'content', 'created',
+                 'released', 'classification', 'media_uris', '_cache')
 
     def __init__(self, reference_id):
         """\
@@ -154,6 +211,7 @@ class Cable(object):
         """
         if not reference_id:
             raise ValueError('The reference id must be provided')
+        self._cache = None
         self.reference_id = unicode(reference_id)
         self.origin = None
         self.header = None
@@ -161,8 +219,22 @@ class Cable(object):
         self.created = None
         self.released = None
         self.classification = None
+        self.media_uris = _EMPTY
 
-    @property
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in _CABLE_SOURCE_ATTRIBUTES:
+            object.__setattr__(self, '_cache', None)
+
+    def __getstate__(self):
+        return dict((name, getattr(self, name)) for name in Cable.__slots__ if name != '_cache')
+
+    def __setstate__(self, state):
+        self._cache = None
+        for name, value in state.iteritems():
+            setattr(self, name, value)
+
+    @_cached_property
     def canonical_id(self):
         return c14n.canonicalize_id(self.reference_id)
 
@@ -178,7 +250,7 @@ class Cable(object):
     def cabledrum_uri(self):
         return u'http://www.cabledrum.net/cables/' + self.reference_id
 
-    @property
+    @_cached_property
     def wl_uris(self):
         """\
         Returns cable IRIs to WikiLeaks (mirrors).
@@ -204,58 +276,62 @@ class Cable(object):
     #
     # Header properties
     #
-    @property
+    @_cached_property
     def transmission_id(self):
         return reader.parse_transmission_id(self.header) if not self.is_partial else None
 
-    @property
+    @_cached_property
     def recipients(self):
         return reader.parse_recipients(self.header, self.reference_id) if not self.is_partial else _EMPTY
 
-    @property
+    @_cached_property
     def info_recipients(self):
         return reader.parse_info_recipients(self.header, self.reference_id)
 
-    @property
+    @_cached_property
     def is_partial(self):
         return 'This record is a partial extract of the original cable' in self.header
 
     #
     # Content properties
     #
-    @property
+    @_cached_property
+    def _header_zone(self):
+        return reader.HeaderZone(self.content)
+
+    @_cached_property
     def subject(self):
-        return reader.parse_subject(self.content, self.reference_id)
+        return reader.parse_subject(self.content, self.reference_id, zone=self._header_zone)
 
-    @property
+    @_cached_property
     def classification_categories(self):
         return reader.parse_classification_categories(self.content)
 
-    @property
+    @_cached_property
     def nondisclosure_deadline(self):
         return reader.parse_nondisclosure_deadline(self.content)
 
-    @property
+    @_cached_property
     def references(self):
-        return reader.parse_references(self.content, self.created[:4], self.reference_id)
+        return reader.parse_references(self.content, self.created[:4], self.reference_id, zone=self._header_zone)
 
-    @property
+    @_cached_property
     def tags(self):
-        return reader.parse_tags(self.content, self.reference_id)
+        return reader.parse_tags(self.content, self.reference_id, zone=self._header_zone)
 
-    @property
+    @_cached_property
     def summary(self):
-        return reader.parse_summary(self.content, self.reference_id)
+        return reader.parse_summary(self.content, self.reference_id, zone=self._header_zone)
 
-    @property
+    @_cached_property
     def comment(self):
         return reader.parse_comment(self.content)
 
-    @property
+    @_cached_property
     def signed_by(self):
         return reader.parse_signed_by(self.content)
 
-    @property
+    @_cached_property
     def classified_by(self):
         return reader.parse_classified_by(self.content)
 
@@ -15,9 +15,11 @@ This module extracts information from cables.
 from __future__ import absolute_import
 import os
 import re
+import codecs
 import logging
 from cablemap.core import consts as consts, c14n
-from cablemap.core.consts import REFERENCE_ID_PATTERN, MALFORMED_CABLE_IDS, INVALID_CABLE_IDS
+from cablemap.core.consts import split_reference_id, MALFORMED_CABLE_IDS, INVALID_CABLE_IDS
+from cablemap.core.tags import canonicalize_tag
 
 logger = logging.getLogger('cablemap.core.reader')
 
@@ -156,6 +158,9 @@ def canonicalize_id(reference_id):
         return reference_id.replace(origin, _C14N_FIXES[origin])
     return MALFORMED_CABLE_IDS.get(reference_id, INVALID_CABLE_IDS.get(reference_id, reference_id))
 
+# The same references occur in many cables
+_canonicalize_reference = c14n.Cache(canonicalize_id, 100000)
+
 _REFERENCE_ID_FROM_HTML_PATTERN = re.compile('<h3>Viewing cable ([0-9]{2,}[A-Z0-9]+),', re.UNICODE)
 
 def reference_id_from_html(html):
@@ -171,7 +176,44 @@ def reference_id_from_html(html):
     raise ValueError("Cannot extract the cable's reference id")
 
 
-_CONTENT_PATTERN = re.compile(ur'(?:<code><pre>)(.+?)(?:</pre></code>)', re.DOTALL|re.UNICODE)
+_TABLE_START = "<table class='cable'>"
+_TABLE_END = '</table>'
+_CONTENT_START = '<code><pre>'
+_CONTENT_END = '</pre></code>'
+
+def _split_html(file_content):
+    """\
+    Returns a tuple ``(table, blocks)`` where ``table`` is the HTML of the
+    cable's metadata table and ``blocks`` is a list of the (raw) ``<code><pre>``
+    sections of the page.
+
+    The table is the last cable table of the page. If `file_content` is a
+    byte string, only the table and the sections are decoded (UTF-8).
+
+    `file_content`
+        The HTML file content, c.f. `get_file_content`.
+    """
+    end_idx = file_content.rfind(_TABLE_END)
+    start_idx = file_content.rfind(_TABLE_START, 0, end_idx)
+    if start_idx < 0 or end_idx < 0:
+        raise ValueError('Cable table not found')
+    end_idx = file_content.find(_TABLE_END, start_idx)
+    table = file_content[start_idx + len(_TABLE_START):end_idx]
+    blocks = []
+    idx = file_content.find(_CONTENT_START)
+    while idx >= 0:
+        idx += len(_CONTENT_START)
+        # A section is not empty, c.f. the former ``<code><pre>(.+?)</pre></code>``
+        end_idx = file_content.find(_CONTENT_END, idx + 1)
+        if end_idx < 0:
+            break
+        blocks.append(file_content[idx:end_idx])
+        idx = file_content.find(_CONTENT_START, end_idx + len(_CONTENT_END))
+    if isinstance(file_content, str):
+        table = table.decode('utf-8')
+        blocks = [block.decode('utf-8') for block in blocks]
+    return table, blocks
+
 
 def get_content_as_text(file_content, reference_id):
     """\
@@ -183,7 +225,7 @@ def get_content_as_text(file_content, reference_id):
     `reference_id`
         The reference identifier of the cable.
     """
-    return _clean_html(_CONTENT_PATTERN.findall(file_content)[-1])
+    return _clean_html(_split_html(file_content)[1][-1])
 
 
 def get_header_as_text(file_content, reference_id):
@@ -193,14 +235,15 @@ def get_header_as_text(file_content, reference_id):
     `file_content`
         The HTML file content, c.f. `get_file_content`.
     """
-    res = _CONTENT_PATTERN.findall(file_content)
-    if len(res) == 2:
-        content = res[0]
-    elif len(res) == 1:
+    return _header_from_blocks(_split_html(file_content)[1])
+
+
+def _header_from_blocks(blocks):
+    if len(blocks) == 2:
+        return _clean_html(blocks[0])
+    elif len(blocks) == 1:
         return ''
-    else:
-        raise ValueError('Unexpected <code><pre> sections: "%r"' % res)
-    return _clean_html(content)
+    raise ValueError('Unexpected <code><pre> sections: "%r"' % blocks)
 
 
 _LINK_PATTERN = re.compile(ur'<a[^>]*>', re.UNICODE)
@@ -212,10 +255,12 @@ def _clean_html(html):
     Removes links (``<a href="...">...</a>``) from the provided HTML input.
     Further, it replaces "&#x000A;" with ``\n`` and removes "¶" from the texts.
     """
-    content = html.replace(u'&#x000A;', u'\n').replace(u'¶', '')
-    content = _LINK_PATTERN.sub(u'', content)
-    content = _HTML_TAG_PATTERN.sub(u'', content)
-    content = _BACKSLASH_PATTERN.sub(u'\n', content)
+    content = html.replace(u'&#x000A;', u'\n').replace(u'¶', u'')
+    if u'<' in content:
+        content = _LINK_PATTERN.sub(u'', content)
+        content = _HTML_TAG_PATTERN.sub(u'', content)
+    if u'\\' in content:
+        content = _BACKSLASH_PATTERN.sub(u'\n', content)
     return content
 
 
@@ -262,7 +307,7 @@ def header_body_from_content(content):
     return None, None
 
 
-_META_PATTERN = re.compile(r'''<table.*?class.+?["']cable["']\s*>.+?<a[^>]+>(.+?)</a>.+<td>\s*<a.+?>(.+?)</a>.+<td>\s*<a.+?>(.+?)</a>.+<td>\s*<a.+?>(.+?)</a>''', re.MULTILINE|re.DOTALL)
+_META_CELL_PATTERN = re.compile(r'<td>\s*<a[^>]*>([^<]+)</a>', re.UNICODE)
 _MEDIA_URLS_PATTERN = re.compile(r'''<a href=(?:"|')(https?://[^\.]+\.[^"']+)''')
 
 def parse_meta(file_content, cable):
@@ -270,16 +315,20 @@ def parse_meta(file_content, cable):
     Extracts the reference id, date/time of creation, the classification,
     and the origin of the cable and assigns the value to the provided `cable`.
     """
-    end_idx = file_content.rindex("</table>")
-    start_idx = file_content.rindex("<table class='cable'>", 0, end_idx)
-    m = _META_PATTERN.search(file_content, start_idx, end_idx)
-    if not m:
-        raise ValueError('Cable table not found')
-    if len(m.groups()) != 4:
-        raise ValueError('Unexpected metadata result: "%r"' % m.groups())
-    # Table content: 
-    # Reference ID | Created | Classification | Origin
-    ref, created, classification, origin = m.groups()
+    return _parse_meta_table(_split_html(file_content)[0], cable)
+
+
+def _parse_meta_table(table, cable):
+    # Table content:
+    # Reference ID | Created | [Released |] Classification | Origin
+    cells = _META_CELL_PATTERN.findall(table)
+    if len(cells) == 5:
+        ref, created, released, classification, origin = cells
+        cable.released = released
+    elif len(cells) == 4:
+        ref, created, classification, origin = cells
+    else:
+        raise ValueError('Unexpected metadata result: "%r"' % cells)
     if cable.reference_id != ref:
         reference_id = MALFORMED_CABLE_IDS.get(ref)
         if reference_id != cable.reference_id:
@@ -291,9 +340,31 @@ def parse_meta(file_content, cable):
     # classifications are usually written in upper case, but you never know.. 
     cable.classification = classification.upper()
     # Try to find media IRIs
-    start_idx = file_content.rfind(u'Appears in these', start_idx, end_idx)
-    if start_idx > 0:
-        cable.media_uris = _MEDIA_URLS_PATTERN.findall(file_content, start_idx, end_idx)
+    idx = table.rfind(u'Appears in these')
+    if idx > 0:
+        cable.media_uris = _MEDIA_URLS_PATTERN.findall(table, idx)
+    return cable
+
+
+def parse_html(file_content, cable):
+    """\
+    Extracts the metadata, the header and the content from the HTML page of
+    a cable and assigns the values to the provided `cable`.
+
+    Unlike calling `parse_meta`, `get_header_as_text` and `get_content_as_text`
+    one after another, the page is scanned once.
+
+    `file_content`
+        The HTML file content, c.f. `get_file_content`.
+    `cable`
+        The cable.
+    """
+    table, blocks = _split_html(file_content)
+    _parse_meta_table(table, cable)
+    if not blocks:
+        raise ValueError('No <code><pre> section found')
+    cable.header = _header_from_blocks(blocks)
+    cable.content = _clean_html(blocks[-1])
     return cable
 
 
@@ -420,6 +491,49 @@ def parse_classified_by(content, normalize=True):
     return names
 
 
+_CLS_CATEGORIES_START_PATTERN = re.compile(r'Classified\s+By', re.IGNORECASE|re.UNICODE)
+_CLS_CATEGORIES_PATTERN = re.compile(r'1\s*\.\s*[45]\s*((?:\(?[A-H]\)?(?:[\s,/&]|AND)*)+)', re.IGNORECASE|re.UNICODE)
+_CLS_CATEGORY_PATTERN = re.compile(r'\b([A-H])\b', re.IGNORECASE|re.UNICODE)
+
+def parse_classification_categories(content):
+    """\
+    Returns a maybe empty iterable of classification categories (uppercased
+    chars ``[A-H]``).
+
+    `content`
+        The cable's content.
+    """
+    m = _CLS_CATEGORIES_START_PATTERN.search(content)
+    if not m:
+        return ()
+    m = _CLS_CATEGORIES_PATTERN.search(content, m.end(), m.end() + 300)
+    if not m:
+        return ()
+    res = []
+    for cat in _CLS_CATEGORY_PATTERN.findall(m.group(1)):
+        cat = cat.upper()
+        if cat not in res:
+            res.append(cat)
+    return res
+
+
+_COMMENT_PATTERN = re.compile(r'(?:^|\n)[ ]*(?:[0-9]+\.[ ]*)?(?:\([A-Z/]+\)[ ]*)?COMMENT[ ]*[:\.\-][ ]*(.+?)(?=(END[ ]+COMMENT)|(\n[ ]*\n)|\Z)', re.DOTALL|re.IGNORECASE|re.UNICODE)
+
+def parse_comment(content):
+    """\
+    Returns the comment of the cable's author or ``None`` if the cable
+    does not contain a comment.
+
+    `content`
+        The cable's content.
+    """
+    m = _COMMENT_PATTERN.search(content)
+    if not m:
+        return None
+    comment = _CLEAN_SUMMARY_WS_PATTERN.sub(u' ', m.group(1)).strip()
+    return comment or None
+
+
 _SIGNER_PATTERN = re.compile(r'(?:[\-\?\"/]|\)(?!\s+END)'
                              r'|\.(?!\s+The\b)'
                              r'|[\sA-Z]*QUOTE)(?:\s+[GP\-3EXEMPT]+'
@@ -470,7 +584,66 @@ _WS_PATTERN = re.compile(ur'[ ]{2,}', re.UNICODE)
 _BRACES_PATTERN = re.compile(r'^\([^\)]+\)[ ]+| \([A-Z]+\)$')
 _HTML_ENTITIES_PATTERN = re.compile(r'&#([0-9]+);')
 
-def parse_subject(content, reference_id=None, clean=True):
+class HeaderZone(object):
+    """\
+    Locates the boundaries of the subject, TAGS, REF and summary sections of
+    a cable's content.
+
+    Each boundary is searched on demand and at most once. A zone may be
+    passed to `parse_subject`, `parse_tags`, `parse_references` and
+    `parse_summary` to share the boundaries between the parsers::
+
+        zone = HeaderZone(content)
+        subject = parse_subject(content, zone=zone)
+        tags = parse_tags(content, zone=zone)
+    """
+    __slots__ = ('content', '_subject', '_references', '_end_of_summary')
+
+    def __init__(self, content):
+        self.content = content
+        self._subject = None
+        self._references = None
+        self._end_of_summary = None
+
+    def subject(self):
+        """\
+        Returns a tuple ``(max_idx, match)``. ``max_idx`` is the max. index of
+        the subject/TAGS section and ``match`` the match of the
+        `_SUBJECT_PATTERN` (or ``None``).
+        """
+        if self._subject is None:
+            m = _SUBJECT_MAX_PATTERN.search(self.content)
+            max_idx = m.start() if m else _MAX_HEADER_IDX
+            self._subject = max_idx, _SUBJECT_PATTERN.search(self.content, 0, max_idx)
+        return self._subject
+
+    def references(self):
+        """\
+        Returns a tuple ``(offset, max_idx)`` which limits the REF section.
+        """
+        if self._references is None:
+            offset = 0
+            m = _REF_OFFSET_PATTERN.search(self.content)
+            if m:
+                offset = m.end()
+            # 1. Try to find "Classified By:"
+            m = _REF_STOP_PATTERN.search(self.content, offset)
+            # If found, use it as maximum index to search for references, otherwise use a constant
+            self._references = offset, m and m.start() or _MAX_HEADER_IDX
+        return self._references
+
+    def end_of_summary(self):
+        """\
+        Returns the index of "END SUMMARY" or ``-1`` if the content does not
+        provide it.
+        """
+        if self._end_of_summary is None:
+            m = _END_SUMMARY_PATTERN.search(self.content)
+            self._end_of_summary = m.start() if m else -1
+        return self._end_of_summary
+
+
+def parse_subject(content, reference_id=None, clean=True, zone=None):
     """\
     Parses and returns the subject of a cable. If the cable has no subject, an
     empty string is returned.
@@ -492,12 +665,12 @@ def parse_subject(content, reference_id=None, clean=True):
         U.S. Department of State Foreign Affairs Handbook Volume 5 Handbook 1 — Correspondence Handbook
         5 FAH-1 H-210 -- HOW TO USE TELEGRAMS; page 2
         <http://www.state.gov/documents/organization/89319.pdf>
+    `zone`
+        An optional `HeaderZone` of the `content`.
     """
     def to_unicodechar(match):
         return unichr(int(match.group(1)))
-    m = _SUBJECT_MAX_PATTERN.search(content)
-    max_idx = m.start() if m else _MAX_HEADER_IDX
-    m = _SUBJECT_PATTERN.search(content, 0, max_idx)
+    m = (zone or HeaderZone(content)).subject()[1]
     if not m:
         return u''
     res = m.group(1).strip()
@@ -549,7 +722,19 @@ _REF_ORIGIN_PATTERN = re.compile('[0-9]+([A-Z]+)[0-9]+')
 #TODO: The following works for all references which contain something like 02ROME1196, check with other cables
 _CLEAN_REFS_PATTERN = re.compile(r'(PAGE [0-9]+ [A-Z]+ [0-9]+ [0-9]+ OF [0-9]+ [A-Z0-9]+)|([A-Z]+\s+[0-9]+\s+[0-9]+(?:\.[0-9]+)?\s+OF)', re.UNICODE)
 
-def parse_references(content, year, reference_id=None, canonicalize=True):
+def _substring_pattern(filename):
+    """\
+    Returns a pattern which finds any of the strings (one per line) in the
+    provided file.
+    """
+    with codecs.open(os.path.join(os.path.dirname(__file__), filename), 'rb', 'utf-8') as f:
+        strings = set(l.strip() for l in f) - set([u''])
+    return re.compile(u'|'.join(re.escape(s) for s in sorted(strings)), re.UNICODE)
+
+# Invalid references which contain one of these strings are not logged
+_IGNORED_REFERENCE_PATTERN = _substring_pattern('ignored-references.txt')
+
+def parse_references(content, year, reference_id=None, canonicalize=True, zone=None):
     """\
     Returns the references to other cables as (maybe empty) list.
     
@@ -562,6 +747,8 @@ def parse_references(content, year, reference_id=None, canonicalize=True):
     `canonicalize`
         Indicates if the cable reference origin should be canonicalized.
         (enabled by default)
+    `zone`
+        An optional `HeaderZone` of the `content`.
     """
     from cablemap.core.models import Reference
     def format_year(y):
@@ -573,14 +760,8 @@ def parse_references(content, year, reference_id=None, canonicalize=True):
         elif len(y) == 3 and y[0] == '0':
             return y[1:]
         return y
-    offset = 0
-    m_offset = _REF_OFFSET_PATTERN.search(content)
-    if m_offset:
-        offset = m_offset.end()
-    # 1. Try to find "Classified By:"
-    m_stop = _REF_STOP_PATTERN.search(content, offset)
-    # If found, use it as maximum index to search for references, otherwise use a constant
-    max_idx = m_stop and m_stop.start() or _MAX_HEADER_IDX
+    # 1. Find the REF section, limited by "Classified By:" etc.
+    offset, max_idx = (zone or HeaderZone(content)).references()
     # 2. Find references
     m_start = _REF_START_PATTERN.search(content, offset, max_idx)
     # 3. Check if we have a paragraph in the references
@@ -593,6 +774,7 @@ def parse_references(content, year, reference_id=None, canonicalize=True):
         last_end = m_end.end()
         m_end = _REF_LAST_REF_PATTERN.search(content, last_end, max_idx)
     res = []
+    debug = logger.isEnabledFor(logging.DEBUG)
     if m_end and not m_start:
         logger.warn('Found ref end but no start in "%s", content: "%s"' % (reference_id, content))
     if m_start and last_end:
@@ -614,12 +796,12 @@ def parse_references(content, year, reference_id=None, canonicalize=True):
                 enum = enum or res[-1].value
             reference = u'%s%s%d' % (y, origin, int(sn))
             if canonicalize:
-                reference = canonicalize_id(reference)
+                reference = _canonicalize_reference(reference)
             length = len(reference)
             if length < 7 or length > 25: # constants.MIN_ORIGIN_LENGTH + constants.MIN_SERIAL_LENGTH + length of year or constants.MAX_ORIGIN_LENGTH + constants.MAX_SERIAL_LENGTH + 2 (for the year) 
                 continue
-            if not REFERENCE_ID_PATTERN.match(reference):
-                if 'CORRUPTION' not in reference and 'ECRET' not in reference and 'PARISPOINT' not in reference and 'TELCON' not in reference and 'FORTHE' not in reference and 'ZOCT' not in reference and 'ZSEP' not in reference and 'ZMAY' not in reference and 'ZNOV' not in reference and 'ZAUG' not in reference and 'PRIORITY' not in reference and 'ZJAN' not in reference and 'ZFEB' not in reference and 'ZJUN' not in reference and'ZJUL' not in reference and 'PREVIO' not in reference and 'SEPTEMBER' not in reference and 'ZAPR' not in reference and 'ZFEB' not in reference and 'PART' not in reference and 'ONFIDENTIAL' not in reference and 'SECRET' not in reference and 'SECTION' not in reference and 'TODAY' not in reference and 'DAILY' not in reference and 'OUTOF' not in reference and 'PROVIDING' not in reference and 'NUMBER' not in reference and 'APRIL' not in reference and 'OCTOBER' not in reference and 'MAIL' not in reference and 'DECEMBER' not in reference and 'FEBRUAY' not in reference and 'AUGUST' not in reference and 'MARCH' not in reference and 'JULY' not in reference and 'JUNE' not in reference and 'MAIL' not in reference and 'JANUARY' not in reference and '--' not in reference and 'PARAGRAPH' not in reference and 'ANDPREVIOUS' not in reference and 'UNCLAS' not in reference and 'ONMARCH' not in reference and 'ONAPRIL' not in reference and 'FEBRUARY' not in reference and 'ONMAY' not in reference and 'ONJULY' not in reference and 'ONJUNE' not in reference and 'NOVEMBER' not in reference and not 'CONFIDENTIAL' in reference:
+            if not split_reference_id(reference):
+                if debug and not _IGNORED_REFERENCE_PATTERN.search(reference):
                     logger.debug('Ignore "%s". Not a valid reference identifier (%s)' % (reference, reference_id))
                 continue
             if reference != reference_id:
@@ -658,82 +840,7 @@ _TAG_PATTERN = re.compile(ur'(GOI[ ]+(?:EX|IN)TERNAL)'
                           ur'|(\([^\)]+\))'
                           ur'|(?:,[ ]+)([A-Z_-]+[\-\s]{1,3}[A-Z_-]+(?:\s{1,2}[A-Z]+)?)', re.UNICODE|re.IGNORECASE)
 
-# Used to normalize the TAG (corrects typos etc.)
-_TAG_FIXES = {
-    u'CLINTON HILLARY': (u'CLINTON, HILLARY',),
-    u'STEINBERG JAMES': (u'STEINBERG, JAMES B.',),
-    u'BIDEN JOSEPH': (u'BIDEN, JOSEPH',),
-    u'ZOELLICK ROBERT': (u'ZOELLICK, ROBERT',),
-    u'RICE CONDOLEEZZA': (u'RICE, CONDOLEEZZA',),
-    u'CARSON JOHNNIE': (u'CARSON, JOHNNIE',),
-    u'BUSH GEORGE': (u'BUSH, GEORGE W.',),
-    u'ROOD JOHN': (u'ROOD, JOHN',),
-    u'CROS GERARD': (u'CROS, GERARD',),
-    u'NOVO GUILLERMO': (u'NOVO, GUILLERMO',),
-    u'REMON PEDRO': (u'REMON, PEDRO',),
-    u'JIMENEZ GASPAR': (u'JIMENEZ, GASPAR',),
-    u'COUNTER TERRORISM': (u'COUNTERTERRORISM',),
-    u'MOPPS': (u'MOPS',), # 09BEIRUT818
-    u'POGOV': (u'PGOV',), # 09LONDON2222
-    u'RU': (u'RS',), # 09BERLIN1433, 09RIYADH181 etc.
-    u'SYR': (u'SY',),
-    u'UNDESCO': (u'UNESCO',), # 05SANJOSE2199
-    u'KWWMN': (u'KWMN',), # 09TRIPOLI754
-    u'RUPREL': (u'RS', u'PREL'), # 00HELSINKI2613)
-    u'ITPHUM': (u'IT', u'PHUM'), # 02ROME1196
-    u'ITPGOV': (u'IT', u'PGOV'), # 02ROME3639
-    u'NATOPREL': (u'NATO', u'PREL'), # 03VATICAN523
-    u'SPCVIS': (u'SP', u'CVIS'), # 04MADRID1764
-    u'MASSMNUC': (u'MASS', u'MNUC'), # 08BRASILIA93
-    u'KNNPMNUC': (u'KNNP', u'MNUC'), # 08THEHAGUE553
-    u'PTER MARR': (u'PTER', u'MARR'), # 07BAKU855
-    u'PHUMPGOV': (u'PHUM', u'PGOV'), #09PARAMARIBO103
-    u'PHUMPREL': (u'PHUM', u'PREL'), # 07NAIROBI4427
-    u'VTPREL': (u'VT', u'PREL'), # 03VATICAN1570 and others
-    u'VEPREL': (u'VE', u'PREL'), # 02VATICAN5607
-    u'PRELPK': (u'PREL', u'PK'), # 10ISLAMABAD332
-    u'PRELBR': (u'PREL', u'BR'), # 06BRASILIA2073
-    u'PBTSRU': (u'PBTS', u'RS'), # 09MANAGUA913
-    u'PGOVSOCI': (u'PGOV', u'SOCI'), # 07SAOPAULO726
-    u'NATOIRAQ': (u'NATO', u'IRAQ'), # 05ATHENS2769
-    u'ECONCS': (u'ECON', u'CS'), # 07SANJOSE298
-    u'PGOVLO': (u'PGOV', u'LO'), # 08BRATISLAVA377
-    u'SNARCS': (u'SNAR', u'CS'), # 08SANJOSE400
-    u'ECINECONCS': (u'ECIN', u'ECON', u'CS'), # 06SANJOSE2649
-    u'EFINECONCS': (u'EFIN', u'ECON', u'CS'), # 06SANJOSE2803
-    u'KWMNCS': (u'KWMN', u'CS'), # 09SANJOSE692
-    u'EINDETRD': (u'EIND', u'ETRD'), # 09PARIS1267
-    u'ETRDEINVTINTCS': (u'ETRD', u'EINV', 'TINT', u'CS'), # 07SANJOSE426
-    u'SNARIZ': (u'SNAR', u'IZ'), # 07HELSINKI127
-    u'KPAONZ': (u'KPAO', u'NZ'), # 08WELLINGTON125 and others
-    u'ELTNSNAR': (u'ELTN', u'SNAR'), # 07SAOPAULO161
-    u'SENVKGHG': (u'SENV', u'KGHG'), # 09OTTAWA246
-    u'ECON KISL': (u'ECON', u'KISL'), # 09RIYADH651
-    u'UNFCYP': (u'UNFICYP',), # 09ATHENS252
-    u'OVIPPRELUNGANU': (u'OVIP', u'PREL', u'UNGA', u'NU'), # 08MANAGUA1184
-    u'ECONEFIN': (u'ECON', u'EFIN'), # 09CAIRO1691
-    u'ETRDECONWTOCS': (u'ETRD', u'ECON', u'WTO', u'CS'), # 07SANJOSE436
-    u'SENVEAGREAIDTBIOECONSOCIXR': (u'SENV', u'EAGR', u'EAID', u'TBIO', u'ECON' u'SOCI' u'XR'), # 08BRASILIA1504 and others
-    u'ECONSOCIXR': (u'ECON', u'SOCI', u'XR'), # 08BRASILIA1504 and others
-    u'EINVECONSENVCSJA': (u'EINV', u'ECON', u'SENV', u'CS', u'JA'), # 07SANJOSE653
-#TODO: SENV GR?!?
-#    u'SENVQGR': (u'SENV', u'GR'), # 06BRASILIA2419
-    u'EINVKSCA': (u'EINV', u'KSCA'), # 08BRASILIA1335
-#TODO: Unsure about this one, maybe POL INTERNAL or POL TINT?
-#    u'POLINT': (u'POL', u'INT'), # 05PARIS7195
-    u'PHUMBA': (u'PHUM', u'BA'), # 08ECTION01OF02MANAMA492 which is the malformed version of 08MANAMA492
-    u'ETRDEINVECINPGOVCS': (u'ETRD', u'EINV', u'ECIN', u'PGOV', u'CS'), # 06SANJOSE2802 and others
-    u'AMEDCASCKFLO': (u'AMED', u'CASC', u'KFLO'), # 09BRASILIA542
-    u'KFRDKIRFCVISCMGTKOCIASECPHUMSMIGEG': (u'KFRD', u'KIRF', u'CVIS', u'CMGT', u'KOCI', u'ASEC', u'PHUM', u'SMIG', u'EG'), # 09CAIRO2205
-    u'ASECKFRDCVISKIRFPHUMSMIGEG': (u'ASEC', u'KFRD', u'CVIS', u'KIRF', u'PHUM', u'SMIG', u'EG'), # 09CAIRO2190
-    u'KFRDCVISCMGTCASCKOCIASECPHUMSMIGEG': (u'KFRD', u'CVIS', u'CMGT', u'CASC', u'KOCI', u'ASEC', u'PHUM', u'SMIG', u'EG'), # 09CAIRO1054 and others
-    u'PGOVSMIGKCRMKWMNPHUMCVISKFRDCA': (u'PGOV', u'SMIG', u'KCRM', u'KWMN', u'PHUM', u'CVIS', u'KFRD', u'CA'), # 08TORONTO24
-    u'KPAOPREL': (u'KPAO', u'PREL'), # 08VIENTIANE632
-    u'POLMIL': (u'POL', u'MIL'), # 04PANAMA586 and others
-    u'IZPREL': (u'IZ', u'PREL'), # 03ROME2045 and others
-}
-
-def parse_tags(content, reference_id=None, canonicalize=True):
+def parse_tags(content, reference_id=None, canonicalize=True, zone=None):
     """\
     Returns the TAGS of a cable.
     
@@ -748,12 +855,10 @@ def parse_tags(content, reference_id=None, canonicalize=True):
         TAGs like "ECONEFIN" should be corrected (becomes "ECON", "EFIN").
         ``False`` indicates that the TAGs should be returned as found in
         cable.
+    `zone`
+        An optional `HeaderZone` of the `content`.
     """
-    max_idx = _MAX_HEADER_IDX
-    m = _SUBJECT_MAX_PATTERN.search(content)
-    if m:
-        max_idx = m.start()
-    m = _SUBJECT_PATTERN.search(content, 0, max_idx)
+    max_idx, m = (zone or HeaderZone(content)).subject()
     if m:
         max_idx = min(max_idx, m.start())
     m = _TAGS_PATTERN.search(content, 0, max_idx)
@@ -774,12 +879,7 @@ def parse_tags(content, reference_id=None, canonicalize=True):
         tag = u''.join(t).upper().replace(u')', u'').replace(u'(', u'')
         if tag == u'SIPDIS':  # Found in 05OTTAWA3726 and 05OTTAWA3709. I think it's an error
             continue
-        for tag in _TAG_FIXES.get(tag, (tag,)):
-            if tag == u'ECONSOCIXR':  # 08BRASILIA1504
-                for tag in _TAG_FIXES[tag]:
-                    if not tag in res:
-                        res.append(tag)
-                continue
+        for tag in canonicalize_tag(tag):
             if not tag in res:
                 res.append(tag)
     return res
@@ -795,7 +895,7 @@ _CLEAN_SUMMARY_CLS_PATTERN = re.compile(r'^[ ]*\([SBU/NTSC]+\)[ ]*')
 _CLEAN_SUMMARY_WS_PATTERN = re.compile('[ \n]+')
 _CLEAN_SUMMARY_PATTERN = re.compile(r'(===+)|(---+)|(((^[1-9])|(\n[1-9]))\.[ ]+\([^\)]+\)[ ]+)|(^[1-2]. Summary:)|(^[1-2]\.[ ]+)|(^and action request. )|(^and comment. )|(2. (C) Summary, continued:)', re.UNICODE|re.IGNORECASE)
 
-def parse_summary(content, reference_id=None):
+def parse_summary(content, reference_id=None, zone=None):
     """\
     Extracts the summary from the `content` of the cable.
     
@@ -805,11 +905,12 @@ def parse_summary(content, reference_id=None):
         The content of the cable.
     `reference_id`
         The reference identifier of the cable.
+    `zone`
+        An optional `HeaderZone` of the `content`.
     """
     summary = None
-    m = _END_SUMMARY_PATTERN.search(content)
-    if m:
-        end_of_summary = m.start()
+    end_of_summary = (zone or HeaderZone(content)).end_of_summary()
+    if end_of_summary != -1:
         m = _START_SUMMARY_PATTERN.search(content, 0, end_of_summary) or _ALTERNATIVE_START_SUMMARY_PATTERN.search(content, 0, end_of_summary)
         if m:
             summary = content[m.end():end_of_summary]
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+A store of parsed cables.
+
+The store is a directory which keeps each attribute of the cables in a
+column file. Reading cables from a store does not parse the cables again::
+
+    write_store('./cables.store', cables_from_source('cables.csv'))
+    for cable in cables_from_store('./cables.store', columns=('origin', 'tags')):
+        ...
+
+A store can be used as source for `cablemap.core.handler.handle_source`.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+from __future__ import absolute_import, with_statement
+import os
+import struct
+import marshal
+from cablemap.core.models import Cable, Reference, Recipient, cable_from_values
+from cablemap.core.predicates import cable_filter
+
+_META_FILENAME = 'cablemap-store.txt'
+_MAGIC = 'cablemap-store-1'
+
+# The columns of a store. Each column keeps the value of the cable's
+# attribute with the same name.
+COLUMNS = ('reference_id', 'canonical_id', 'created', 'released', 'origin',
+           'classification', 'classification_categories', 'nondisclosure_deadline',
+           'transmission_id', 'is_partial', 'subject', 'summary', 'comment',
+           'tags', 'references', 'recipients', 'info_recipients', 'signed_by',
+           'classified_by', 'media_uris', 'wl_uris', 'header', 'content')
+
+_LENGTH = struct.Struct('<I')
+
+
+def _encode_tuples(values):
+    return [tuple(v) for v in values]
+
+def _decoder(cls):
+    def decode(values):
+        return [tuple.__new__(cls, v) for v in values]
+    return decode
+
+# Columns which keep values which cannot be marshalled as they are
+_ENCODERS = {
+    'references': _encode_tuples,
+    'recipients': _encode_tuples,
+    'info_recipients': _encode_tuples,
+}
+
+_DECODERS = {
+    'references': _decoder(Reference),
+    'recipients': _decoder(Recipient),
+    'info_recipients': _decoder(Recipient),
+}
+
+
+class _StoredCable(Cable):
+    """\
+    A cable which was read from a store.
+
+    Attributes of columns which were not read raise an ``AttributeError``
+    instead of returning ``None``. The parsed properties of these columns
+    are computed from the header or content if these columns were read.
+    """
+    __slots__ = ()
+
+    def __init__(self, reference_id):
+        # Other attributes are left unset until their columns are read
+        self._cache = None
+        self.reference_id = unicode(reference_id)
+
+    def __getstate__(self):
+        return dict((name, getattr(self, name)) for name in _STORED_ATTRIBUTES
+                    if hasattr(self, name))
+
+
+def _stored_attribute(name):
+    slot = Cable.__dict__[name]
+    def get(self):
+        try:
+            return slot.__get__(self, Cable)
+        except AttributeError:
+            raise AttributeError('The column "%s" was not read from the store' % name)
+    return property(get, slot.__set__)
+
+_STORED_ATTRIBUTES = [name for name in Cable.__slots__ if name != '_cache']
+
+for _name in _STORED_ATTRIBUTES:
+    if _name != 'reference_id':
+        setattr(_StoredCable, _name, _stored_attribute(_name))
+del _name
+
+
+def cable_from_columns(values):
+    """\
+    Returns a cable from the provided `values` of some columns.
+
+    Unlike `cablemap.core.models.cable_from_values`, the attributes of
+    other columns raise an ``AttributeError`` instead of returning ``None``.
+
+    `values`
+        A dict which maps column names (c.f. `COLUMNS`) to their values.
+        The ``reference_id`` is required.
+    """
+    return cable_from_values(values, _StoredCable)
+
+
+def is_store(path):
+    """\
+    Returns if the provided `path` is a cable store.
+
+    `path`
+        A path.
+    """
+    return os.path.isfile(os.path.join(path, _META_FILENAME))
+
+
+def write_store(path, cables):
+    """\
+    Writes the provided `cables` into a store and returns the number of
+    written cables.
+
+    An existing store is overwritten.
+
+    `path`
+        The directory of the store. It is created if it does not exist.
+    `cables`
+        An iterable of cables.
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    meta_filename = os.path.join(path, _META_FILENAME)
+    if os.path.exists(meta_filename):
+        os.remove(meta_filename)
+    files = [open(_column_filename(path, name), 'wb') for name in COLUMNS]
+    count = 0
+    try:
+        writers = [(name, _ENCODERS.get(name), f.write) for name, f in zip(COLUMNS, files)]
+        pack, dumps = _LENGTH.pack, marshal.dumps
+        for cable in cables:
+            for name, encode, write in writers:
+                value = getattr(cable, name)
+                if encode:
+                    value = encode(value)
+                data = dumps(value)
+                write(pack(len(data)))
+                write(data)
+            count += 1
+    finally:
+        for f in files:
+            f.close()
+    # The meta file is written last, a store without it is incomplete
+    with open(meta_filename, 'wb') as f:
+        f.write('%s\n%d\n%s\n' % (_MAGIC, count, '\t'.join(COLUMNS)))
+    return count
+
+
+def cables_from_store(path, predicate=None, columns=None):
+    """\
+    Returns a generator with ``ICable`` instances.
+
+    `path`
+        The directory of the store.
+    `predicate`
+        A predicate that is invoked for each cable reference identifier.
+        If the predicate evaluates to ``False`` the cable is ignored.
+        By default, all cables are used.
+        If the predicate is a `cablemap.core.predicates.Predicate` which
+        depends on other attributes, the columns of these attributes are
+        read before the other columns.
+    `columns`
+        An iterable of column names which should be read, c.f. `COLUMNS`.
+        The ``reference_id`` is read always. By default, all columns are
+        read. The attributes of other columns (i.e. ``content``) raise an
+        ``AttributeError``, parsed properties (i.e. ``tags``) of other
+        columns are computed on demand if the ``header`` and ``content``
+        columns are read.
+    """
+    stored = _read_meta(path)[1]
+    if columns is not None:
+        columns = set(columns)
+        unknown = columns.difference(stored)
+        if unknown:
+            raise ValueError('Unknown columns: %r' % sorted(unknown))
+    columns = [name for name in stored if name != 'reference_id' and (columns is None or name in columns)]
+    return _cables_from_store(path, predicate, columns)
+
+
+def _cables_from_store(path, predicate, columns):
+    accept = cable_filter(predicate)
+    # The columns which are needed by the predicate are read first
+    filter_columns = [name for name in COLUMNS if accept and name in predicate.attributes]
+    columns = filter_columns + [name for name in columns if name not in filter_columns]
+    ids = open(_column_filename(path, 'reference_id'), 'rb')
+    files = [open(_column_filename(path, name), 'rb') for name in columns]
+    try:
+        readers = [(name, _DECODERS.get(name), f.read, f.seek) for name, f in zip(columns, files)]
+        all_readers = readers
+        filter_readers, readers = readers[:len(filter_columns)], readers[len(filter_columns):]
+        unpack, loads, size = _LENGTH.unpack, marshal.loads, _LENGTH.size
+        read_id = ids.read
+        while True:
+            data = read_id(size)
+            if not data:
+                break
+            reference_id = loads(read_id(unpack(data)[0]))
+            if predicate and not predicate(reference_id):
+                for _, _, read, seek in all_readers:
+                    seek(unpack(read(size))[0], os.SEEK_CUR)
+                continue
+            values = {'reference_id': reference_id}
+            for name, decode, read, _ in filter_readers:
+                value = loads(read(unpack(read(size))[0]))
+                values[name] = decode(value) if decode else value
+            if accept and not accept(cable_from_columns(values)):
+                for _, _, read, seek in readers:
+                    seek(unpack(read(size))[0], os.SEEK_CUR)
+                continue
+            for name, decode, read, _ in readers:
+                value = loads(read(unpack(read(size))[0]))
+                values[name] = decode(value) if decode else value
+            yield cable_from_columns(values)
+    finally:
+        ids.close()
+        for f in files:
+            f.close()
+
+
+def _read_meta(path):
+    """\
+    Returns the number of cables and the column names of the store.
+    """
+    try:
+        with open(os.path.join(path, _META_FILENAME), 'rb') as f:
+            magic, count, columns = f.read().splitlines()[:3]
+    except (IOError, ValueError):
+        raise ValueError('"%s" is not a cable store' % path)
+    if magic != _MAGIC:
+        raise ValueError('Unsupported cable store format "%s"' % magic)
+    return int(count), columns.split('\t')
+
+
+def _column_filename(path, name):
+    return os.path.join(path, name + '.col')
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+A dictionary of TAGs.
+
+The dictionary maps the known TAGs (``subject-tags.txt`` and
+``organization-tags.txt``) to their kind and is loaded on first use::
+
+    tag_kind(u'PREL')                   # consts.TAG_KIND_SUBJECT
+    tag_kinds([u'PREL', u'OBAMA, BARACK', u'GM'])
+    canonicalize_tag(u'PHUMPGOV')       # (u'PHUM', u'PGOV')
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+from __future__ import absolute_import
+import os
+import codecs
+from cablemap.core import consts
+
+# Used to normalize the TAG (corrects typos etc.), c.f. `canonicalize_tag`
+_TAG_FIXES = {
+    u'CLINTON HILLARY': (u'CLINTON, HILLARY',),
+    u'STEINBERG JAMES': (u'STEINBERG, JAMES B.',),
+    u'BIDEN JOSEPH': (u'BIDEN, JOSEPH',),
+    u'ZOELLICK ROBERT': (u'ZOELLICK, ROBERT',),
+    u'RICE CONDOLEEZZA': (u'RICE, CONDOLEEZZA',),
+    u'CARSON JOHNNIE': (u'CARSON, JOHNNIE',),
+    u'BUSH GEORGE': (u'BUSH, GEORGE W.',),
+    u'ROOD JOHN': (u'ROOD, JOHN',),
+    u'CROS GERARD': (u'CROS, GERARD',),
+    u'NOVO GUILLERMO': (u'NOVO, GUILLERMO',),
+    u'REMON PEDRO': (u'REMON, PEDRO',),
+    u'JIMENEZ GASPAR': (u'JIMENEZ, GASPAR',),
+    u'COUNTER TERRORISM': (u'COUNTERTERRORISM',),
+    u'MOPPS': (u'MOPS',), # 09BEIRUT818
+    u'POGOV': (u'PGOV',), # 09LONDON2222
+    u'RU': (u'RS',), # 09BERLIN1433, 09RIYADH181 etc.
+    u'SYR': (u'SY',),
+    u'UNDESCO': (u'UNESCO',), # 05SANJOSE2199
+    u'KWWMN': (u'KWMN',), # 09TRIPOLI754
+    u'RUPREL': (u'RS', u'PREL'), # 00HELSINKI2613)
+    u'ITPHUM': (u'IT', u'PHUM'), # 02ROME1196
+    u'ITPGOV': (u'IT', u'PGOV'), # 02ROME3639
+    u'NATOPREL': (u'NATO', u'PREL'), # 03VATICAN523
+    u'SPCVIS': (u'SP', u'CVIS'), # 04MADRID1764
+    u'MASSMNUC': (u'MASS', u'MNUC'), # 08BRASILIA93
+    u'KNNPMNUC': (u'KNNP', u'MNUC'), # 08THEHAGUE553
+    u'PTER MARR': (u'PTER', u'MARR'), # 07BAKU855
+    u'PHUMPGOV': (u'PHUM', u'PGOV'), #09PARAMARIBO103
+    u'PHUMPREL': (u'PHUM', u'PREL'), # 07NAIROBI4427
+    u'VTPREL': (u'VT', u'PREL'), # 03VATICAN1570 and others
+    u'VEPREL': (u'VE', u'PREL'), # 02VATICAN5607
+    u'PRELPK': (u'PREL', u'PK'), # 10ISLAMABAD332
+    u'PRELBR': (u'PREL', u'BR'), # 06BRASILIA2073
+    u'PBTSRU': (u'PBTS', u'RS'), # 09MANAGUA913
+    u'PGOVSOCI': (u'PGOV', u'SOCI'), # 07SAOPAULO726
+    u'NATOIRAQ': (u'NATO', u'IRAQ'), # 05ATHENS2769
+    u'ECONCS': (u'ECON', u'CS'), # 07SANJOSE298
+    u'PGOVLO': (u'PGOV', u'LO'), # 08BRATISLAVA377
+    u'SNARCS': (u'SNAR', u'CS'), # 08SANJOSE400
+    u'ECINECONCS': (u'ECIN', u'ECON', u'CS'), # 06SANJOSE2649
+    u'EFINECONCS': (u'EFIN', u'ECON', u'CS'), # 06SANJOSE2803
+    u'KWMNCS': (u'KWMN', u'CS'), # 09SANJOSE692
+    u'EINDETRD': (u'EIND', u'ETRD'), # 09PARIS1267
+    u'ETRDEINVTINTCS': (u'ETRD', u'EINV', 'TINT', u'CS'), # 07SANJOSE426
+    u'SNARIZ': (u'SNAR', u'IZ'), # 07HELSINKI127
+    u'KPAONZ': (u'KPAO', u'NZ'), # 08WELLINGTON125 and others
+    u'ELTNSNAR': (u'ELTN', u'SNAR'), # 07SAOPAULO161
+    u'SENVKGHG': (u'SENV', u'KGHG'), # 09OTTAWA246
+    u'ECON KISL': (u'ECON', u'KISL'), # 09RIYADH651
+    u'UNFCYP': (u'UNFICYP',), # 09ATHENS252
+    u'OVIPPRELUNGANU': (u'OVIP', u'PREL', u'UNGA', u'NU'), # 08MANAGUA1184
+    u'ECONEFIN': (u'ECON', u'EFIN'), # 09CAIRO1691
+    u'ETRDECONWTOCS': (u'ETRD', u'ECON', u'WTO', u'CS'), # 07SANJOSE436
+    u'SENVEAGREAIDTBIOECONSOCIXR': (u'SENV', u'EAGR', u'EAID', u'TBIO', u'ECON' u'SOCI' u'XR'), # 08BRASILIA1504 and others
+    u'ECONSOCIXR': (u'ECON', u'SOCI', u'XR'), # 08BRASILIA1504 and others
+    u'EINVECONSENVCSJA': (u'EINV', u'ECON', u'SENV', u'CS', u'JA'), # 07SANJOSE653
+#TODO: SENV GR?!?
+#    u'SENVQGR': (u'SENV', u'GR'), # 06BRASILIA2419
+    u'EINVKSCA': (u'EINV', u'KSCA'), # 08BRASILIA1335
+#TODO: Unsure about this one, maybe POL INTERNAL or POL TINT?
+#    u'POLINT': (u'POL', u'INT'), # 05PARIS7195
+    u'PHUMBA': (u'PHUM', u'BA'), # 08ECTION01OF02MANAMA492 which is the malformed version of 08MANAMA492
+    u'ETRDEINVECINPGOVCS': (u'ETRD', u'EINV', u'ECIN', u'PGOV', u'CS'), # 06SANJOSE2802 and others
+    u'AMEDCASCKFLO': (u'AMED', u'CASC', u'KFLO'), # 09BRASILIA542
+    u'KFRDKIRFCVISCMGTKOCIASECPHUMSMIGEG': (u'KFRD', u'KIRF', u'CVIS', u'CMGT', u'KOCI', u'ASEC', u'PHUM', u'SMIG', u'EG'), # 09CAIRO2205
+    u'ASECKFRDCVISKIRFPHUMSMIGEG': (u'ASEC', u'KFRD', u'CVIS', u'KIRF', u'PHUM', u'SMIG', u'EG'), # 09CAIRO2190
+    u'KFRDCVISCMGTCASCKOCIASECPHUMSMIGEG': (u'KFRD', u'CVIS', u'CMGT', u'CASC', u'KOCI', u'ASEC', u'PHUM', u'SMIG', u'EG'), # 09CAIRO1054 and others
+    u'PGOVSMIGKCRMKWMNPHUMCVISKFRDCA': (u'PGOV', u'SMIG', u'KCRM', u'KWMN', u'PHUM', u'CVIS', u'KFRD', u'CA'), # 08TORONTO24
+    u'KPAOPREL': (u'KPAO', u'PREL'), # 08VIENTIANE632
+    u'POLMIL': (u'POL', u'MIL'), # 04PANAMA586 and others
+    u'IZPREL': (u'IZ', u'PREL'), # 03ROME2045 and others
+}
+
+# TAG -> kind, c.f. `_kinds`
+_KINDS = None
+
+
+def _read_tags(filename):
+    with codecs.open(os.path.join(os.path.dirname(__file__), filename), 'rb', 'utf-8') as f:
+        return [l.upper().rstrip() for l in f if l.strip()]
+
+
+def _kinds():
+    """\
+    Returns the dictionary of the known TAGs. The dictionary is created on
+    first use.
+    """
+    global _KINDS
+    if _KINDS is None:
+        kinds = {}
+        for filename, kind in ((u'organization-tags.txt', consts.TAG_KIND_ORG),
+                               (u'subject-tags.txt', consts.TAG_KIND_SUBJECT)):
+            for tag in _read_tags(filename):
+                kinds[tag] = _rule_kind(tag, kind)
+        _KINDS = kinds
+    return _KINDS
+
+
+def _rule_kind(tag, default):
+    """\
+    Returns the kind of the `tag` which is determined by its form or the
+    `default`.
+    """
+    if len(tag) == 2:
+        return consts.TAG_KIND_GEO
+    if u',' in tag:
+        return consts.TAG_KIND_PERSON
+    if tag[0] in u'Kk' and len(tag) == 4:
+        return consts.TAG_KIND_PROGRAM
+    return default
+
+
+def tag_kind(tag, default=consts.TAG_KIND_UNKNOWN):
+    """\
+    Returns the TAG kind.
+
+    `tag`
+        A string.
+    `default`
+        A value to return if the TAG kind is unknown
+        (set to ``consts.TAG_KIND_UNKNOWN`` by default)
+    """
+    kinds = _KINDS or _kinds()
+    kind = kinds.get(tag)
+    if kind is None:
+        kind = _rule_kind(tag, None)
+        if kind is None:
+            kind = kinds.get(tag.upper(), default)
+    return kind
+
+
+def tag_kinds(tags, default=consts.TAG_KIND_UNKNOWN):
+    """\
+    Returns a list with the kinds of the provided `tags`, c.f. `tag_kind`.
+
+    `tags`
+        An iterable of strings.
+    `default`
+        A value to use if the TAG kind is unknown
+        (set to ``consts.TAG_KIND_UNKNOWN`` by default)
+    """
+    get, res = (_KINDS or _kinds()).get, []
+    append = res.append
+    for tag in tags:
+        kind = get(tag)
+        if kind is None:
+            kind = _rule_kind(tag, None)
+            if kind is None:
+                kind = get(tag.upper(), default)
+        append(kind)
+    return res
+
+
+def tags_of_kind(kind):
+    """\
+    Returns a frozenset of the known TAGs of the provided `kind`.
+
+    Person TAGs and most geographic TAGs are not known, they are detected
+    by their form, c.f. `tag_kind`.
+
+    `kind`
+        A TAG kind, i.e. ``consts.TAG_KIND_SUBJECT``.
+    """
+    return frozenset(tag for tag, k in _kinds().iteritems() if k == kind)
+
+
+def canonicalize_tag(tag):
+    """\
+    Returns a tuple of the canonical TAGs of the provided `tag`.
+
+    Malformed TAGs are corrected, i.e. ``u'POGOV'`` becomes ``(u'PGOV',)``
+    and TAGs which lack a separator are split, i.e. ``u'PHUMPGOV'`` becomes
+    ``(u'PHUM', u'PGOV')``.
+
+    `tag`
+        A string.
+    """
+    tag = tag.upper()
+    tags = _TAG_FIXES.get(tag)
+    if tags is None:
+        return (tag,)
+    res = ()
+    for t in tags:
+        # I.e. 08BRASILIA1504 contains "SENVEAGREAIDTBIOECONSOCIXR" -> ..., "ECONSOCIXR"
+        res += _TAG_FIXES.get(t, (t,))
+    return res
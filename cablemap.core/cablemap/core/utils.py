@@ -16,50 +16,197 @@ from __future__ import absolute_import, with_statement
 import os
 import re
 import csv
+import time
 import codecs
+import mmap
 import string
-from itertools import imap
+import socket
+import hashlib
+import shutil
+import tempfile
+import httplib
+import urlparse
+import threading
+from itertools import imap, ifilter
 from StringIO import StringIO
+from multiprocessing.pool import ThreadPool
 import gzip
 import urllib2
-from cablemap.core import cable_from_file, cable_from_html, cable_from_row, consts
+from cablemap.core import cable_from_file, cable_from_html, cable_from_row, consts, c14n, tags
+from cablemap.core.c14n import canonicalize_id
+from cablemap.core.store import is_store, cables_from_store
+from cablemap.core.predicates import cable_filter, id_prefixes
 import sys
 csv.field_size_limit(sys.maxint)
 del sys
 
-_CABLEID2MONTH = None
+# The memory mapped cable -> month index, c.f. `_cable_month`
+_CABLE2MONTH = None
+_CABLE2MONTH_LOCK = threading.Lock()
+_CABLE2MONTH_FILENAME = os.path.join(os.path.dirname(__file__), 'cable2month.bin')
+# The source of the index, c.f. `_build_cable2month`
+_CABLE2MONTH_SOURCE = os.path.join(os.path.dirname(__file__), 'cable2month.csv.gz')
+_CABLE2MONTH_MAGIC = 'cablemap-cable2month-1\n'
 
+# Maps the reference identifiers of consts.INVALID_CABLE_IDS to the WikiLeaks identifiers
+_WIKILEAKS_IDS = dict((v, k) for k, v in consts.INVALID_CABLE_IDS.iteritems())
 
-class _Request(urllib2.Request):
-    def __init__(self, url):
-        urllib2.Request.__init__(self, url,
-                                 headers={'User-Agent': 'Cablemap/1.2',
-                                          'Accept-Encoding': 'gzip, identity'})
 
+_HEADERS = {'User-Agent': 'Cablemap/1.2', 'Accept-Encoding': 'gzip, identity'}
 
-def _fetch_url(url):
+_REDIRECT_STATUS = (301, 302, 303, 307)
+_MAX_REDIRECTS = 5
+
+
+class _HTTPClient(object):
+    """\
+    Fetches pages and keeps the connections alive, each thread uses its
+    own connection per host.
+
+    Failed requests are repeated with an exponential backoff. If a cache
+    directory is provided, the pages are kept in files named by the SHA-1
+    of the URL and the network is not consulted again. The cache is looked
+    up before a page is fetched, so the key is derived from the URL and
+    not from the content.
+
+    The client is shared, the cache directory is provided per request.
+    """
+    def __init__(self, timeout=30, retries=3, backoff=0.5):
+        """\
+
+        `timeout`
+            The timeout of a request in seconds.
+        `retries`
+            The max. number of repeated requests.
+        `backoff`
+            The delay in seconds before the first repeated request, the
+            delay is doubled for each further request.
+        """
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff = backoff
+        self._local = threading.local()
+
+    def fetch(self, url, cache=None):
+        """\
+        Returns the content of the provided URL.
+
+        `cache`
+            A directory to keep the fetched pages or ``None``.
+        """
+        filename = self._cache_filename(url, cache)
+        if filename and os.path.isfile(filename):
+            with open(filename, 'rb') as f:
+                return f.read().decode('utf-8')
+        try:
+            content = self._fetch(url)
+        except (IOError, httplib.HTTPException):
+            if 'wikileaks.org' not in url:
+                raise
+            content = self._fetch(url.replace('wikileaks.org', 'wikileaks.ch'))
+        if filename:
+            dirname = os.path.dirname(filename)
+            if not os.path.isdir(dirname):
+                try:
+                    os.makedirs(dirname)
+                except OSError: # Created by another thread
+                    pass
+            tmp = '%s.%s.tmp' % (filename, threading.current_thread().ident)
+            with open(tmp, 'wb') as f:
+                f.write(content)
+            os.rename(tmp, filename)
+        return content.decode('utf-8')
+
+    def close(self):
+        """\
+        Closes the connections of the current thread.
+        """
+        for conn in self._local.__dict__.pop('connections', {}).itervalues():
+            conn.close()
+
+    def _cache_filename(self, url, cache):
+        if not cache:
+            return None
+        key = hashlib.sha1(url.encode('utf-8') if isinstance(url, unicode) else url).hexdigest()
+        return os.path.join(cache, key[:2], key)
+
+    def _fetch(self, url):
+        """\
+        Returns the (undecoded) content of the URL, redirects are followed.
+        """
+        url = url.encode('utf-8') if isinstance(url, unicode) else url
+        for _ in range(_MAX_REDIRECTS):
+            resp, body = self._request(url)
+            location = resp.getheader('location')
+            if resp.status in _REDIRECT_STATUS and location:
+                url = urlparse.urljoin(url, location)
+                continue
+            if resp.status != 200:
+                raise urllib2.HTTPError(url, resp.status, resp.reason, resp.msg, None)
+            if resp.getheader('content-encoding') == 'gzip':
+                body = gzip.GzipFile(fileobj=StringIO(body)).read()
+            return body
+        raise urllib2.URLError('Too many redirects: %s' % url)
+
+    def _request(self, url):
+        """\
+        Returns the response and the body, failed requests and server errors
+        are repeated. Raises an ``URLError`` if the request failed.
+        """
+        scheme, netloc, path, query, _ = urlparse.urlsplit(url)
+        if query:
+            path += '?' + query
+        connections = self._local.__dict__.setdefault('connections', {})
+        key = scheme, netloc
+        delay = self._backoff
+        for attempt in range(self._retries + 1):
+            conn = connections.get(key)
+            if conn is None:
+                cls = httplib.HTTPSConnection if scheme == 'https' else httplib.HTTPConnection
+                conn = connections[key] = cls(netloc, timeout=self._timeout)
+            try:
+                conn.request('GET', path or '/', headers=_HEADERS)
+                resp = conn.getresponse()
+                body = resp.read()
+                if resp.status < 500 or attempt == self._retries:
+                    return resp, body
+            except (httplib.HTTPException, socket.error), ex:
+                conn.close()
+                del connections[key]
+                # Unknown hosts are not repeated
+                if attempt == self._retries or isinstance(ex, socket.gaierror):
+                    raise urllib2.URLError(ex)
+            time.sleep(delay)
+            delay *= 2
+
+
+_CLIENT = _HTTPClient()
+
+
+def _fetch_url(url, cache=None):
     """\
     Returns the content of the provided URL.
+
+    `cache`
+        An optional directory which keeps the fetched pages.
     """
-    try:
-        resp = urllib2.urlopen(_Request(url))
-    except urllib2.URLError:
-        if 'wikileaks.org' in url:
-            resp = urllib2.urlopen(_Request(url.replace('wikileaks.org', 'wikileaks.ch')))
-        else:
-            raise
-    if resp.info().get('Content-Encoding') == 'gzip':
-        return gzip.GzipFile(fileobj=StringIO(resp.read())).read().decode('utf-8')
-    return resp.read().decode('utf-8')
+    return _CLIENT.fetch(url, cache)
     
 
 _CGSN_BASE = u'https://cablegatesearch.wikileaks.org/cable.php?id='
+_WL_CABLE_BASE = u'https://wikileaks.org/cable/'
 _CGSN_WL_SOURCE_SEARCH = re.compile(ur'''<td.*?>Source.+?<a.*?href=["']([^"']+)''').search
 
-def cable_page_by_id(reference_id):
+def cable_page_by_id(reference_id, cache=None):
     """\
     Experimental: Returns the HTML page of the cable identified by `reference_id`.
 
+    `reference_id`
+        The reference identifier of the cable.
+    `cache`
+        An optional directory which keeps the fetched pages. Pages in the
+        cache are not fetched again.
+
     >>> cable_page_by_id('09BERLIN1167') is not None
     True
     >>> cable_page_by_id('22BERLIN1167') is None
@@ -71,58 +218,155 @@ def cable_page_by_id(reference_id):
     >>> cable_page_by_id('10MUSCAT103') is not None
     True
     """
-    global _CABLEID2MONTH
-    def wikileaks_id(reference_id):
-        if reference_id in consts.INVALID_CABLE_IDS.values():
-            for k, v in consts.INVALID_CABLE_IDS.iteritems():
-                if v == reference_id:
-                    return k
-        return reference_id
-
     def wikileaks_url(wl_id):
-        m = _CABLEID2MONTH.get(wl_id)
+        m = _cable_month(wl_id)
         if m is None:
             return None
         y = wl_id[:2]
         y = u'19' + y if int(y) > 10 else u'20' + y
-        return u'https://wikileaks.org/cable/%s/%s/%s' % (y, m.zfill(2), wl_id)
+        return u'%s%s/%02d/%s' % (_WL_CABLE_BASE, y, m, wl_id)
 
-    if _CABLEID2MONTH is None:
-        with gzip.open(os.path.join(os.path.dirname(__file__), 'cable2month.csv.gz'), 'r') as f:
-            reader = csv.reader(f)
-            _CABLEID2MONTH = dict(reader)
-    wl_id = wikileaks_id(reference_id)
+    wl_id = _WIKILEAKS_IDS.get(reference_id, reference_id)
     wl_url = wikileaks_url(wl_id)
     if wl_url is None:
         # The cable reference is not known, try to consult Cablegatesearch.
-        html = _fetch_url(_CGSN_BASE + wl_id)
+        html = _fetch_url(_CGSN_BASE + wl_id, cache)
         m = _CGSN_WL_SOURCE_SEARCH(html)
         wl_url = m.group(1) if m else None
     if wl_url is None:
         return None
-    return _fetch_url(wl_url)
+    return _fetch_url(wl_url, cache)
 
 
-def cable_by_id(reference_id):
+def _cable_month(wl_id):
+    """\
+    Returns the month (an integer) of the WikiLeaks cable page of the cable
+    identified by `wl_id` or ``None`` if the cable is unknown.
+
+    The index file is memory mapped on first use and searched by binary
+    search, c.f. `_write_cable2month`.
+    """
+    global _CABLE2MONTH
+    index = _CABLE2MONTH
+    if index is None:
+        with _CABLE2MONTH_LOCK:
+            if _CABLE2MONTH is None:
+                with open(_CABLE2MONTH_FILENAME, 'rb') as f:
+                    index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if index[:len(_CABLE2MONTH_MAGIC)] != _CABLE2MONTH_MAGIC:
+                    raise ValueError('"%s" is not a cable2month index' % _CABLE2MONTH_FILENAME)
+                _CABLE2MONTH = index
+            index = _CABLE2MONTH
+    key = wl_id.encode('utf-8')
+    lo, hi = len(_CABLE2MONTH_MAGIC), len(index)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        start = max(index.rfind('\n', lo, mid) + 1, lo)
+        end = index.find('\n', start)
+        ident = index[start:end - 1]
+        if ident == key:
+            return ord(index[end - 1]) & 0x7f
+        if ident < key:
+            lo = end + 1
+        else:
+            hi = start
+    return None
+
+
+def _write_cable2month(filename, items):
+    """\
+    Writes the cable -> month index.
+
+    The index is a sorted list of ``<reference-id><month-byte>\\n`` lines, the
+    month byte is ``0x80 | month``.
+
+    `filename`
+        The filename of the index.
+    `items`
+        An iterable of ``(reference-id, month)`` tuples.
+    """
+    with open(filename, 'wb') as f:
+        f.write(_CABLE2MONTH_MAGIC)
+        for reference_id, month in sorted((ref.encode('utf-8'), int(month)) for ref, month in items):
+            f.write('%s%s\n' % (reference_id, chr(0x80 | month)))
+
+
+def _build_cable2month(source=_CABLE2MONTH_SOURCE, filename=_CABLE2MONTH_FILENAME):
+    """\
+    Creates the cable -> month index from a CSV file with
+    ``<reference-id>,<month>`` rows.
+
+    `source`
+        The CSV file, may be gzipped (default: ``cable2month.csv.gz``).
+    `filename`
+        The filename of the index (default: ``cable2month.bin``).
+    """
+    f = gzip.open(source, 'rb') if source.endswith('.gz') else open(source, 'rb')
+    try:
+        _write_cable2month(filename, ((unicode(ref, 'utf-8'), month) for ref, month in csv.reader(f)))
+    finally:
+        f.close()
+
+
+def cable_by_id(reference_id, source=None, cache=None):
     """\
     Returns a cable by its reference identifier or ``None`` if
     the cable does not exist.
 
     `reference_id`
         The reference identifier of the cable.
+    `source`
+        An optional CSV file. If provided, the cable is read from the
+        CSV file (c.f. `cable_from_csv_by_id`) and no network connection
+        is required.
+    `cache`
+        An optional directory which keeps the fetched pages, c.f.
+        `cable_page_by_id`.
     """
-    page = cable_page_by_id(reference_id)
+    if source:
+        return cable_from_csv_by_id(source, reference_id)
+    page = cable_page_by_id(reference_id, cache)
     return cable_from_html(page) if page else None
 
 
-def cable_by_url(url):
+def cables_by_ids(reference_ids, concurrency=8, cache=None):
+    """\
+    Returns a generator which yields a cable or ``None`` (if the cable does
+    not exist) for each of the provided reference identifiers.
+
+    The cables are fetched concurrently, the generator yields them in the
+    order of the `reference_ids`.
+
+    `reference_ids`
+        An iterable of reference identifiers.
+    `concurrency`
+        The max. number of concurrent requests (default: ``8``).
+    `cache`
+        An optional directory which keeps the fetched pages, c.f.
+        `cable_page_by_id`.
+    """
+    def fetch(reference_id):
+        return cable_page_by_id(reference_id, cache)
+    pool = ThreadPool(concurrency)
+    try:
+        for page in pool.imap(fetch, reference_ids):
+            yield cable_from_html(page) if page else None
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def cable_by_url(url, cache=None):
     """\
     Returns a cable read from the provided IRI.
 
     `url`
         The IRI to fetch the cable from.
+    `cache`
+        An optional directory which keeps the fetched pages.
     """
-    page = _fetch_url(url)
+    page = _fetch_url(url, cache)
     return cable_from_html(page) if page else None
 
 
@@ -131,7 +375,8 @@ def cables_from_source(path, predicate=None):
     Returns a generator with ``ICable`` instances.
 
     `path`
-        Either a directory or a CSV file.
+        Either a directory, a cable store (c.f. `cablemap.core.store`) or
+        a CSV file.
     `predicate`
         A predicate that is invoked for each cable reference identifier.
         If the predicate evaluates to ``False`` the cable is ignored.
@@ -139,6 +384,8 @@ def cables_from_source(path, predicate=None):
         I.e. ``cables_from_source('cables.csv', lambda r: r.startswith('09'))``
         would return cables where the reference identifier starts with ``09``.
     """
+    if is_store(path):
+        return cables_from_store(path, predicate)
     return cables_from_directory(path, predicate) if os.path.isdir(path) else cables_from_csv(path, predicate)
 
 
@@ -159,10 +406,24 @@ def cables_from_csv(filename, predicate=None, encoding='utf-8'):
         By default, all cables are used.
         I.e. ``cables_from_csv('cables.csv', lambda r: r.startswith('09'))``
         would return cables where the reference identifier starts with ``09``.
+        If the predicate is a `cablemap.core.predicates.Predicate` and an
+        up-to-date index of the CSV file exists (c.f. `build_csv_index`),
+        only the rows which may be accepted are read.
     `encoding`
         The file encoding (``UTF-8`` by default).
     """
-    return (cable_from_row(row) for row in rows_from_csv(filename, predicate, encoding))
+    cables = (cable_from_row(row) for row in _rows_from_csv(filename, predicate, encoding, _CSV_CABLE_COLUMNS))
+    return _filter_cables(cables, predicate)
+
+
+def _filter_cables(cables, predicate):
+    """\
+    Returns the `cables` which are accepted by the `predicate` if it depends
+    on other attributes than the reference identifier, c.f.
+    `cablemap.core.predicates.cable_filter`.
+    """
+    accept = cable_filter(predicate)
+    return ifilter(accept, cables) if accept else cables
 
 
 def rows_from_csv(filename, predicate=None, encoding='utf-8'):
@@ -183,14 +444,490 @@ def rows_from_csv(filename, predicate=None, encoding='utf-8'):
     `encoding`
         The file encoding (``UTF-8`` by default).
     """
+    return _rows_from_csv(filename, predicate, encoding, _CSV_ALL_COLUMNS)
+
+
+# Columns used by cable_from_row: The identifier and the references are ignored
+_CSV_CABLE_COLUMNS = (1, 2, 3, 4, 6, 7)
+_CSV_ALL_COLUMNS = tuple(range(8))
+
+def _rows_from_csv(filename, predicate, encoding, columns):
+    """\
+    Returns an iterator over all rows in the provided CSV `filename`.
+
+    Only the `columns` are decoded, the values of all other columns are ``None``.
+
+    If the `predicate` provides the prefixes of the identifiers it may accept
+    (c.f. `cablemap.core.predicates.id_prefixes`) and an up-to-date index
+    exists, the rows are located by the index, c.f. `_rows_from_csv_index`.
+    Otherwise, the file is scanned, c.f. `_scan_rows_from_csv`.
+    """
+    prefixes = id_prefixes(predicate)
+    if prefixes is not None and codecs.lookup(encoding).name == 'utf-8':
+        index_filename = _current_csv_index(filename, None)
+        if index_filename:
+            return _rows_from_csv_index(filename, index_filename, prefixes, predicate, columns)
+    return _scan_rows_from_csv(filename, predicate, encoding, columns)
+
+
+def _scan_rows_from_csv(filename, predicate, encoding, columns):
+    """\
+    Returns an iterator over all rows in the provided CSV `filename`.
+
+    UTF-8 encoded files are parsed without transcoding: The CSV parser works
+    on the (memory mapped) bytes and the column values are decoded afterwards.
+    The `predicate` is evaluated before the header and body of a row are
+    parsed, c.f. `_raw_rows_from_csv`.
+    """
+    pred = predicate or bool
+    with open(filename, 'rb') as f:
+        if codecs.lookup(encoding).name != 'utf-8':
+            for row in _UnicodeReader(f, encoding=encoding, delimiter=',', quotechar='"', escapechar='\\'):
+                if row and pred(row[2]):
+                    yield tuple(row)
+            return
+        data = _mmap(f)
+        try:
+            if predicate and data is not f:
+                rows = _raw_rows_from_csv(data, predicate)
+            else:
+                rows = (row for row in _csv_reader(data) if row and pred(unicode(row[2], 'utf-8')))
+            for row in rows:
+                yield tuple([unicode(v, 'utf-8') if i in columns else None for i, v in enumerate(row)])
+        finally:
+            if data is not f:
+                data.close()
+
+
+def _rows_from_csv_index(filename, index_filename, prefixes, predicate, columns):
+    """\
+    Returns an iterator over the rows of the CSV `filename` where the canonical
+    identifier starts with one of the `prefixes` and the `predicate` holds
+    true for the reference identifier. The rows are returned in the order
+    of the file.
+    """
+    with open(index_filename, 'rb') as idx, open(filename, 'rb') as f:
+        index, data = _mmap(idx), _mmap(f)
+        try:
+            offsets = set()
+            for prefix in prefixes:
+                offsets.update(_csv_index_prefix_offsets(index, prefix))
+            for offset in sorted(offsets):
+                data.seek(offset)
+                row = _csv_reader(data).next()
+                if predicate(unicode(row[2], 'utf-8')):
+                    yield tuple([unicode(v, 'utf-8') if i in columns else None for i, v in enumerate(row)])
+        finally:
+            for m, fileobj in ((index, idx), (data, f)):
+                if m is not fileobj:
+                    m.close()
+
+
+# Matches the identifier, the creation date and the reference identifier of
+# a row. These columns never span multiple lines and never contain quotes.
+# Since only the last columns (header, body) may span multiple lines, a line
+# which starts with three quoted fields cannot be part of a field: A line
+# within a field starts either with an escaped quote or with the closing quote
+# of the header field which is followed by one field only.
+_CSV_ROW_PREFIX_PATTERN = re.compile(r'"[^"\\\n]*","[^"\\\n]*","([^"\\\n]*)","')
+_CSV_NEXT_ROW_PATTERN = re.compile(r'\n(?="[^"\\\n]*","[^"\\\n]*","[^"\\\n]*",")')
+
+def _raw_rows_from_csv(data, predicate):
+    """\
+    Returns an iterator over the undecoded rows of `data` (a memory map)
+    where the `predicate` holds true for the reference identifier.
+
+    The predicate is evaluated before the row is parsed. Rejected rows are
+    skipped without parsing or decoding the header and body.
+    Rows which do not start with the expected prefix are parsed by the CSV
+    parser before the predicate is evaluated.
+    """
+    match_prefix, search_next_row = _CSV_ROW_PREFIX_PATTERN.match, _CSV_NEXT_ROW_PATTERN.search
+    size = len(data)
+    pos = 0
+    while pos < size:
+        m = match_prefix(data, pos)
+        if m and not predicate(unicode(m.group(1), 'utf-8')):
+            m = search_next_row(data, m.end())
+            pos = m.end() if m else size
+            continue
+        data.seek(pos)
+        try:
+            row = _csv_reader(data).next()
+        except StopIteration:
+            break
+        pos = data.tell()
+        if m or (row and predicate(unicode(row[2], 'utf-8'))):
+            yield row
+
+
+def _mmap(f):
+    """\
+    Returns a read-only memory map of the provided file or the file itself
+    if it cannot be mapped (i.e. empty files).
+    """
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, EnvironmentError):
+        return f
+
+
+def cable_from_csv_by_id(filename, reference_id, index_filename=None):
+    """\
+    Returns the cable identified by `reference_id` from the provided CSV file
+    or ``None`` if the CSV file does not contain the cable.
+
+    The cable is located by an index file which is created by
+    `build_csv_index` if it does not exist or if it is outdated. If the
+    index file cannot be written, the index is kept in memory.
+
+    `filename`
+        Absolute path to a CSV file, c.f. `rows_from_csv`
+    `reference_id`
+        The reference identifier or the canonical identifier of the cable.
+    `index_filename`
+        The filename of the index (default: ``filename + '.idx'``)
+    """
+    for cable in cables_from_csv_by_ids(filename, (reference_id,), index_filename):
+        return cable
+    return None
+
+
+def cables_from_csv_by_ids(filename, reference_ids, index_filename=None):
+    """\
+    Returns a generator with ``ICable`` instances for the provided
+    `reference_ids` in the order of the `reference_ids`. Unknown
+    identifiers are ignored.
+
+    The cables are located by an index file, c.f. `cable_from_csv_by_id`.
+
+    `filename`
+        Absolute path to a CSV file, c.f. `rows_from_csv`
+    `reference_ids`
+        An iterable of reference identifiers and/or canonical identifiers.
+    `index_filename`
+        The filename of the index (default: ``filename + '.idx'``)
+    """
+    index, close_index = _load_csv_index(filename, index_filename)
+    try:
+        with open(filename, 'rb') as f:
+            data = _mmap(f)
+            try:
+                for reference_id in reference_ids:
+                    offset = _csv_index_lookup(index, reference_id)
+                    if offset is not None:
+                        data.seek(offset)
+                        row = _csv_reader(data).next()
+                        yield cable_from_row([unicode(v, 'utf-8') for v in row])
+            finally:
+                if data is not f:
+                    data.close()
+    finally:
+        close_index()
+
+
+_CSV_INDEX_MAGIC = '#cablemap-csv-index-1'
+
+def build_csv_index(filename, index_filename=None):
+    """\
+    Creates an index file which maps the reference identifiers and the
+    canonical identifiers of the cables to the byte offsets of the
+    rows in the provided CSV file.
+
+    Returns the filename of the index.
+
+    The index is a text file with one sorted ``<identifier> TAB <offset> TAB <length>``
+    line per identifier. The first line records the size and modification time
+    of the CSV file to detect outdated indexes.
+
+    `filename`
+        Absolute path to a CSV file, c.f. `rows_from_csv`
+    `index_filename`
+        The filename of the index (default: ``filename + '.idx'``)
+    """
+    index_filename = index_filename or filename + '.idx'
+    _write_csv_index(filename, index_filename, _csv_index_data(filename))
+    return index_filename
+
+
+def _csv_index_data(filename):
+    """\
+    Returns the content of the index of the provided CSV file, c.f.
+    `build_csv_index`.
+    """
+    entries = []
+    with open(filename, 'rb') as f:
+        data = _mmap(f)
+        try:
+            reader = _csv_reader(data)
+            pos = data.tell()
+            for row in reader:
+                end = data.tell()
+                if row:
+                    reference_id = row[2]
+                    entries.append((reference_id, pos, end - pos))
+                    canonical_id = canonicalize_id(unicode(reference_id, 'utf-8')).encode('utf-8')
+                    if canonical_id != reference_id:
+                        entries.append((canonical_id, pos, end - pos))
+                pos = end
+        finally:
+            if data is not f:
+                data.close()
+    entries.sort()
+    lines = ['%s\t%s\n' % (_CSV_INDEX_MAGIC, _csv_index_stamp(filename))]
+    lines.extend('%s\t%d\t%d\n' % entry for entry in entries)
+    return ''.join(lines)
+
+
+def _write_csv_index(filename, index_filename, data):
+    """\
+    Writes the index `data` of the CSV file `filename` to `index_filename`.
+
+    The index is written to a unique temporary file in the directory of the
+    index first, concurrent writers do not interfere with each other.
+    """
+    dirname, basename = os.path.split(os.path.abspath(index_filename))
+    fd, tmp_filename = tempfile.mkstemp(prefix=basename + '.', suffix='.tmp', dir=dirname)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(data)
+        shutil.copymode(filename, tmp_filename)
+        try:
+            os.rename(tmp_filename, index_filename)
+        except OSError: # Windows does not replace existing files
+            if os.path.exists(index_filename):
+                os.remove(index_filename)
+            os.rename(tmp_filename, index_filename)
+    except:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+
+
+def _csv_index_stamp(filename):
+    st = os.stat(filename)
+    return '%d\t%r' % (st.st_size, st.st_mtime)
+
+
+def _load_csv_index(filename, index_filename):
+    """\
+    Returns the (memory mapped) content of an up-to-date index of the provided
+    CSV file and a function which releases it.
+
+    The index file is created if it does not exist or if it is outdated. If
+    the index file cannot be written (i.e. the directory is read-only), the
+    index is kept in memory.
+    """
+    current = _current_csv_index(filename, index_filename)
+    if not current:
+        data = _csv_index_data(filename)
+        try:
+            _write_csv_index(filename, index_filename or filename + '.idx', data)
+        except EnvironmentError:
+            pass
+        return data, lambda: None
+    idx = open(current, 'rb')
+    index = _mmap(idx)
+    def close():
+        if index is not idx:
+            index.close()
+        idx.close()
+    return index, close
+
+
+def _current_csv_index(filename, index_filename):
+    """\
+    Returns the filename of the index of the provided CSV file or ``None``
+    if the index does not exist or if it is outdated.
+    """
+    index_filename = index_filename or filename + '.idx'
+    if os.path.exists(index_filename):
+        with open(index_filename, 'rb') as f:
+            if f.readline() == '%s\t%s\n' % (_CSV_INDEX_MAGIC, _csv_index_stamp(filename)):
+                return index_filename
+    return None
+
+
+def _csv_index_lookup(index, key):
+    """\
+    Returns the byte offset of the row identified by `key` or ``None``.
+
+    `index`
+        The (memory mapped) content of an index file, c.f. `build_csv_index`.
+    `key`
+        A reference identifier or canonical identifier.
+    """
+    key = key.encode('utf-8')
+    lo = _csv_index_lower_bound(index, key)
+    end = index.find('\n', lo)
+    if end < 0:
+        return None
+    ident, offset, _ = index[lo:end].split('\t')
+    return int(offset) if ident == key else None
+
+
+def _csv_index_prefix_offsets(index, prefix):
+    """\
+    Returns an iterator over the byte offsets of the rows where an identifier
+    starts with the provided `prefix`. An offset may be returned twice if the
+    reference identifier and the canonical identifier of a row match.
+    """
+    prefix = prefix.encode('utf-8')
+    pos = _csv_index_lower_bound(index, prefix)
+    while True:
+        end = index.find('\n', pos)
+        if end < 0:
+            break
+        ident, offset, _ = index[pos:end].split('\t')
+        if not ident.startswith(prefix):
+            break
+        yield int(offset)
+        pos = end + 1
+
+
+def _csv_index_lower_bound(index, key):
+    """\
+    Returns the position of the first line of the `index` with an
+    identifier >= `key` (a byte string).
+    """
+    lo, hi = index.find('\n') + 1, len(index)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        start = index.rfind('\n', 0, mid) + 1
+        if index[start:index.find('\t', start)] < key:
+            lo = index.find('\n', start) + 1
+        else:
+            hi = start
+    return lo
+
+
+def rows_from_csv_range(filename, start, end=None, predicate=None, encoding='utf-8'):
+    """\
+    Returns an iterator over the rows of the provided CSV `filename` which
+    start within the byte range [`start`, `end`).
+
+    The range boundaries do not need to point to the start of a row: A row
+    belongs to the range in which its first byte is located. Hence, several
+    readers can process adjacent ranges of the same file independently; each
+    row is returned by exactly one reader.
+
+    `filename`
+        Absolute path to a file to read the cables from, c.f. `rows_from_csv`
+    `start`
+        The byte offset where the range starts (inclusive).
+    `end`
+        The byte offset where the range ends (exclusive). If `end` is ``None``
+        (default), all rows up to the end of the file are returned.
+    `predicate`
+        A predicate that is invoked for each cable reference identifier.
+        If the predicate evaluates to ``False`` the cable is ignored.
+        By default, all cables are used.
+    `encoding`
+        The file encoding (``UTF-8`` by default). The encoding must be
+        ASCII compatible.
+    """
     pred = predicate or bool
     with open(filename, 'rb') as f:
-        for row in _UnicodeReader(f, encoding=encoding, delimiter=',', quotechar='"', escapechar='\\'):
-            ident, created, reference_id, origin, classification, references, header, body = row
-            if row and pred(reference_id):
+        if end is None:
+            end = os.fstat(f.fileno()).st_size
+        pos = _csv_record_start(f, start)
+        if pos >= end:
+            return
+        f.seek(pos)
+        reader = _csv_reader(f)
+        while f.tell() < end:
+            try:
+                row = reader.next()
+            except StopIteration:
+                break
+            if not row:
+                continue
+            ident, created, reference_id, origin, classification, references, header, body = [unicode(s, encoding) for s in row]
+            if pred(reference_id):
                 yield ident, created, reference_id, origin, classification, references, header, body
 
 
+def csv_ranges(filename, count):
+    """\
+    Splits the provided CSV file into (at most) `count` byte ranges.
+
+    Returns a list of ``(start, end)`` tuples where `start` is the byte offset
+    of the first row of the range and `end` is the byte offset of the first
+    row of the next range (or the file size). The ranges can be passed
+    to `rows_from_csv_range`.
+
+    `filename`
+        Absolute path to a CSV file, c.f. `rows_from_csv`
+    `count`
+        The number of ranges.
+    """
+    size = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        offsets = [0] + [_csv_record_start(f, size * i // count) for i in range(1, count)] + [size]
+    return [(start, end) for start, end in zip(offsets, offsets[1:]) if start < end]
+
+
+_CSV_COLUMNS = 8
+_CSV_LOOKBEHIND = 64
+
+def _csv_reader(f):
+    """\
+    Returns a CSV reader which reads the rows from the current position of
+    `f` and leaves `f` positioned at the start of the next row.
+    """
+    return csv.reader(iter(f.readline, ''), delimiter=',', quotechar='"', escapechar='\\')
+
+
+def _csv_record_start(f, offset):
+    """\
+    Returns the byte offset of the first row which starts at or after
+    the provided `offset`. If no row starts at or after `offset`, the
+    file size is returned.
+
+    Rows may contain line breaks within quoted fields. A row starts after a
+    line which ends with an unescaped quote and the next line starts with
+    a quote. Candidates are verified by parsing one row.
+    """
+    if offset <= 0:
+        return 0
+    f.seek(max(0, offset - _CSV_LOOKBEHIND))
+    line = f.readline()
+    while line:
+        pos = f.tell()
+        if pos >= offset and _csv_is_record_end(line) and _csv_is_record_start(f, pos):
+            return pos
+        f.seek(pos)
+        line = f.readline()
+    return f.tell()
+
+
+def _csv_is_record_end(line):
+    """\
+    Returns if the provided `line` ends with an unescaped quote.
+    """
+    line = line.rstrip('\r\n')
+    if not line.endswith('"'):
+        return False
+    idx = len(line) - 1
+    stripped = line[:idx].rstrip('\\')
+    return (idx - len(stripped)) % 2 == 0
+
+
+def _csv_is_record_start(f, pos):
+    """\
+    Returns if a row starts at the provided position.
+    """
+    f.seek(pos)
+    if f.read(1) != '"':
+        return False
+    f.seek(pos)
+    try:
+        row = _csv_reader(f).next()
+    except (StopIteration, csv.Error):
+        return False
+    return len(row) == _CSV_COLUMNS
+
+
 class _UTF8Recoder:
     """\
     Iterator that reads an encoded stream and reencodes the input to UTF-8
@@ -238,7 +975,7 @@ def cables_from_directory(directory, predicate=None):
         I.e. ``cables_from_directory('./cables/', lambda f: f.startswith('09'))``
         would return cables where the filename starts with ``09``. 
     """
-    return imap(cable_from_file, cablefiles_from_directory(directory, predicate))
+    return _filter_cables(imap(cable_from_file, cablefiles_from_directory(directory, predicate)), predicate)
 
 
 def cablefiles_from_directory(directory, predicate=None):
@@ -269,18 +1006,15 @@ def reference_id_parts(reference_id):
     `reference_id`
         Cable reference identifier or canonical identifier.
     """
-    m = consts.REFERENCE_ID_PATTERN.match(reference_id)
-    if m:
-        return m.groups()
+    parts = consts.split_reference_id(reference_id)
+    if parts:
+        return parts
     raise ValueError('Illegal reference identifier: "%s"' % reference_id)
 
 
-_TAGS_SUBJECT = [l.upper().rstrip() for l in codecs.open(os.path.join(os.path.dirname(__file__), 'subject-tags.txt'), 'rb', 'utf-8')]
-_TAGS_ORG = [l.upper().rstrip() for l in codecs.open(os.path.join(os.path.dirname(__file__), 'organization-tags.txt'), 'rb', 'utf-8')]
-
 def tag_kind(tag, default=consts.TAG_KIND_UNKNOWN):
     """\
-    Returns the TAG kind.
+    Returns the TAG kind, c.f. `cablemap.core.tags.tag_kind`.
 
     `tag`
         A string.
@@ -288,18 +1022,7 @@ def tag_kind(tag, default=consts.TAG_KIND_UNKNOWN):
         A value to return if the TAG kind is unknown
         (set to ``constants.TAG_KIND_UNKNOWN`` by default)
     """
-    if len(tag) == 2:
-        return consts.TAG_KIND_GEO
-    if u',' in tag:
-        return consts.TAG_KIND_PERSON
-    if tag[0] in u'Kk' and len(tag) == 4:
-        return consts.TAG_KIND_PROGRAM
-    t = tag.upper()
-    if t in _TAGS_SUBJECT:
-        return consts.TAG_KIND_SUBJECT
-    if t in _TAGS_ORG:
-        return consts.TAG_KIND_ORG
-    return default
+    return tags.tag_kind(tag, default)
 
 
 _CLEAN_PATTERNS = (
@@ -373,37 +1096,98 @@ _SPECIAL_WORDS = {
     u'FAO/WHO': u'FAO/WHO',
 }
 
-_TITLEFY_SMALL_PATTERN = re.compile(r'^(([0-9]+(th|st|rd|nd))|(a)|(an)|(and)|(as)|(at)|(but)|(by)|(en)|(for)|(if)|(in)|(of)|(on)|(or)|(the)|(to)|(v\.?)|(via)|(vs\.?))$', re.IGNORECASE)
-_TITLEFY_BIG_PATTERN = re.compile(ur"^([%s]?(%s)|(xx+)|(XX+)|(\([A-Z]{2,4}\):?))(?:[%s]?)(([,:;\.\-])|(?:'|’)([a-z]{1,3}))?$" % (string.punctuation, r'|'.join(_ACRONYMS), string.punctuation), re.UNICODE|re.IGNORECASE)
+# Acronyms which contain only letters, digits, "/" and "-" are found by a set
+# lookup, the others are matched by `_TITLEFY_BIG_PATTERN`
+_is_plain_acronym = re.compile(r'^[A-Za-z0-9/\-]+$').match
+_TITLEFY_ACRONYMS = frozenset(a.lower() for a in _ACRONYMS if _is_plain_acronym(a))
+# The chars of the punctuation class of `_TITLEFY_BIG_PATTERN` ("\" escapes "]")
+_TITLEFY_PUNCTUATION = frozenset(string.punctuation) - frozenset('\\')
+_TITLEFY_SEPARATORS = frozenset(u',:;.-')
+_TITLEFY_APOSTROPHES = frozenset(u"'’")
+_TITLEFY_SMALL_WORDS = frozenset([u'a', u'an', u'and', u'as', u'at', u'but', u'by', u'en', u'for', u'if',
+                                  u'in', u'of', u'on', u'or', u'the', u'to', u'v', u'v.', u'via', u'vs', u'vs.'])
+_TITLEFY_BIG_PATTERN = re.compile(ur"^([%s]?(%s)|(xx+)|(XX+)|(\([A-Z]{2,4}\):?))(?:[%s]?)(([,:;\.\-])|(?:'|’)([a-z]{1,3}))?$" % (string.punctuation, r'|'.join(a for a in _ACRONYMS if not _is_plain_acronym(a)), string.punctuation), re.UNICODE|re.IGNORECASE)
 _APOS_PATTERN = re.compile(ur"^(\w+)('|’|,)([A-Z]{1,3}|,s)$", re.UNICODE|re.IGNORECASE)
 _is_number = re.compile('^[0-9]+(th|st|rd|nd)$', re.IGNORECASE).match
 
+
+def _is_small_word(word):
+    return word.lower() in _TITLEFY_SMALL_WORDS or _is_number(word)
+
+
+def _is_acronym(word):
+    """\
+    Returns if the `word` is an acronym. The acronym may be enclosed by
+    punctuation and may be followed by a separator or by an apostrophe and up
+    to three letters, i.e. ``(MTCR):`` or ``ROK's``.
+    """
+    w = word.lower()
+    if w in _TITLEFY_ACRONYMS:
+        return True
+    stems = [w]
+    if w[-1:] in _TITLEFY_SEPARATORS:
+        stems.append(w[:-1])
+    for i in range(max(len(w) - 4, 0), len(w) - 1):
+        if w[i] in _TITLEFY_APOSTROPHES and all(u'a' <= c <= u'z' for c in w[i+1:]):
+            stems.append(w[:i])
+    for stem in stems:
+        for start in ((0, 1) if stem[:1] in _TITLEFY_PUNCTUATION else (0,)):
+            for end in ((0, 1) if stem[-1:] in _TITLEFY_PUNCTUATION else (0,)):
+                if stem[start:len(stem)-end] in _TITLEFY_ACRONYMS:
+                    return True
+    return _TITLEFY_BIG_PATTERN.match(word) is not None
+
+
+def _clean_word(word):
+    return _APOS_PATTERN.sub(lambda m: u'%s%s%s' % (m.group(1), m.group(2) if not m.group(2) == ',' else u"'", m.group(3).lower()), word)
+
+
+def _titlefy_word(word):
+    if _is_number(word):
+        return word.lower()
+    if _is_acronym(word):
+        return _clean_word(word.upper())
+    return _clean_word(_SPECIAL_WORDS.get(word, word.title()))
+
+_titlefy_word = c14n.Cache(_titlefy_word, 100000)
+
+
 def titlefy(subject):
     """\
     Titlecases the provided subject but respects common abbreviations.
    
     This function returns ``None`` if the provided `subject` is ``None``. It
     returns an empty string if the provided subject is empty.
+
+    The results are cached, c.f. ``titlefy.cache_info()`` and
+    ``titlefy.cache_clear()``.
    
     `subject
         A cable's subject.
     """
-    def clean_word(word):
-        return _APOS_PATTERN.sub(lambda m: u'%s%s%s' % (m.group(1), m.group(2) if not m.group(2) == ',' else u"'", m.group(3).lower()), word)
-    def titlefy_word(word):
-        if _is_number(word):
-            return word.lower()
-        if _TITLEFY_BIG_PATTERN.match(word):
-            return clean_word(word.upper())
-        return clean_word(_SPECIAL_WORDS.get(word, word.title()))
     if not subject:
         return None if subject is None else u''
+    return _TITLEFY_CACHE(subject)
+
+
+def titlefy_many(subjects):
+    """\
+    Returns a list of the titlecased `subjects`, c.f. `titlefy`.
+
+    `subjects`
+        An iterable of subjects.
+    """
+    return [_TITLEFY_CACHE(subject) if subject else titlefy(subject) for subject in subjects]
+
+
+def _titlefy(subject):
     res = []
     append = res.append
+    titlefy_word = _titlefy_word
     wl = subject.strip().split()
     append(titlefy_word(wl[0]))
     for word in wl[1:]:
-        if _TITLEFY_SMALL_PATTERN.match(word):
+        if _is_small_word(word):
             if res[-1][-1] not in ':-':
                 if word == u'A' and res[-1] == u'and' and res[-2] == 'Q':
                     # Q and A
@@ -416,6 +1200,9 @@ def titlefy(subject):
             append(titlefy_word(word))
     return u' '.join(res)
 
+_TITLEFY_CACHE = c14n.Cache(_titlefy, 100000)
+titlefy.cache_info = _TITLEFY_CACHE.info
+titlefy.cache_clear = _TITLEFY_CACHE.clear
 
 if __name__ == '__main__':
     import doctest
@@ -52,7 +52,7 @@ setup(
       platforms = 'any',
       zip_safe = False,
       include_package_data = True,
-      package_data = {'': ['*.txt', '*.json']},
+      package_data = {'': ['*.txt', '*.json', '*.bin']},
       keywords = ['WikiLeaks', 'Cablegate'],
       classifiers = [
                     'Intended Audience :: Developers',
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Handlers shared by the handler tests.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import time
+
+
+class RecordingHandler(object):
+    """\
+    Records all events as ``(event-name, args)`` tuples.
+
+    If `delay` is provided, the handler sleeps `delay` seconds per event.
+    """
+    def __init__(self, delay=0):
+        self.events = []
+        self.delay = delay
+
+    def __getattr__(self, name):
+        def record(*args):
+            if self.delay:
+                time.sleep(self.delay)
+            self.events.append((name, args))
+        return record
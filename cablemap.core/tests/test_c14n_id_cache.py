@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the batch canonicalization of cable identifiers and its cache.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+from nose.tools import eq_, ok_
+from cablemap.core import c14n
+from cablemap.core.c14n import canonicalize_id, canonicalize_ids
+
+_IDS = (u'09BERLIN1167', u'09SECSTATE1234', u'08EMBASSYPARIS12', u'09SECTION01OF03SANJOSE525',
+        u'09BERLIN1167', u'07TAIPEI12', u'09SECSTATE1234')
+
+
+def test_batch():
+    canonicalize_id.cache_clear()
+    expected = [c14n._canonicalize_id(reference_id) for reference_id in _IDS]
+    eq_(expected, canonicalize_ids(_IDS))
+    eq_(expected, canonicalize_ids(iter(_IDS)))
+    eq_(expected, [canonicalize_id(reference_id) for reference_id in _IDS])
+
+
+def test_cache_info():
+    canonicalize_id.cache_clear()
+    eq_((0, 0), canonicalize_id.cache_info()[:2])
+    canonicalize_ids(_IDS)
+    info = canonicalize_id.cache_info()
+    eq_(5, info.misses)
+    eq_(2, info.hits)
+    eq_(5, info.currsize)
+    canonicalize_id(u'09BERLIN1167')
+    eq_(3, canonicalize_id.cache_info().hits)
+
+
+def test_shared_result():
+    canonicalize_id.cache_clear()
+    first = canonicalize_id(u'09SECSTATE1234')
+    ok_(first is canonicalize_ids([u'09SECSTATE1234'])[0])
+
+
+def test_generations():
+    calls = []
+    def func(key):
+        calls.append(key)
+        return key.lower()
+    cache = c14n.Cache(func, 2)
+    eq_([u'a', u'b', u'c'], cache.map([u'A', u'B', u'C']))
+    # "A" and "B" are kept by the previous generation
+    eq_(u'a', cache(u'A'))
+    eq_([u'A', u'B', u'C'], calls)
+    eq_(3, cache.info().currsize)
+    cache(u'D')
+    cache(u'E')
+    # Both generations are full
+    eq_(4, cache.info().currsize)
+    # "B" was dropped
+    cache(u'B')
+    eq_([u'A', u'B', u'C', u'D', u'E', u'B'], calls)
+    cache.clear()
+    eq_((0, 0, 2, 0), tuple(cache.info()))
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
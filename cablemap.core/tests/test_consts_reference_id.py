@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the reference identifier validation against the ``REFERENCE_ID_PATTERN``.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+from nose.tools import eq_
+from cablemap.core.consts import REFERENCE_ID_PATTERN, split_reference_id, split_reference_ids
+
+_REFERENCE_IDS = (
+    u'09BERLIN1167', u'09BERLIN1', u'09BERLIN1234567', u'09BERLIN12345678',
+    u'09berlin1167', u'9BERLIN1167', u'109BERLIN1167', u'09BERLIN', u'BERLIN1167',
+    u'09BERLIN1167\n', u'09BERLIN1167\n\n', u'09BERLIN1167 ', u' 09BERLIN1167',
+    u'09BERLIN\n1167', u'09BER1IN1167', u'09STATE1', u'10USUNNEWYORK123',
+    u'06SECSTATE123', u'08REYKJAVIK195', u'07BERN881', u'09BERLIN١٢',
+    u'٠٩BERLIN1167', u'', u'09', u'0912345', u'09AAAAAAAA12',
+    '09BERLIN1167', '09FOOBAR1',
+)
+
+def _regex_split(reference_id):
+    m = REFERENCE_ID_PATTERN.match(reference_id)
+    return m.groups() if m else None
+
+
+def test_split_reference_id():
+    def check(reference_id):
+        eq_(_regex_split(reference_id), split_reference_id(reference_id))
+    for reference_id in _REFERENCE_IDS:
+        yield check, reference_id
+
+
+def test_split_reference_ids():
+    eq_([_regex_split(reference_id) for reference_id in _REFERENCE_IDS], split_reference_ids(_REFERENCE_IDS))
+    eq_([], split_reference_ids(iter(())))
+
+
+def test_parts():
+    eq_((u'09', u'BERLIN', u'1167'), split_reference_id(u'09BERLIN1167'))
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
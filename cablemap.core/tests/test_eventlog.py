@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the event log, cablemap.core.eventlog.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+import shutil
+import tempfile
+from StringIO import StringIO
+from nose.tools import eq_, ok_, raises
+from cablemap.core.models import Reference, Recipient
+from cablemap.core.handler import handle_source, NoopCableHandler
+from cablemap.core.eventlog import EventLogCableHandler, replay
+from handler_utils import RecordingHandler
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+_TMP_DIR = None
+
+
+def setup():
+    global _TMP_DIR
+    _TMP_DIR = tempfile.mkdtemp()
+
+
+def teardown():
+    shutil.rmtree(_TMP_DIR)
+
+
+class _TagHandler(NoopCableHandler):
+    def __init__(self):
+        self.tags = []
+
+    def handle_tag(self, tag):
+        self.tags.append(tag)
+
+
+def _expected(predicate=None):
+    handler = RecordingHandler()
+    handle_source(_CSV_FILE, handler, predicate)
+    return handler.events
+
+
+def _replayed(log, predicate=None):
+    handler = RecordingHandler()
+    replay(log, handler, predicate)
+    return handler.events
+
+
+def test_replay():
+    def check(filename, compress):
+        path = os.path.join(_TMP_DIR, filename)
+        handle_source(_CSV_FILE, EventLogCableHandler(path, compress))
+        eq_(_expected(), _replayed(path))
+    for filename, compress in (('cables.events', None), ('cables.events.gz', None), ('cables.events', True)):
+        yield check, filename, compress
+
+
+def test_compressed():
+    path1, path2 = os.path.join(_TMP_DIR, 'a.events'), os.path.join(_TMP_DIR, 'b.events.gz')
+    handle_source(_CSV_FILE, EventLogCableHandler(path1))
+    handle_source(_CSV_FILE, EventLogCableHandler(path2))
+    ok_(os.path.getsize(path2) < os.path.getsize(path1))
+
+
+def test_file_object():
+    out = StringIO()
+    handle_source(_CSV_FILE, EventLogCableHandler(out))
+    eq_(_expected(), _replayed(StringIO(out.getvalue())))
+
+
+def test_types():
+    out = StringIO()
+    handle_source(_CSV_FILE, EventLogCableHandler(out))
+    events = _replayed(StringIO(out.getvalue()))
+    refs = [args[0] for name, args in events if name == 'handle_reference']
+    recipients = [args[0] for name, args in events if name == 'handle_recipient']
+    ok_(refs)
+    ok_(recipients)
+    ok_(all(type(ref) is Reference for ref in refs))
+    ok_(all(type(rec) is Recipient for rec in recipients))
+
+
+def test_predicate():
+    pred = lambda r: r.startswith(u'09')
+    out = StringIO()
+    handle_source(_CSV_FILE, EventLogCableHandler(out))
+    eq_(_expected(pred), _replayed(StringIO(out.getvalue()), pred))
+
+
+def test_consumed_events():
+    out = StringIO()
+    handle_source(_CSV_FILE, EventLogCableHandler(out))
+    expected, handler = _TagHandler(), _TagHandler()
+    handle_source(_CSV_FILE, expected)
+    replay(StringIO(out.getvalue()), handler)
+    ok_(expected.tags)
+    eq_(expected.tags, handler.tags)
+
+
+@raises(ValueError)
+def test_illegal_log():
+    replay(StringIO('cablemap-store-1\n'), NoopCableHandler())
+
+
+def test_unknown_attribute():
+    import copy
+    log = EventLogCableHandler(StringIO())
+    eq_(None, getattr(log, 'no_event', None))
+    ok_(not hasattr(log, '__getstate__'))
+    ok_(callable(log.handle_subject))
+    copy.copy(log)
+
+
+@raises(AttributeError)
+def test_unknown_event():
+    EventLogCableHandler(StringIO()).resolve_event('handle_unknown')
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the delivery of cable batches to handlers.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+import shutil
+import tempfile
+from nose.tools import eq_, ok_
+from cablemap.core.utils import cables_from_csv
+from cablemap.core.store import write_store
+from cablemap.core.handler import handle_source, handle_cables_batch, supports_batches, \
+        consumed_attributes, NoopCableHandler
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+
+class _BatchHandler(object):
+    def __init__(self):
+        self.batches = []
+        self.started = self.ended = 0
+
+    def start(self):
+        self.started += 1
+
+    def end(self):
+        self.ended += 1
+
+    def handle_cable_batch(self, cables):
+        self.batches.append([(cable.reference_id, cable.tags) for cable in cables])
+
+
+class _TagBatchHandler(_BatchHandler):
+    consumed_attributes = ('tags',)
+
+
+class _ContentBatchHandler(_BatchHandler):
+    consumed_attributes = ('created', 'header', 'content')
+
+    def handle_cable_batch(self, cables):
+        self.batches.append([(cable.reference_id, cable.subject, cable.references, cable.recipients)
+                             for cable in cables])
+
+
+class _SubjectHandler(NoopCableHandler):
+    def __init__(self):
+        self.subjects = []
+
+    def handle_subject(self, subject):
+        self.subjects.append(subject)
+
+
+def _expected():
+    return [(cable.reference_id, cable.tags) for cable in cables_from_csv(_CSV_FILE)]
+
+
+def test_supports_batches():
+    ok_(supports_batches(_BatchHandler()))
+    ok_(not supports_batches(NoopCableHandler()))
+
+
+def test_consumed_attributes():
+    eq_(frozenset(['reference_id', 'tags']), consumed_attributes(_TagBatchHandler()))
+    ok_('content' in consumed_attributes(_BatchHandler()))
+
+
+def test_handle_cables_batch():
+    handler = _BatchHandler()
+    handle_cables_batch(cables_from_csv(_CSV_FILE), handler, 3)
+    eq_([3, 3, 1], [len(batch) for batch in handler.batches])
+    eq_(_expected(), sum(handler.batches, []))
+    eq_((1, 1), (handler.started, handler.ended))
+
+
+def test_handle_source():
+    def check(handler, workers):
+        handle_source(_CSV_FILE, handler, workers=workers, batch_size=2)
+        eq_(4, len(handler.batches))
+        eq_(_expected(), sum(handler.batches, []))
+    for cls in (_BatchHandler, _TagBatchHandler):
+        yield check, cls(), None
+        yield check, cls(), 2
+
+
+def test_handle_source_parsed():
+    expected = _ContentBatchHandler()
+    handle_source(_CSV_FILE, expected, batch_size=2)
+    ok_(expected.batches)
+    handler = _ContentBatchHandler()
+    handle_source(_CSV_FILE, handler, workers=2, batch_size=2)
+    eq_(expected.batches, handler.batches)
+
+
+def test_handle_source_unconsumed():
+    class Handler(_TagBatchHandler):
+        def handle_cable_batch(self, cables):
+            for cable in cables:
+                try:
+                    cable.subject
+                except AttributeError, ex:
+                    ok_('"content"' in str(ex))
+                else:
+                    raise AssertionError('Expected an AttributeError')
+                self.batches.append(cable.tags)
+    handler = Handler()
+    handle_source(_CSV_FILE, handler, workers=2, batch_size=2)
+    eq_([tags for _, tags in _expected()], handler.batches)
+
+
+def test_handle_store():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp_dir, 'cables.store')
+        write_store(path, cables_from_csv(_CSV_FILE))
+        handler = _TagBatchHandler()
+        handle_source(path, handler, batch_size=5)
+        eq_(_expected(), sum(handler.batches, []))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_fallback():
+    expected = _SubjectHandler()
+    handle_source(_CSV_FILE, expected)
+    ok_(expected.subjects)
+    handler = _SubjectHandler()
+    handle_source(_CSV_FILE, handler, batch_size=2)
+    eq_(expected.subjects, handler.subjects)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the DebitlyFilter against a local HTTP server.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+import time
+import shutil
+import tempfile
+import threading
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from SocketServer import ThreadingMixIn
+from nose.tools import eq_, ok_
+from cablemap.core.handler import DebitlyFilter, NoopCableHandler, handle_source
+from handler_utils import RecordingHandler
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+_SERVER = None
+_BASE = None
+_TMP_DIR = None
+_REQUESTS = []
+
+
+class _ShortenerRequestHandler(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        _REQUESTS.append(self.path)
+        if self.path.startswith('/slow'):
+            time.sleep(0.5)
+        if self.path.startswith('/target') or self.path == '/missing':
+            self.send_response(200 if self.path != '/missing' else 404)
+        else:
+            self.send_response(301)
+            self.send_header('Location', '%s/target%s' % (_BASE, self.path))
+        self.end_headers()
+
+    do_GET = do_HEAD
+
+    def log_message(self, *args):
+        pass
+
+
+class _ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _MediaHandler(NoopCableHandler):
+    def __init__(self):
+        self.iris = []
+
+    def handle_media_iri(self, iri):
+        self.iris.append(iri)
+
+
+def setup():
+    global _SERVER, _BASE, _TMP_DIR
+    _SERVER = _ThreadingServer(('127.0.0.1', 0), _ShortenerRequestHandler)
+    _BASE = u'http://127.0.0.1:%d' % _SERVER.server_port
+    thread = threading.Thread(target=_SERVER.serve_forever)
+    thread.daemon = True
+    thread.start()
+    _TMP_DIR = tempfile.mkdtemp()
+
+
+def teardown():
+    _SERVER.shutdown()
+    shutil.rmtree(_TMP_DIR)
+
+
+def _filter(handler, **kw):
+    return DebitlyFilter(handler, shorteners=(_BASE + u'/s',), **kw)
+
+
+def _issue(debitly, iris):
+    debitly.start()
+    debitly.start_cable(u'09BERLIN1', u'09BERLIN1')
+    for iri in iris:
+        debitly.handle_media_iri(iri)
+    debitly.end_cable()
+    debitly.end()
+
+
+def test_expand():
+    handler = _MediaHandler()
+    _issue(_filter(handler), [_BASE + u'/s1', u'http://www.example.org/', _BASE + u'/s1'])
+    eq_([_BASE + u'/target/s1', u'http://www.example.org/', _BASE + u'/target/s1'], handler.iris)
+
+
+def test_not_found():
+    handler = _MediaHandler()
+    debitly = DebitlyFilter(handler, shorteners=(_BASE + u'/missing',))
+    _issue(debitly, [_BASE + u'/missing'])
+    eq_([_BASE + u'/missing'], handler.iris)
+
+
+def test_cache():
+    cache = os.path.join(_TMP_DIR, 'bitly.txt')
+    handler = _MediaHandler()
+    _issue(_filter(handler, cache=cache), [_BASE + u'/s2', _BASE + u'/s3'])
+    ok_(os.path.isfile(cache))
+    del _REQUESTS[:]
+    handler = _MediaHandler()
+    _issue(_filter(handler, cache=cache), [_BASE + u'/s3', _BASE + u'/s2'])
+    eq_([_BASE + u'/target/s3', _BASE + u'/target/s2'], handler.iris)
+    eq_([], _REQUESTS)
+
+
+def test_budget():
+    cache = os.path.join(_TMP_DIR, 'budget.txt')
+    handler = _MediaHandler()
+    debitly = _filter(handler, cache=cache, budget=0.05)
+    debitly.start()
+    debitly.start_cable(u'09BERLIN1', u'09BERLIN1')
+    debitly.handle_media_iri(_BASE + u'/slow1')
+    debitly.end_cable()
+    eq_([_BASE + u'/slow1'], handler.iris)
+    # end waits for the pending expansion and writes it into the cache
+    debitly.end()
+    handler = _MediaHandler()
+    _issue(_filter(handler, cache=cache, budget=0.05), [_BASE + u'/slow1'])
+    eq_([_BASE + u'/target/slow1'], handler.iris)
+
+
+def test_cable_iris_concurrent():
+    handler = _MediaHandler()
+    iris = [_BASE + u'/slow%d' % i for i in range(2, 6)]
+    start = time.time()
+    _issue(_filter(handler, budget=5), iris)
+    ok_(time.time() - start < 1.5)
+    eq_([_BASE + u'/target/slow%d' % i for i in range(2, 6)], handler.iris)
+
+
+def test_issued_before_next_event():
+    handler = RecordingHandler()
+    debitly = _filter(handler)
+    debitly.start()
+    debitly.start_cable(u'09BERLIN1', u'09BERLIN1')
+    debitly.handle_media_iri(_BASE + u'/s6')
+    debitly.handle_media_iri(u'http://www.example.org/')
+    eq_(2, len(handler.events))
+    debitly.handle_tag(u'PREL')
+    eq_([('handle_media_iri', (_BASE + u'/target/s6',)),
+         ('handle_media_iri', (u'http://www.example.org/',)),
+         ('handle_tag', (u'PREL',))], handler.events[2:])
+    debitly.end_cable()
+    debitly.end()
+
+
+def test_event_order():
+    def issue(handler, iris):
+        handler.start()
+        handler.start_cable(u'09BERLIN1', u'09BERLIN1')
+        handler.handle_subject(u'Subject')
+        for iri in iris:
+            handler.handle_media_iri(iri)
+        handler.handle_recipient(None)
+        handler.handle_reference(None)
+        handler.handle_media_iri(iris[0])
+        handler.end_cable()
+        handler.end()
+    expected = RecordingHandler()
+    issue(expected, [_BASE + u'/target/s7', u'http://www.example.org/'])
+    handler = RecordingHandler()
+    issue(_filter(handler), [_BASE + u'/s7', u'http://www.example.org/'])
+    eq_(expected.events, handler.events)
+
+
+def test_handle_source():
+    expected = RecordingHandler()
+    handle_source(_CSV_FILE, expected)
+    handler = RecordingHandler()
+    handle_source(_CSV_FILE, _filter(handler))
+    eq_(expected.events, handler.events)
+
+
+def test_prefetch():
+    handler = _MediaHandler()
+    debitly = _filter(handler)
+    debitly.start()
+    debitly.prefetch([_BASE + u'/s4', _BASE + u'/s5', u'http://www.example.org/'])
+    debitly.start_cable(u'09BERLIN1', u'09BERLIN1')
+    debitly.handle_media_iri(_BASE + u'/s5')
+    debitly.handle_media_iri(_BASE + u'/s4')
+    debitly.end_cable()
+    debitly.end()
+    eq_([_BASE + u'/target/s5', _BASE + u'/target/s4'], handler.iris)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the resolution of the event functions of handlers.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+from nose.tools import eq_, ok_
+from cablemap.core.utils import cables_from_csv
+from cablemap.core.handler import resolve_event, handle_cables, handle_events, \
+        events_from_cable, NoopCableHandler, DelegatingCableHandler, TeeCableHandler, \
+        MultipleCableHandler, LoggingCableHandler, CableIdFilter, DefaultMetadataOnlyFilter
+from handler_utils import RecordingHandler
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+
+class _TagHandler(NoopCableHandler):
+    def __init__(self):
+        self.tags = []
+
+    def handle_tag(self, tag):
+        self.tags.append(tag)
+
+
+def test_resolve_method():
+    handler = _TagHandler()
+    eq_(handler.handle_tag, resolve_event(DelegatingCableHandler(handler), 'handle_tag'))
+    eq_(handler.handle_tag, resolve_event(TeeCableHandler(NoopCableHandler(), handler), 'handle_tag'))
+    eq_(handler.handle_tag, resolve_event(MultipleCableHandler([NoopCableHandler(), handler]), 'handle_tag'))
+
+
+def test_resolve_noop():
+    tee = TeeCableHandler(_TagHandler(), NoopCableHandler())
+    eq_(resolve_event(NoopCableHandler(), 'handle_subject'), resolve_event(tee, 'handle_subject'))
+
+
+def test_late_bound():
+    handler = RecordingHandler()
+    resolve_event(TeeCableHandler(handler, _TagHandler()), 'handle_origin')(u'Embassy Berlin')
+    eq_([('handle_origin', (u'Embassy Berlin',))], handler.events)
+
+
+def test_same_events():
+    def check(create):
+        cables = list(cables_from_csv(_CSV_FILE))
+        expected = RecordingHandler()
+        expected.start()
+        for cable in cables:
+            handle_events(events_from_cable(cable), create(expected))
+        expected.end()
+        handler = RecordingHandler()
+        handle_cables(cables, create(handler))
+        eq_(expected.events, handler.events)
+    for create in (DelegatingCableHandler,
+                   LoggingCableHandler,
+                   lambda h: TeeCableHandler(NoopCableHandler(), h),
+                   lambda h: MultipleCableHandler([h, _TagHandler()]),
+                   lambda h: DefaultMetadataOnlyFilter(DelegatingCableHandler(h))):
+        yield check, create
+
+
+def test_cable_id_filter():
+    handler = RecordingHandler()
+    handle_cables(cables_from_csv(_CSV_FILE), CableIdFilter(handler, lambda c: c.startswith(u'09')))
+    ok_(handler.events)
+    cable_ids = [args[1] for name, args in handler.events if name == 'start_cable']
+    ok_(cable_ids)
+    ok_(all(cable_id.startswith(u'09') for cable_id in cable_ids))
+    eq_(len(cable_ids), len([name for name, _ in handler.events if name == 'end_cable']))
+
+
+def test_direct_calls():
+    handler = _TagHandler()
+    tee = TeeCableHandler(handler, NoopCableHandler())
+    tee.handle_tag(u'PREL')
+    tee.handle_tag(u'PGOV')
+    tee.handle_subject(u'Subject')
+    eq_([u'PREL', u'PGOV'], handler.tags)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
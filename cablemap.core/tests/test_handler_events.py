@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the events which are consumed by handlers.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+from nose.tools import eq_, ok_
+from cablemap.core import reader
+from cablemap.core.utils import cables_from_csv
+from cablemap.core.handler import CABLE_EVENTS, consumed_events, handle_cable, \
+        handle_source, NoopCableHandler, DelegatingCableHandler, TeeCableHandler, \
+        MultipleCableHandler, DefaultMetadataOnlyFilter, CableIdFilter
+from handler_utils import RecordingHandler
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+
+class _ContentHandler(NoopCableHandler):
+    def __init__(self):
+        self.contents = []
+
+    def handle_content(self, content):
+        self.contents.append(content)
+
+
+class _TagHandler(NoopCableHandler):
+    def handle_tag(self, tag):
+        pass
+
+
+def test_undeclared():
+    eq_(CABLE_EVENTS, consumed_events(RecordingHandler()))
+    eq_(CABLE_EVENTS, consumed_events(DelegatingCableHandler(RecordingHandler())))
+
+
+def test_noop():
+    eq_(frozenset(), consumed_events(NoopCableHandler()))
+    eq_(frozenset(['handle_content']), consumed_events(_ContentHandler()))
+
+
+def test_instance_events():
+    subjects = []
+    handler = NoopCableHandler()
+    handler.handle_subject = subjects.append
+    eq_(frozenset(['handle_subject']), consumed_events(handler))
+    # Events answered by __getattr__ are not consumed
+    handler.handle_tag(u'PREL')
+    eq_(frozenset(['handle_subject']), consumed_events(handler))
+    handle_source(_CSV_FILE, handler)
+    eq_([cable.subject for cable in cables_from_csv(_CSV_FILE)], subjects)
+
+
+def test_combined():
+    eq_(frozenset(['handle_content', 'handle_tag']),
+        consumed_events(TeeCableHandler(_ContentHandler(), _TagHandler())))
+    eq_(frozenset(['handle_content', 'handle_tag']),
+        consumed_events(MultipleCableHandler([_ContentHandler(), _TagHandler(), NoopCableHandler()])))
+    eq_(frozenset(['handle_tag']), consumed_events(CableIdFilter(_TagHandler(), bool)))
+
+
+def test_metadata_only():
+    events = consumed_events(DefaultMetadataOnlyFilter(RecordingHandler()))
+    ok_('handle_content' not in events)
+    ok_('handle_header' not in events)
+    ok_('handle_tag' in events)
+    eq_(frozenset(), consumed_events(DefaultMetadataOnlyFilter(_ContentHandler())))
+
+
+def test_content_only():
+    calls = []
+    def counting(func):
+        def count(*args, **kw):
+            calls.append(func.__name__)
+            return func(*args, **kw)
+        return count
+    names = ('parse_subject', 'parse_tags', 'parse_references', 'parse_summary',
+             'parse_recipients', 'parse_signed_by', 'parse_classified_by')
+    originals = [getattr(reader, name) for name in names]
+    for name, func in zip(names, originals):
+        setattr(reader, name, counting(func))
+    try:
+        handler = _ContentHandler()
+        cables = list(cables_from_csv(_CSV_FILE))
+        for cable in cables:
+            handle_cable(cable, handler)
+    finally:
+        for name, func in zip(names, originals):
+            setattr(reader, name, func)
+    eq_([], calls)
+    eq_([cable.content for cable in cables], handler.contents)
+
+
+def test_filtered_events():
+    expected = RecordingHandler()
+    handle_source(_CSV_FILE, expected)
+    handler = RecordingHandler()
+    handle_source(_CSV_FILE, TeeCableHandler(handler, _TagHandler()))
+    eq_(expected.events, handler.events)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
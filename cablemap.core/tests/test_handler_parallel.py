@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the ParallelMultipleCableHandler.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+from nose.tools import eq_, ok_, raises
+from cablemap.core.utils import cables_from_csv
+from cablemap.core.handler import handle_source, handle_cables, MultipleCableHandler, \
+        ParallelMultipleCableHandler, CableIdFilter, NoopCableHandler
+from handler_utils import RecordingHandler
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+
+class _FailingHandler(NoopCableHandler):
+    def __init__(self):
+        self.cables = 0
+
+    def start_cable(self, reference_id, canonical_id):
+        self.cables += 1
+        if self.cables == 2:
+            raise ValueError(reference_id)
+
+
+def _expected():
+    handler = RecordingHandler()
+    handle_source(_CSV_FILE, handler)
+    return handler.events
+
+
+def test_events():
+    expected = _expected()
+    ok_(expected)
+    handlers = [RecordingHandler(), RecordingHandler()]
+    handle_source(_CSV_FILE, ParallelMultipleCableHandler(handlers))
+    for handler in handlers:
+        eq_(expected, handler.events)
+
+
+def test_small_queue():
+    handlers = [RecordingHandler(0.001), RecordingHandler()]
+    handle_source(_CSV_FILE, ParallelMultipleCableHandler(handlers, queue_size=1))
+    expected = _expected()
+    for handler in handlers:
+        eq_(expected, handler.events)
+
+
+def test_cable_id_filter():
+    pred = lambda c: c.startswith(u'09')
+    expected = RecordingHandler()
+    handle_cables(cables_from_csv(_CSV_FILE), MultipleCableHandler([CableIdFilter(expected, pred)]))
+    handler = RecordingHandler()
+    handle_cables(cables_from_csv(_CSV_FILE), ParallelMultipleCableHandler([CableIdFilter(handler, pred)]))
+    eq_(expected.events, handler.events)
+
+
+def test_reuse():
+    handler = RecordingHandler()
+    parallel = ParallelMultipleCableHandler([handler])
+    handle_source(_CSV_FILE, parallel)
+    handle_source(_CSV_FILE, parallel)
+    eq_(_expected() * 2, handler.events)
+
+
+@raises(ValueError)
+def test_error():
+    handler = RecordingHandler()
+    try:
+        handle_source(_CSV_FILE, ParallelMultipleCableHandler([_FailingHandler(), handler]))
+    finally:
+        eq_(_expected(), handler.events)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests cablemap.core.handler.handle_source with worker processes.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+from nose.tools import eq_, ok_
+from cablemap.core import handler as handler_module
+from cablemap.core.handler import handle_source
+from handler_utils import RecordingHandler
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+
+def _events(**kw):
+    handler = RecordingHandler()
+    handle_source(_CSV_FILE, handler, **kw)
+    return handler.events
+
+
+def test_workers():
+    expected = _events()
+    ok_(expected)
+    eq_(expected, _events(workers=2))
+
+
+def test_workers_small_window():
+    eq_(_events(), _events(workers=3, window=1))
+
+
+class _InFlightPool(object):
+    """\
+    Synchronous pool which records the max. number of in-flight items.
+    """
+    in_flight = 0
+    max_in_flight = 0
+
+    def __init__(self, workers):
+        pass
+
+    def apply_async(self, func, args):
+        cls = _InFlightPool
+        size = len(args[0])
+        cls.in_flight += size
+        cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        class Result(object):
+            def get(self):
+                cls.in_flight -= size
+                return func(*args)
+        return Result()
+
+    def close(self):
+        pass
+
+    terminate = join = close
+
+
+def test_workers_window():
+    def check(window):
+        _InFlightPool.in_flight = _InFlightPool.max_in_flight = 0
+        handler_module.Pool = _InFlightPool
+        try:
+            eq_(expected, _events(workers=2, window=window))
+        finally:
+            handler_module.Pool = pool
+        ok_(_InFlightPool.max_in_flight <= window)
+    pool = handler_module.Pool
+    expected = _events()
+    for window in (1, 2, 3, 5):
+        yield check, window
+
+
+def test_workers_predicate():
+    pred = lambda r: r.startswith(u'09')
+    expected = _events(predicate=pred)
+    eq_(2, len([e for e in expected if e[0] == 'start_cable']))
+    eq_(expected, _events(predicate=pred, workers=2))
+
+
+def test_workers_start_end():
+    events = _events(workers=2)
+    eq_('start', events[0][0])
+    eq_('end', events[-1][0])
+    eq_(1, len([e for e in events if e[0] == 'start']))
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the cached properties of cablemap.core.models.Cable.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+import pickle
+from nose.tools import eq_, ok_
+from cablemap.core.utils import cables_from_csv
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+
+def _cable(reference_id=u'09BERLIN1167'):
+    for cable in cables_from_csv(_CSV_FILE):
+        if cable.reference_id == reference_id:
+            return cable
+    raise ValueError('Cable %s not found' % reference_id)
+
+
+def test_no_dict():
+    ok_(not hasattr(_cable(), '__dict__'))
+
+
+def test_cached():
+    cable = _cable()
+    subject = cable.subject
+    ok_(subject)
+    ok_(subject is cable.subject)
+    ok_(cable.references is cable.references)
+    ok_(cable.tags is cable.tags)
+
+
+def test_invalidate_content():
+    cable = _cable()
+    eq_(u'09BERLIN1167', cable.reference_id)
+    ok_(cable.subject)
+    cable.content = _cable(u'08MADRID308').content
+    eq_(_cable(u'08MADRID308').subject, cable.subject)
+
+
+def test_invalidate_reference_id():
+    cable = _cable()
+    eq_(u'09BERLIN1167', cable.canonical_id)
+    cable.reference_id = u'08MADRID308'
+    eq_(u'08MADRID308', cable.canonical_id)
+
+
+def test_no_invalidation():
+    cable = _cable()
+    subject = cable.subject
+    cable.classification = u'SECRET'
+    ok_(subject is cable.subject)
+
+
+def test_pickle():
+    cable = _cable()
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        c = pickle.loads(pickle.dumps(cable, protocol))
+        eq_(cable.reference_id, c.reference_id)
+        eq_(cable.content, c.content)
+        eq_(cable.subject, c.subject)
+        eq_(cable.references, c.references)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
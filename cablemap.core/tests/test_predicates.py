@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the origin predicates and the origin lookups.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+from nose.tools import eq_, ok_, raises
+from cablemap.core import predicates as pred
+
+
+def test_origin_predicates():
+    def check(predicate, origin, expected):
+        eq_(expected, predicate(origin))
+    for predicate, origin, expected in ((pred.origin_germany, u'BERLIN', True),
+                                        (pred.origin_germany, u'PARIS', False),
+                                        (pred.origin_austria, u'UNVIEVIENNA', True),
+                                        (pred.origin_belgium, u'USEUBRUSSELS', True),
+                                        (pred.origin_australia, u'SYDNEY', True),
+                                        (pred.origin_australia, u'BERLIN', False),
+                                        (pred.origin_barbados, u'BRIDGETOWN', True),
+                                        (pred.origin_barbados, u'BERLIN', False),
+                                        (pred.origin_europe, u'REYKJAVIK', True),
+                                        (pred.origin_europe, u'TOKYO', False),
+                                        (pred.origin_east_asia, u'AITTAIPEI', True),
+                                        (pred.origin_west_asia, u'ANKARA', True),
+                                        (pred.origin_north_africa, u'TRIPOLI', True)):
+        yield check, predicate, origin, expected
+
+
+def test_origins_for_country():
+    eq_(frozenset([u'CAIRO', u'ALEXANDRIA']), pred.origins_for_country(u'egypt'))
+
+
+def test_origins_for_region():
+    origins = pred.origins_for_region(u'north_africa')
+    ok_(u'CAIRO' in origins)
+    ok_(u'TRIPOLI' in origins)
+    ok_(u'BERLIN' not in origins)
+
+
+@raises(ValueError)
+def test_unknown_country():
+    pred.origins_for_country(u'atlantis')
+
+
+@raises(ValueError)
+def test_unknown_region():
+    pred.origins_for_region(u'atlantis')
+
+
+def test_countries_for_origin():
+    eq_(frozenset([u'barbados', u'grenada']), pred.countries_for_origin(u'BRIDGETOWN'))
+    eq_(frozenset(), pred.countries_for_origin(u'ATLANTIS'))
+
+
+def test_origin_filter():
+    accept = pred.origin_filter(pred.origin_europe)
+    ok_(accept(u'09BERLIN1167'))
+    ok_(accept(u'09BERLIN1167'))
+    ok_(not accept(u'09TOKYO1167'))
+
+
+def test_year_origin_filter():
+    accept = pred.year_origin_filter(lambda y: y == u'09', pred.origin_germany)
+    ok_(accept(u'09BERLIN1167'))
+    ok_(not accept(u'08BERLIN1167'))
+    ok_(not accept(u'09PARIS1167'))
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
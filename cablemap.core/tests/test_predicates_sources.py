@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the composable predicates against the cable sources.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+import shutil
+import tempfile
+from nose.tools import eq_, ok_
+from cablemap.core import predicates as pred
+from cablemap.core.utils import cables_from_csv, build_csv_index
+from cablemap.core.store import write_store, cables_from_store
+from cablemap.core.handler import handle_source, NoopCableHandler
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+_PREDICATES = (pred.year_in(u'09'),
+               pred.year_in(2009, u'2010'),
+               pred.origin_in(u'BERLIN', u'ROME'),
+               pred.region(u'europe'),
+               pred.year_in(u'09') & pred.region(u'europe'),
+               ~pred.year_in(u'09'),
+               pred.tag_in(u'PREL'),
+               pred.classification_in(u'CONFIDENTIAL'),
+               pred.year_in(u'09') | pred.tag_in(u'KDEM'),
+               ~pred.tag_in(u'PREL') & pred.region(u'europe'),
+               pred.year_in(u'09') & (lambda reference_id: u'BERLIN' in reference_id))
+
+
+def _expected(predicate):
+    return [cable.reference_id for cable in cables_from_csv(_CSV_FILE) if predicate.accepts(cable)]
+
+
+class _IdHandler(NoopCableHandler):
+    def __init__(self):
+        self.ids = []
+
+    def start_cable(self, reference_id, canonical_id):
+        self.ids.append(reference_id)
+
+
+def test_combine():
+    predicate = pred.year_in(u'09') & pred.origin_in(u'BERLIN')
+    ok_(predicate(u'09BERLIN1167'))
+    ok_(not predicate(u'08BERLIN1167'))
+    ok_(not (~predicate)(u'09BERLIN1167'))
+    ok_((predicate | pred.year_in(u'08'))(u'08PARIS12'))
+    eq_(frozenset([u'09BERLIN']), predicate.id_prefixes())
+    eq_(None, (~predicate).id_prefixes())
+    eq_(frozenset(), predicate.attributes)
+    eq_(frozenset([u'tags']), (predicate | pred.tag_in(u'PREL')).attributes)
+
+
+def test_undecided():
+    # Predicates which depend on other attributes accept all identifiers
+    ok_(pred.tag_in(u'PREL')(u'09BERLIN1167'))
+    ok_((~pred.tag_in(u'PREL'))(u'09BERLIN1167'))
+    ok_(not (pred.tag_in(u'PREL') & pred.year_in(u'08'))(u'09BERLIN1167'))
+
+
+def test_plain_predicates():
+    eq_(None, pred.id_prefixes(lambda reference_id: True))
+    eq_(None, pred.cable_filter(lambda reference_id: True))
+    eq_(None, pred.cable_filter(pred.year_in(u'09')))
+
+
+def test_csv():
+    def check(predicate):
+        eq_(_expected(predicate), [cable.reference_id for cable in cables_from_csv(_CSV_FILE, predicate)])
+    for predicate in _PREDICATES:
+        yield check, predicate
+
+
+def test_csv_index():
+    def check(filename, predicate):
+        eq_(_expected(predicate), [cable.reference_id for cable in cables_from_csv(filename, predicate)])
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, 'cables.csv')
+        shutil.copy(_CSV_FILE, filename)
+        build_csv_index(filename)
+        for predicate in _PREDICATES:
+            check(filename, predicate)
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_store():
+    def check(path, predicate):
+        eq_(_expected(predicate), [cable.reference_id for cable in cables_from_store(path, predicate, [u'subject'])])
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'cables.store')
+        write_store(path, cables_from_csv(_CSV_FILE))
+        for predicate in _PREDICATES:
+            check(path, predicate)
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_handle_source_workers():
+    predicate = pred.tag_in(u'PREL') & ~pred.year_in(u'09')
+    handler = _IdHandler()
+    handle_source(_CSV_FILE, handler, predicate, workers=2)
+    eq_(_expected(predicate), handler.ids)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
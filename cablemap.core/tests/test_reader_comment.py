@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests comment and classification category parsing.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+from nose.tools import eq_
+from cablemap.core.reader import parse_comment, parse_classification_categories
+
+_COMMENT_TEST_DATA = (
+    (u'1. (C) Summary: Bla. End Summary.\n\n2. (C) Comment: The result is\na surprise. End Comment.\n', u'The result is a surprise.'),
+    (u'COMMENT: Nothing to add.\n\n3. Text', u'Nothing to add.'),
+    (u'1. No comment here.', None),
+)
+
+_CATEGORIES_TEST_DATA = (
+    (u'Classified By: AMBASSADOR PHILIP D. MURPHY FOR REASONS 1.4 (B) and (D)\n', [u'B', u'D']),
+    (u'CLASSIFIED BY: Gene A. Cretz, Ambassador. REASON: 1.4 (b), (d), (b)', [u'B', u'D']),
+    (u'Classified By: Poloff John Doe, reason 1.5 d.', [u'D']),
+    (u'1.4 (b) and (d)', ()),
+)
+
+
+def test_comment():
+    def check(content, expected):
+        eq_(expected, parse_comment(content))
+    for content, expected in _COMMENT_TEST_DATA:
+        yield check, content, expected
+
+
+def test_classification_categories():
+    def check(content, expected):
+        eq_(expected, parse_classification_categories(content))
+    for content, expected in _CATEGORIES_TEST_DATA:
+        yield check, content, expected
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
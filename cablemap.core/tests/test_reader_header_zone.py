@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests if the subject, TAGS, REF and summary parsers share the header zone
+of a cable without mixing up different cables.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+from nose.tools import eq_, ok_
+from cablemap.core.models import Cable
+from cablemap.core.reader import parse_subject, parse_tags, parse_references, parse_summary, HeaderZone
+
+_CONTENT_1 = u'''
+E.O. 12958: DECL: 01/01/2019
+TAGS: PREL, PGOV, GM
+SUBJECT: FIRST SUBJECT
+
+REF: A. BERLIN 1000 B. BERLIN 1001
+
+Classified By: Ambassador Philip D. Murphy for reasons 1.4 (b) and (d)
+
+1. (C) Summary: The first summary. End Summary.
+'''
+
+_CONTENT_2 = u'''
+TAGS: ECON, FR
+SUBJECT: SECOND SUBJECT
+
+REF: 08 PARIS 2000
+
+1. (U) Summary: The second summary.
+
+2. (U) Text.
+'''
+
+_EXPECTED = (
+    (_CONTENT_1, u'FIRST SUBJECT', [u'PREL', u'PGOV', u'GM'], [u'09BERLIN1000', u'09BERLIN1001'], u'The first summary.'),
+    (_CONTENT_2, u'SECOND SUBJECT', [u'ECON', u'FR'], [u'08PARIS2000'], u'The second summary.'),
+)
+
+
+def _parse(content, zone=None):
+    return (parse_subject(content, zone=zone), parse_tags(content, zone=zone),
+            [ref.value for ref in parse_references(content, 2009, zone=zone)],
+            parse_summary(content, zone=zone))
+
+
+def test_alternating_contents():
+    def check(content, subject, tags, refs, summary):
+        eq_((subject, tags, refs, summary), _parse(content))
+    for i in range(2):
+        for expected in _EXPECTED:
+            yield check, expected[0], expected[1], expected[2], expected[3], expected[4]
+
+
+def test_interleaved_parsers():
+    eq_(u'FIRST SUBJECT', parse_subject(_CONTENT_1))
+    eq_([u'ECON', u'FR'], parse_tags(_CONTENT_2))
+    eq_([u'PREL', u'PGOV', u'GM'], parse_tags(_CONTENT_1))
+    eq_(u'The second summary.', parse_summary(_CONTENT_2))
+    eq_(u'SECOND SUBJECT', parse_subject(_CONTENT_2))
+
+
+def test_shared_zone():
+    def check(content, subject, tags, refs, summary):
+        eq_((subject, tags, refs, summary), _parse(content, HeaderZone(content)))
+    for expected in _EXPECTED:
+        yield check, expected[0], expected[1], expected[2], expected[3], expected[4]
+
+
+def test_cable_zone():
+    cable = Cable(u'09BERLIN1')
+    cable.created = u'2009-01-01 10:00'
+    cable.content = _CONTENT_1
+    zone = cable._header_zone
+    eq_(_CONTENT_1, zone.content)
+    eq_(u'FIRST SUBJECT', cable.subject)
+    eq_([u'PREL', u'PGOV', u'GM'], cable.tags)
+    ok_(zone is cable._header_zone)
+    cable.content = _CONTENT_2
+    ok_(zone is not cable._header_zone)
+    eq_(u'SECOND SUBJECT', cable.subject)
+    eq_(u'The second summary.', cable.summary)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the extraction of the metadata, header and content from HTML pages.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+import re
+import codecs
+from nose.tools import eq_, ok_
+from cablemap.core.models import cable_from_file, cable_from_html
+from cablemap.core.reader import _clean_html
+
+_DATA_DIR = os.path.join(os.path.dirname(__file__), 'data-subject', 'in')
+
+_META_TEST_DATA = (
+    (u'07BERN881', u'2007-09-11 09:09', u'2011-03-14 06:06', u'Embassy Bern', u'SECRET', [u'http://www.letemps.ch/swiss_papers']),
+    (u'08BRASILIA93', u'2008-01-15 18:06', u'2011-02-13 00:12', u'Embassy Brasilia', u'CONFIDENTIAL', ()),
+    (u'10STATE284', u'2010-01-04 18:06', u'2011-01-31 21:09', u'Secretary of State', u'CONFIDENTIAL', ()),
+)
+
+_CLEAN_TEST_DATA = (
+    (u"<a id='par1' href='#par1'>¶</a>1. (C) Text&#x000A;", u'1. (C) Text\n'),
+    (u"TAGS: <a href='/tag/PREL_0.html'>PREL</a> <a href='/tag/GM_0.html'>GM</a>", u'TAGS: PREL GM'),
+    (u'a\\ &#x000A;b', u'a\nb'),
+    (u'a\\ <b>&#x000A;b', u'a\nb'),
+    (u'x\\  ', u'x\n'),
+    (u'1 < 2 <b>x</b> <', u'1 < 2 x <'),
+    (u'<a', u'<a'),
+    # The tags are removed after the links
+    (u"<<a href='#x'>b>c", u'c'),
+    (u"</<a>a>x", u'x'),
+    (u"<a href='<x'>text</a>", u'text'),
+    (u"<abbr>UN</abbr>", u'UN'),
+    (u'<a\nhref="#x">y</a>', u'y'),
+)
+
+# The former extraction of the <code><pre> sections and the former cleaner
+_CONTENT_PATTERN = re.compile(ur'(?:<code><pre>)(.+?)(?:</pre></code>)', re.DOTALL|re.UNICODE)
+
+def _legacy_clean_html(html):
+    content = html.replace(u'&#x000A;', u'\n').replace(u'¶', '')
+    content = re.sub(ur'<a[^>]*>', u'', content)
+    content = re.sub(r'</?[a-zA-Z]+>', u'', content)
+    return re.sub(r'\\[ ]*\n|\\[ ]*$', u'\n', content)
+
+
+def test_meta():
+    def check(reference_id, created, released, origin, classification, media_uris):
+        cable = cable_from_file(os.path.join(_DATA_DIR, reference_id + '.html'))
+        eq_(reference_id, cable.reference_id)
+        eq_(created, cable.created)
+        eq_(released, cable.released)
+        eq_(origin, cable.origin)
+        eq_(classification, cable.classification)
+        eq_(media_uris, cable.media_uris)
+    for reference_id, created, released, origin, classification, media_uris in _META_TEST_DATA:
+        yield check, reference_id, created, released, origin, classification, media_uris
+
+
+def test_unicode_and_bytes():
+    def check(filename):
+        html = codecs.open(filename, 'rb', 'utf-8').read()
+        cable1 = cable_from_html(html)
+        cable2 = cable_from_file(filename)
+        ok_(cable1.content)
+        eq_(cable1.header, cable2.header)
+        eq_(cable1.content, cable2.content)
+        eq_(cable1.created, cable2.created)
+        eq_(cable1.origin, cable2.origin)
+    for name in os.listdir(_DATA_DIR):
+        yield check, os.path.join(_DATA_DIR, name)
+
+
+def test_legacy_extraction():
+    def check(filename):
+        html = codecs.open(filename, 'rb', 'utf-8').read()
+        cable = cable_from_html(html)
+        blocks = _CONTENT_PATTERN.findall(html)
+        eq_(_legacy_clean_html(blocks[-1]), cable.content)
+        eq_(_legacy_clean_html(blocks[0]) if len(blocks) == 2 else u'', cable.header)
+    for name in os.listdir(_DATA_DIR):
+        yield check, os.path.join(_DATA_DIR, name)
+
+
+def test_several_tables():
+    def check(filename):
+        html = codecs.open(filename, 'rb', 'utf-8').read()
+        expected = cable_from_html(html)
+        html = html.replace(u"<table class='cable'>", u"<table><tr><td><a href='#'>x</a></td></tr></table><table class='cable'>", 1)
+        idx = html.rindex(u'</table>') + len(u'</table>')
+        html = html[:idx] + u"<table><tr><td><a href='#'>y</a></td></tr></table>" + html[idx:]
+        cable = cable_from_html(html)
+        eq_(expected.reference_id, cable.reference_id)
+        eq_(expected.created, cable.created)
+        eq_(expected.origin, cable.origin)
+        eq_(expected.classification, cable.classification)
+        eq_(expected.header, cable.header)
+        eq_(expected.content, cable.content)
+    for name in os.listdir(_DATA_DIR):
+        yield check, os.path.join(_DATA_DIR, name)
+
+
+def test_clean_html():
+    def check(html, expected):
+        eq_(expected, _clean_html(html))
+    for html, expected in _CLEAN_TEST_DATA:
+        yield check, html, expected
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
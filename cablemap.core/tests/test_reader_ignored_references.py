@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the detection of invalid references which are not logged.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+from nose.tools import ok_
+from cablemap.core.reader import _IGNORED_REFERENCE_PATTERN
+
+
+def test_ignored():
+    def check(reference):
+        ok_(_IGNORED_REFERENCE_PATTERN.search(reference))
+    for reference in (u'09JANUARY12', u'08SECRET1', u'07CONFIDENTIAL1234', u'10SECTION1',
+                      u'09BERLIN--12', u'09ZFEB1234', u'06ONJUNE12', u'05ANDPREVIOUS4'):
+        yield check, reference
+
+
+def test_not_ignored():
+    def check(reference):
+        ok_(not _IGNORED_REFERENCE_PATTERN.search(reference))
+    for reference in (u'09BERLINX12', u'08FOO1', u'07JAN1234', u'10SECT1', u'09BERLIN-12'):
+        yield check, reference
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the cable store, cablemap.core.store.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+import shutil
+import pickle
+import tempfile
+from nose.tools import eq_, ok_, raises
+from cablemap.core.store import write_store, cables_from_store, is_store
+from cablemap.core.utils import cables_from_csv, cables_from_source
+from cablemap.core.handler import events_from_cable, handle_source
+from handler_utils import RecordingHandler
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+_TMP_DIR = None
+_STORE = None
+
+
+def setup():
+    global _TMP_DIR, _STORE
+    _TMP_DIR = tempfile.mkdtemp()
+    _STORE = os.path.join(_TMP_DIR, 'cables.store')
+    eq_(7, write_store(_STORE, cables_from_csv(_CSV_FILE)))
+
+
+def teardown():
+    shutil.rmtree(_TMP_DIR)
+
+
+def test_is_store():
+    ok_(is_store(_STORE))
+    ok_(not is_store(_TMP_DIR))
+    ok_(not is_store(_CSV_FILE))
+
+
+def test_events():
+    expected = [list(events_from_cable(cable)) for cable in cables_from_csv(_CSV_FILE)]
+    eq_(expected, [list(events_from_cable(cable)) for cable in cables_from_store(_STORE)])
+
+
+def test_types():
+    for cable1, cable2 in zip(cables_from_csv(_CSV_FILE), cables_from_store(_STORE)):
+        eq_([type(r) for r in cable1.references], [type(r) for r in cable2.references])
+        eq_([type(r) for r in cable1.recipients], [type(r) for r in cable2.recipients])
+
+
+def test_predicate():
+    pred = lambda r: r.startswith(u'09')
+    eq_([c.reference_id for c in cables_from_csv(_CSV_FILE, pred)],
+        [c.reference_id for c in cables_from_store(_STORE, pred)])
+
+
+def test_columns():
+    cables = list(cables_from_store(_STORE, columns=('origin', 'tags')))
+    expected = list(cables_from_csv(_CSV_FILE))
+    eq_([c.reference_id for c in expected], [c.reference_id for c in cables])
+    eq_([c.origin for c in expected], [c.origin for c in cables])
+    eq_([c.tags for c in expected], [c.tags for c in cables])
+
+
+def test_unread_columns():
+    def check(cable, name, column):
+        try:
+            getattr(cable, name)
+        except AttributeError, ex:
+            ok_('"%s"' % column in str(ex))
+        else:
+            raise AssertionError('Expected an AttributeError for "%s"' % name)
+    for cable in cables_from_store(_STORE, columns=('origin', 'tags')):
+        for name in ('content', 'header', 'created', 'released', 'classification', 'media_uris'):
+            yield check, cable, name, name
+        yield check, cable, 'subject', 'content'
+        yield check, cable, 'is_partial', 'header'
+        yield check, cable, 'wl_uris', 'created'
+        yield eq_, None, getattr(cable, 'content', None)
+
+
+def test_computed_columns():
+    cables = list(cables_from_store(_STORE, columns=('created', 'header', 'content')))
+    expected = list(cables_from_csv(_CSV_FILE))
+    eq_([c.subject for c in expected], [c.subject for c in cables])
+    eq_([c.references for c in expected], [c.references for c in cables])
+    eq_([c.recipients for c in expected], [c.recipients for c in cables])
+    eq_([c.wl_uris for c in expected], [c.wl_uris for c in cables])
+
+
+def test_pickle_columns():
+    for cable in cables_from_store(_STORE, columns=('origin', 'tags')):
+        cable2 = pickle.loads(pickle.dumps(cable, pickle.HIGHEST_PROTOCOL))
+        eq_(cable.reference_id, cable2.reference_id)
+        eq_(cable.origin, cable2.origin)
+        ok_(not hasattr(cable2, 'content'))
+
+
+@raises(ValueError)
+def test_unknown_column():
+    cables_from_store(_STORE, columns=('origin', 'unknown'))
+
+
+def test_cables_from_source():
+    eq_([c.reference_id for c in cables_from_csv(_CSV_FILE)],
+        [c.reference_id for c in cables_from_source(_STORE)])
+
+
+def test_handle_source():
+    handler1, handler2 = RecordingHandler(), RecordingHandler()
+    handle_source(_CSV_FILE, handler1)
+    handle_source(_STORE, handler2, workers=2)
+    eq_(handler1.events, handler2.events)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
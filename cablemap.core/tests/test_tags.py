@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests cablemap.core.tags and the TagKindFilter.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+from nose.tools import eq_, ok_
+from cablemap.core import consts
+from cablemap.core.tags import tag_kind, tag_kinds, tags_of_kind, canonicalize_tag
+from cablemap.core.handler import NoopCableHandler, TagKindFilter
+
+_TEST_DATA = (
+    (u'KIPR', consts.TAG_KIND_PROGRAM),
+    (u'kwww', consts.TAG_KIND_PROGRAM),
+    (u'KANU', consts.TAG_KIND_PROGRAM),
+    (u'OBAMA, BARACK', consts.TAG_KIND_PERSON),
+    (u'GE', consts.TAG_KIND_GEO),
+    (u'NASA', consts.TAG_KIND_ORG),
+    (u'nasa', consts.TAG_KIND_ORG),
+    (u'PHUM', consts.TAG_KIND_SUBJECT),
+    (u'phum', consts.TAG_KIND_SUBJECT),
+    (u'UNKNOWN', consts.TAG_KIND_UNKNOWN),
+)
+
+def test_tag_kinds():
+    tags = [tag for tag, _ in _TEST_DATA]
+    eq_([kind for _, kind in _TEST_DATA], tag_kinds(tags))
+    eq_([tag_kind(tag) for tag in tags], tag_kinds(tags))
+
+def test_tag_kinds_default():
+    eq_([consts.TAG_KIND_GEO, None], tag_kinds([u'GE', u'UNKNOWN'], None))
+    eq_([], tag_kinds([]))
+
+def test_tags_of_kind():
+    subjects = tags_of_kind(consts.TAG_KIND_SUBJECT)
+    ok_(u'PHUM' in subjects)
+    ok_(u'NASA' not in subjects)
+    ok_(u'NASA' in tags_of_kind(consts.TAG_KIND_ORG))
+    ok_(u'KANU' in tags_of_kind(consts.TAG_KIND_PROGRAM))
+    for kind in (consts.TAG_KIND_SUBJECT, consts.TAG_KIND_ORG, consts.TAG_KIND_PROGRAM):
+        for tag in tags_of_kind(kind):
+            eq_(kind, tag_kind(tag))
+
+def test_canonicalize_tag():
+    def check(tag, expected):
+        eq_(expected, canonicalize_tag(tag))
+    for tag, expected in ((u'PHUM', (u'PHUM',)),
+                          (u'phum', (u'PHUM',)),
+                          (u'POGOV', (u'PGOV',)),
+                          (u'PhumPgov', (u'PHUM', u'PGOV')),
+                          (u'CLINTON HILLARY', (u'CLINTON, HILLARY',)),
+                          (u'SENVEAGREAIDTBIOECONSOCIXR', (u'SENV', u'EAGR', u'EAID', u'TBIO', u'ECON', u'SOCI', u'XR'))):
+        yield check, tag, expected
+
+
+class _TagCollector(NoopCableHandler):
+    def __init__(self):
+        self.tags = []
+    def handle_tag(self, tag):
+        self.tags.append(tag)
+
+def test_tag_kind_filter():
+    collector = _TagCollector()
+    handler = TagKindFilter(collector, (consts.TAG_KIND_PERSON, consts.TAG_KIND_GEO))
+    for tag in (u'PHUM', u'OBAMA, BARACK', u'GE', u'KIPR', u'NASA'):
+        handler.handle_tag(tag)
+    eq_([u'OBAMA, BARACK', u'GE'], collector.tags)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
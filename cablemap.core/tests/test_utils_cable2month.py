@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the cable -> month index.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+import shutil
+import tempfile
+import threading
+from nose.tools import eq_, ok_
+from cablemap.core import utils, consts
+from cablemap.core.utils import _cable_month, _write_cable2month, _build_cable2month
+
+_TEST_DATA = (
+    (u'07BERN881', 9),
+    (u'08BRASILIA93', 1),
+    (u'10MADRID87', 1),
+    (u'66BUENOSAIRES2481', 12),
+    (u'7575LIBREVILLE1895', 11),
+    (u'22BERLIN1167', None),
+    (u'07BERN88', None),
+    (u'07BERN8810', None),
+    (u'', None),
+    (u'ZZZ', None),
+)
+
+
+def test_cable_month():
+    def check(reference_id, month):
+        eq_(month, _cable_month(reference_id))
+    for reference_id, month in _TEST_DATA:
+        yield check, reference_id, month
+
+
+def test_threads():
+    results = []
+    def lookup():
+        results.append([_cable_month(reference_id) for reference_id, _ in _TEST_DATA])
+    utils._CABLE2MONTH = None
+    threads = [threading.Thread(target=lookup) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    eq_([[month for _, month in _TEST_DATA]] * 8, results)
+
+
+def test_write():
+    tmp_dir = tempfile.mkdtemp()
+    filename, index = utils._CABLE2MONTH_FILENAME, utils._CABLE2MONTH
+    try:
+        utils._CABLE2MONTH_FILENAME = os.path.join(tmp_dir, 'cable2month.bin')
+        utils._CABLE2MONTH = None
+        items = [(u'09BERLIN%d' % i, i % 12 + 1) for i in range(1, 100)]
+        _write_cable2month(utils._CABLE2MONTH_FILENAME, items)
+        for reference_id, month in items:
+            eq_(month, _cable_month(reference_id))
+        eq_(None, _cable_month(u'09BERLIN100'))
+        eq_(None, _cable_month(u'09BERLIN0'))
+    finally:
+        utils._CABLE2MONTH.close()
+        utils._CABLE2MONTH_FILENAME, utils._CABLE2MONTH = filename, index
+        shutil.rmtree(tmp_dir)
+
+
+def test_source():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(tmp_dir, 'cable2month.bin')
+        _build_cable2month(filename=filename)
+        with open(filename, 'rb') as f1, open(utils._CABLE2MONTH_FILENAME, 'rb') as f2:
+            ok_(f1.read() == f2.read(), 'cable2month.bin is outdated, c.f. helpers/build_cable2month.py')
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_wikileaks_ids():
+    for wl_id, reference_id in consts.INVALID_CABLE_IDS.iteritems():
+        eq_(wl_id, utils._WIKILEAKS_IDS[reference_id])
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the CSV index, cablemap.core.utils.cable_from_csv_by_id etc.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+import shutil
+import tempfile
+import threading
+from nose.tools import eq_, ok_
+from cablemap.core.utils import cables_from_csv, cable_from_csv_by_id, \
+        cables_from_csv_by_ids, build_csv_index, cable_by_id, csv_ranges
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+_TMP_DIR = None
+_FILENAME = None
+
+def setup():
+    global _TMP_DIR, _FILENAME
+    _TMP_DIR = tempfile.mkdtemp()
+    _FILENAME = os.path.join(_TMP_DIR, 'cables.csv')
+    shutil.copy(_CSV_FILE, _FILENAME)
+
+def teardown():
+    shutil.rmtree(_TMP_DIR)
+
+
+def _eq_cable(expected, cable):
+    eq_(expected.reference_id, cable.reference_id)
+    eq_(expected.created, cable.created)
+    eq_(expected.header, cable.header)
+    eq_(expected.content, cable.content)
+
+
+def test_lookup():
+    for expected in cables_from_csv(_CSV_FILE):
+        _eq_cable(expected, cable_from_csv_by_id(_FILENAME, expected.reference_id))
+    ok_(os.path.exists(_FILENAME + '.idx'))
+
+
+def test_lookup_unknown():
+    eq_(None, cable_from_csv_by_id(_FILENAME, u'09BERLIN1'))
+    eq_(None, cable_from_csv_by_id(_FILENAME, u'00AAAA'))
+    eq_(None, cable_from_csv_by_id(_FILENAME, u'99ZZZZ'))
+
+
+def test_bulk_lookup():
+    expected = dict((cable.reference_id, cable) for cable in cables_from_csv(_CSV_FILE))
+    ids = [u'10TRIPOLI12', u'09UNKNOWN1', u'05ROME1234', u'09BERLIN1167']
+    cables = list(cables_from_csv_by_ids(_FILENAME, ids))
+    eq_([u'10TRIPOLI12', u'05ROME1234', u'09BERLIN1167'], [cable.reference_id for cable in cables])
+    for cable in cables:
+        _eq_cable(expected[cable.reference_id], cable)
+
+
+def test_offline_cable_by_id():
+    eq_(u'06PARIS5974', cable_by_id(u'06PARIS5974', source=_FILENAME).reference_id)
+
+
+def test_canonical_id():
+    filename = os.path.join(_TMP_DIR, 'malformed.csv')
+    with open(_CSV_FILE, 'rb') as f:
+        data = f.read().replace('"09STATE12345"', '"09SECSTATE12345"')
+    with open(filename, 'wb') as f:
+        f.write(data)
+    eq_(u'09SECSTATE12345', cable_from_csv_by_id(filename, u'09SECSTATE12345').reference_id)
+    eq_(u'09SECSTATE12345', cable_from_csv_by_id(filename, u'09STATE12345').reference_id)
+
+
+def test_outdated_index():
+    filename = os.path.join(_TMP_DIR, 'changing.csv')
+    shutil.copy(_CSV_FILE, filename)
+    build_csv_index(filename)
+    with open(_CSV_FILE, 'rb') as f:
+        data = f.read()
+    rows = [data[start:end] for start, end in csv_ranges(_CSV_FILE, len(data))]
+    eq_(7, len(rows))
+    with open(filename, 'wb') as f:
+        f.write(''.join(reversed(rows)))
+    for expected in cables_from_csv(_CSV_FILE):
+        _eq_cable(expected, cable_from_csv_by_id(filename, expected.reference_id))
+
+
+def test_unwritable_index():
+    index_filename = os.path.join(_TMP_DIR, 'missing', 'cables.csv.idx')
+    for expected in cables_from_csv(_CSV_FILE):
+        _eq_cable(expected, cable_from_csv_by_id(_FILENAME, expected.reference_id, index_filename))
+    ok_(not os.path.exists(os.path.dirname(index_filename)))
+
+
+def test_concurrent_build():
+    dirname = tempfile.mkdtemp(dir=_TMP_DIR)
+    filename = os.path.join(dirname, 'cables.csv')
+    shutil.copy(_CSV_FILE, filename)
+    errors = []
+    def build():
+        try:
+            for _ in range(10):
+                build_csv_index(filename)
+        except Exception, ex:
+            errors.append(ex)
+    threads = [threading.Thread(target=build) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    eq_([], errors)
+    eq_(['cables.csv', 'cables.csv.idx'], sorted(os.listdir(dirname)))
+    eq_(u'06PARIS5974', cable_from_csv_by_id(filename, u'06PARIS5974').reference_id)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests cablemap.core.utils.rows_from_csv_range and csv_ranges
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+from nose.tools import eq_, ok_
+from cablemap.core.utils import rows_from_csv, rows_from_csv_range, csv_ranges
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+
+def test_split_at_every_offset():
+    expected = list(rows_from_csv(_CSV_FILE))
+    size = os.path.getsize(_CSV_FILE)
+    for offset in range(size + 1):
+        eq_(expected, list(rows_from_csv_range(_CSV_FILE, 0, offset)) + list(rows_from_csv_range(_CSV_FILE, offset)))
+
+
+def test_csv_ranges():
+    expected = list(rows_from_csv(_CSV_FILE))
+    def check(count):
+        ranges = csv_ranges(_CSV_FILE, count)
+        ok_(len(ranges) <= count)
+        eq_(0, ranges[0][0])
+        eq_(os.path.getsize(_CSV_FILE), ranges[-1][1])
+        rows = []
+        for start, end in ranges:
+            shard = list(rows_from_csv_range(_CSV_FILE, start, end))
+            ok_(shard)
+            rows.extend(shard)
+        eq_(expected, rows)
+    for count in range(1, 12):
+        yield check, count
+
+
+def test_predicate():
+    pred = lambda r: r.startswith(u'09')
+    eq_(list(rows_from_csv(_CSV_FILE, pred)), list(rows_from_csv_range(_CSV_FILE, 0, None, pred)))
+
+
+def test_empty_range():
+    eq_([], list(rows_from_csv_range(_CSV_FILE, 10, 20)))
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
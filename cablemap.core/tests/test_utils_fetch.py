@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests fetching cables against a local HTTP server.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+import shutil
+import tempfile
+import threading
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from SocketServer import ThreadingMixIn
+from nose.tools import eq_, ok_
+from cablemap.core import utils
+from cablemap.core.utils import cables_by_ids, cable_by_id, _HTTPClient
+
+_DATA_DIR = os.path.join(os.path.dirname(__file__), 'data-subject', 'in')
+
+_SERVER = None
+_BASE = None
+_TMP_DIR = None
+_REQUESTS = []
+_ORIGINAL_BASES = None
+
+
+class _CableRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    failures = {}
+
+    def do_GET(self):
+        _REQUESTS.append(self.path)
+        if self.failures.get(self.path):
+            self.failures[self.path] -= 1
+            return self._send(503, '')
+        if self.path.startswith('/cgsn?id='):
+            reference_id = self.path.split('=')[1]
+            if not os.path.isfile(os.path.join(_DATA_DIR, reference_id + '.html')):
+                return self._send(200, '<td>Source</td>')
+            return self._send(200, '<td>Source</td><td><a href="%s/cable/x/%s">x</a></td>' % (_BASE, reference_id))
+        filename = os.path.join(_DATA_DIR, self.path.split('/')[-1] + '.html')
+        if not os.path.isfile(filename):
+            return self._send(404, '')
+        with open(filename, 'rb') as f:
+            self._send(200, f.read())
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def setup():
+    global _SERVER, _BASE, _TMP_DIR, _ORIGINAL_BASES
+    _SERVER = _Server(('127.0.0.1', 0), _CableRequestHandler)
+    _BASE = 'http://127.0.0.1:%d' % _SERVER.server_port
+    thread = threading.Thread(target=_SERVER.serve_forever)
+    thread.daemon = True
+    thread.start()
+    _TMP_DIR = tempfile.mkdtemp()
+    _ORIGINAL_BASES = utils._WL_CABLE_BASE, utils._CGSN_BASE
+    utils._WL_CABLE_BASE = _BASE + u'/cable/'
+    utils._CGSN_BASE = _BASE + u'/cgsn?id='
+
+
+def teardown():
+    utils._CLIENT.close()
+    utils._WL_CABLE_BASE, utils._CGSN_BASE = _ORIGINAL_BASES
+    _SERVER.shutdown()
+    shutil.rmtree(_TMP_DIR)
+
+
+def test_cables_by_ids():
+    ids = [u'07BERN881', u'10STATE284', u'08BRASILIA93', u'22BERLIN1167', u'08REYKJAVIK195']
+    cables = list(cables_by_ids(ids, concurrency=3))
+    eq_([u'07BERN881', u'10STATE284', u'08BRASILIA93', None, u'08REYKJAVIK195'],
+        [cable.reference_id if cable else None for cable in cables])
+
+
+def test_cache():
+    cache = os.path.join(_TMP_DIR, 'cache')
+    ids = [u'07BERN881', u'08TRIPOLI220']
+    expected = [cable.content for cable in cables_by_ids(ids, cache=cache)]
+    ok_(all(expected))
+    del _REQUESTS[:]
+    eq_(expected, [cable.content for cable in cables_by_ids(ids, cache=cache)])
+    eq_(expected[0], cable_by_id(ids[0], cache=cache).content)
+    eq_([], _REQUESTS)
+
+
+def test_retry():
+    path = '/cable/2007/09/07BERN881'
+    _CableRequestHandler.failures[path] = 2
+    client = _HTTPClient(retries=2, backoff=0.01)
+    ok_(client.fetch(_BASE + path))
+    eq_(0, _CableRequestHandler.failures[path])
+
+
+def test_keep_alive():
+    client = _HTTPClient()
+    del _REQUESTS[:]
+    client.fetch(_BASE + '/cable/2007/09/07BERN881')
+    client.fetch(_BASE + '/cable/2010/01/10STATE284')
+    eq_(2, len(_REQUESTS))
+    eq_(1, len(client._local.connections))
+
+
+def test_keep_alive_cache():
+    cache = os.path.join(_TMP_DIR, 'keep-alive')
+    utils._fetch_url(_BASE + '/cable/2008/01/08BRASILIA93', cache)
+    utils._fetch_url(_BASE + '/cable/2008/04/08REYKJAVIK195', cache)
+    netloc = _BASE.split('/')[-1]
+    eq_(1, len([key for key in utils._CLIENT._local.connections if key[1] == netloc]))
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
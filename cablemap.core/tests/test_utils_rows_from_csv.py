@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests cablemap.core.utils.rows_from_csv and cables_from_csv
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+from nose.tools import eq_, ok_
+from cablemap.core.utils import rows_from_csv, cables_from_csv, _UnicodeReader
+
+_CSV_FILE = os.path.join(os.path.dirname(__file__), 'data-csv', 'cables.csv')
+
+
+def _rows_via_codecs(encoding='utf-8'):
+    with open(_CSV_FILE, 'rb') as f:
+        return [tuple(row) for row in _UnicodeReader(f, encoding=encoding, delimiter=',', quotechar='"', escapechar='\\')]
+
+
+def test_rows():
+    rows = list(rows_from_csv(_CSV_FILE))
+    eq_(7, len(rows))
+    eq_(_rows_via_codecs(), rows)
+    for row in rows:
+        eq_(8, len(row))
+        ok_(all(isinstance(v, unicode) for v in row))
+
+
+def test_rows_other_encoding():
+    eq_(_rows_via_codecs('latin-1'), list(rows_from_csv(_CSV_FILE, encoding='latin-1')))
+
+
+def test_rows_predicate():
+    eq_([u'09BERLIN1167', u'09STATE12345'], [row[2] for row in rows_from_csv(_CSV_FILE, lambda r: r.startswith(u'09'))])
+
+
+def test_rows_predicate_pushdown():
+    rows = _rows_via_codecs()
+    def check(pred):
+        eq_([row for row in rows if pred(row[2])], list(rows_from_csv(_CSV_FILE, pred)))
+    for reference_id in [row[2] for row in rows]:
+        yield check, lambda r, reference_id=reference_id: r == reference_id
+        yield check, lambda r, reference_id=reference_id: r != reference_id
+
+
+def test_cables():
+    cables = list(cables_from_csv(_CSV_FILE))
+    rows = _rows_via_codecs()
+    eq_([row[2] for row in rows], [cable.reference_id for cable in cables])
+    eq_([row[7] for row in rows], [cable.content for cable in cables])
+    eq_([row[6] for row in rows], [cable.header for cable in cables])
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
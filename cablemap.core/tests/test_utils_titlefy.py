@@ -13,7 +13,7 @@ Tests cablemap.core.utils.titlefy
 :license:      BSD license
 """
 from nose.tools import eq_
-from cablemap.core.utils import titlefy
+from cablemap.core.utils import titlefy, titlefy_many
 
 _TEST_DATA = (
     ('MISSILE TECHNOLOGY CONTROL REGIME (MTCR): "BROKERING CONTROLS IN THE UNITED STATES ON DUAL-USE ITEMS"',
@@ -125,6 +125,19 @@ def test_titlefy():
     for content, expected in _TEST_DATA:
         yield check, content, expected
 
+def test_titlefy_many():
+    subjects = [content for content, _ in _TEST_DATA]
+    eq_([expected for _, expected in _TEST_DATA], titlefy_many(subjects))
+    eq_([None, u'', u'Q and A'], titlefy_many([None, '', 'Q AND A']))
+
+def test_titlefy_cache():
+    titlefy.cache_clear()
+    eq_(0, titlefy.cache_info().currsize)
+    eq_(u'What Happened to the PCC?', titlefy(u'WHAT HAPPENED TO THE PCC?'))
+    eq_(u'What Happened to the PCC?', titlefy(u'WHAT HAPPENED TO THE PCC?'))
+    info = titlefy.cache_info()
+    eq_((1, 1, 1), (info.hits, info.misses, info.currsize))
+
 
 if __name__ == '__main__':
     import nose
@@ -41,7 +41,8 @@ import os
 from gensim.models import TfidfModel
 from gensim.corpora.dictionary import Dictionary
 from gensim.corpora.mmcorpus import MmCorpus
-from cablemap.core import handle_source, predicates as pred
+from cablemap.core import handle_source, cables_from_source, predicates as pred
+from cablemap.core.store import is_store, write_store
 from cablemap.nlp.handler import NLPFilter, DictionaryHandler, CorpusHandler
 
 _DEFAULT_KEEP_WORDS=10000
@@ -57,6 +58,11 @@ def create_corpus(src, out_dir, no_below=20, keep_words=_DEFAULT_KEEP_WORDS):
     bow_filename = os.path.join(out_dir, 'cables_bow.mm')
     tfidf_filename = os.path.join(out_dir, 'cables_tfidf.mm')
     predicate = None # Could be set to something like pred.origin_filter(pred.origin_germany)
+    # 0. Parse the cables once, both passes read the store
+    if not is_store(src):
+        store = os.path.join(out_dir, 'cables.store')
+        write_store(store, cables_from_source(src, predicate))
+        src, predicate = store, None
     # 1. Create word dict
     dct = Dictionary()
     dct_handler = DictionaryHandler(dct)
@@ -35,7 +35,7 @@
 Event handler to create a cable corpus.
 """
 from __future__ import absolute_import
-from cablemap.core.handler import NoopCableHandler, DelegatingCableHandler
+from cablemap.core.handler import NoopCableHandler, DelegatingCableHandler, consumed_events
 from .corpus import WordCorpus, CableCorpus
 
 class NLPFilter(DelegatingCableHandler):
@@ -69,10 +69,17 @@ class NLPFilter(DelegatingCableHandler):
         self.want_tags = want_tags
         self.want_content = want_content
         self.want_summary = want_summary
-        self.want_commet = want_comment
+        self.want_comment = want_comment
         self.want_header = want_header
         self.want_subject = want_subject
 
+    @property
+    def consumed_events(self):
+        wanted = ((self.want_tags, 'handle_tag'), (self.want_content, 'handle_content'),
+                  (self.want_summary, 'handle_summary'), (self.want_comment, 'handle_comment'),
+                  (self.want_header, 'handle_header'), (self.want_subject, 'handle_subject'))
+        return consumed_events(self._handler).difference(name for want, name in wanted if not want)
+
     def handle_subject(self, s):
         if self.want_subject:
             self._handler.handle_subject(s)
@@ -111,23 +118,13 @@ class NLPCableHandler(NoopCableHandler):
 
     The information can be reduced if the events are filtered in advance, i.e.::
 
-        from cablemap.core.handler import DelegatingCableHandler, handle_source
-        from cablemap.core import constants as consts
-        from cablemap.core.utils import tag_kind
+        from cablemap.core import consts
+        from cablemap.core.handler import TagKindFilter, handle_source
         from cablemap.nlp.handler import CorpusHandler, NLPFilter
 
-        class MyFilter(NLPFilter):
-            '''\
-            Filters all TAGs which are not person TAGs
-            '''
-            def handle_tag(self, tag):
-                # Let only person TAGs pass
-                if self.want_tags and tag_kind(tag) == consts.TAG_KIND_PERSON:
-                    self._handler.handle_tag(tag)
-
-
         writer = CorpusHandler('/my/path')
-        handler = MyFilter(writer)
+        # Let only person TAGs pass
+        handler = NLPFilter(TagKindFilter(writer, (consts.TAG_KIND_PERSON,)), want_tags=True)
 
         handle_source('cables.csv', handler)
 
@@ -34,13 +34,23 @@
 """\
 This module defines an event handler to process cables.
 """
-from __future__ import absolute_import
+from __future__ import absolute_import, with_statement
+import os
 import re
+import time
+import gzip
+import codecs
+import shutil
+import tempfile
+import socket
+import httplib
 import logging
+import urlparse
+import threading
 import htmlentitydefs
-import urllib2
-import gzip
 from StringIO import StringIO
+from collections import deque
+from multiprocessing.pool import ThreadPool
 
 from mio.ctm.miohandler import CTMHandler
 from mio.xtm.miohandler import XTM21Handler
@@ -407,10 +417,7 @@ class MIOCableHandler(BaseMIOCableHandler):
 _find_title = re.compile(r'<title>(.+?)</title>', re.DOTALL).search
 _find_meta_encoding = re.compile(r'''<meta[^>]+charset=['"]?(.*?)['"]?\s*/?\s*>''', re.IGNORECASE).search
 
-class _Request(urllib2.Request):
-    def __init__(self, url):
-        urllib2.Request.__init__(self, url, headers={'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.7; rv:10.0.2) Gecko/20100101 Firefox/10.0.2',
-                                                     'Accept-Encoding': 'gzip, identity'})
+_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.7; rv:10.0.2) Gecko/20100101 Firefox/10.0.2'
 
 # Source: <http://effbot.org/zone/re-sub.htm#unescape-html>
 def _unescape(text):
@@ -442,56 +449,253 @@ class MediaTitleResolver(BaseMIOCableHandler):
     """\
     Creates topics with subject locators from media IRIs and assigns a name to them.
 
+    The pages are fetched concurrently, the topics are issued in the order
+    of the IRIs as soon as the pages arrived.
+
     Requires an Internet connection.
     """
-    def __init__(self, handler):
+    def __init__(self, handler, cache=None, workers=8, timeout=10, delay=0.5, revalidate=True):
         """\
 
         `handler`
             MIO event handler.
+        `cache`
+            A filename of a file which keeps the titles across runs
+            (default: ``None``, no titles are kept).
+        `workers`
+            The max. number of concurrent requests (default: ``8``).
+        `timeout`
+            The timeout of a request in seconds (default: ``10``).
+        `delay`
+            The min. number of seconds between two requests to the same
+            host (default: ``0.5``).
+        `revalidate`
+            Indicates if cached titles of pages which provide an ETag or
+            a Last-Modified header are revalidated (default: ``True``).
         """
         super(MediaTitleResolver, self).__init__(handler)
         self._seen_iris = set()
+        self._cache = cache
+        self._titles = _read_title_cache(cache) if cache and os.path.isfile(cache) else {}
+        self._workers = workers
+        self._timeout = timeout
+        self._delay = delay
+        self._revalidate = revalidate
+        self._fetcher = None
+        self._pending = deque()
 
     def end(self):
+        self._issue_titles(wait=True)
+        if self._fetcher:
+            self._fetcher.close()
+            self._fetcher = None
+        if self._cache:
+            _write_title_cache(self._cache, self._titles)
         super(MediaTitleResolver, self).end()
         self._seen_iris = None
 
+    def end_cable(self):
+        self._issue_titles()
+        super(MediaTitleResolver, self).end_cable()
+
     def handle_media_iri(self, iri):
-        def fetch_url(url):
-            resp = urllib2.urlopen(_Request(url))
-            encoding = resp.headers.getparam('charset')
-            if resp.info().get('Content-Encoding') == 'gzip':
-                res = gzip.GzipFile(fileobj=StringIO(resp.read())).read()
+        if iri in self._seen_iris or not _is_dedicated_media_page(iri):
+            return
+        self._seen_iris.add(iri)
+        cached = self._titles.get(iri)
+        if cached and not (self._revalidate and (cached[0] or cached[1])):
+            self._pending.append((iri, cached[2]))
+        else:
+            if self._fetcher is None:
+                self._fetcher = _PageFetcher(self._workers, self._timeout, self._delay)
+            self._pending.append((iri, self._fetcher.fetch_title(iri, cached)))
+        self._issue_titles()
+
+    def _issue_titles(self, wait=False):
+        """\
+        Issues the topics of the fetched pages, the topics are issued in the
+        order of the IRIs.
+
+        `wait`
+            Indicates if all pages should be awaited.
+        """
+        pending = self._pending
+        while pending:
+            iri, result = pending[0]
+            if isinstance(result, basestring):
+                name = result
             else:
-                res = resp.read()
+                if not wait and not result.ready():
+                    break
+                entry = result.get()
+                if entry is None:
+                    pending.popleft()
+                    continue
+                self._titles[iri] = entry
+                name = entry[2]
+            pending.popleft()
+            if name:
+                h = self._handler
+                h.startTopic((mio.SUBJECT_LOCATOR, iri))
+                h.name(name)
+                h.endTopic()
+
+
+_REDIRECT_STATUS = (301, 302, 303, 307)
+_MAX_REDIRECTS = 5
+
+class _PageFetcher(object):
+    """\
+    Fetches pages by a pool of threads.
+
+    Each thread keeps one connection per host. Requests to the same host
+    are delayed by a min. number of seconds.
+    """
+    def __init__(self, workers, timeout, delay):
+        self._pool = ThreadPool(workers)
+        self._timeout = timeout
+        self._delay = delay
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._next_request = {}
+
+    def fetch_title(self, iri, cached=None):
+        """\
+        Returns an ``AsyncResult`` which returns a ``(etag, last-modified, title)``
+        tuple or ``None`` if the page cannot be fetched.
+
+        `iri`
+            The IRI of the page.
+        `cached`
+            A ``(etag, last-modified, title)`` tuple of a former request or ``None``.
+        """
+        return self._pool.apply_async(self._fetch_title, (iri, cached))
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def _fetch_title(self, iri, cached):
+        headers = {'User-Agent': _USER_AGENT, 'Accept-Encoding': 'gzip, identity'}
+        if cached:
+            if cached[0]:
+                headers['If-None-Match'] = cached[0].encode('iso-8859-1')
+            if cached[1]:
+                headers['If-Modified-Since'] = cached[1].encode('iso-8859-1')
+        try:
+            resp, body = self._get(iri, headers)
+            if resp.status == 304 and cached:
+                return cached
+            if resp.status != 200:
+                logger.debug('%s: HTTP status %d' % (iri, resp.status))
+                return None
+            if resp.getheader('content-encoding') == 'gzip':
+                body = gzip.GzipFile(fileobj=StringIO(body)).read()
+            encoding = resp.msg.getparam('charset')
             if not encoding:
-                m = _find_meta_encoding(res)
+                m = _find_meta_encoding(body)
                 if m:
                     encoding = m.group(1)
-            if encoding:
-                return res.decode(encoding)
-            return res
-
-        def find_name(page):
-            m = _find_title(page)
-            return _normalize_ws(_unescape(m.group(1).strip())) if m else None
-            
-        if iri in self._seen_iris or not _is_dedicated_media_page(iri):
-            return
-        try:
-            page = fetch_url(iri)
-        except urllib2.HTTPError, ex:
+            page = body.decode(encoding or 'utf-8', 'strict' if encoding else 'replace')
+        except (httplib.HTTPException, socket.error, IOError), ex:
             logger.debug(ex)
-            return
-        except ValueError, ex: # Encoding error
+            return None
+        except (ValueError, LookupError), ex: # Encoding error
             logger.debug(ex)
-            return
-        finally:
-            self._seen_iris.add(iri)
-        name = find_name(page)
-        if name:
-            h = self._handler
-            h.startTopic((mio.SUBJECT_LOCATOR, iri))
-            h.name(name)
-            h.endTopic()
+            return None
+        m = _find_title(page)
+        name = _normalize_ws(_unescape(m.group(1).strip())) if m else u''
+        return _header(resp, 'etag'), _header(resp, 'last-modified'), name
+
+    def _get(self, iri, headers):
+        """\
+        Returns the response and the body of the page, redirects are followed.
+        """
+        url = iri.encode('utf-8') if isinstance(iri, unicode) else iri
+        for _ in range(_MAX_REDIRECTS):
+            scheme, netloc, path, query, _ = urlparse.urlsplit(url)
+            if query:
+                path += '?' + query
+            resp, body = self._request(scheme, netloc, path or '/', headers)
+            location = resp.getheader('location')
+            if resp.status not in _REDIRECT_STATUS or not location:
+                return resp, body
+            url = urlparse.urljoin(url, location)
+            # The validators belong to the original IRI
+            headers = dict((k, v) for k, v in headers.iteritems() if not k.startswith('If-'))
+        raise httplib.HTTPException('Too many redirects: %s' % iri)
+
+    def _request(self, scheme, netloc, path, headers):
+        self._wait_turn(netloc)
+        connections = self._local.__dict__.setdefault('connections', {})
+        key = scheme, netloc
+        reused = key in connections
+        if not reused:
+            cls = httplib.HTTPSConnection if scheme == 'https' else httplib.HTTPConnection
+            connections[key] = cls(netloc, timeout=self._timeout)
+        conn = connections[key]
+        try:
+            conn.request('GET', path, headers=headers)
+            resp = conn.getresponse()
+            return resp, resp.read()
+        except (httplib.HTTPException, socket.error):
+            conn.close()
+            del connections[key]
+            if not reused:
+                raise
+        # The server closed the kept-alive connection, try once again
+        return self._request(scheme, netloc, path, headers)
+
+    def _wait_turn(self, host):
+        with self._lock:
+            now = time.time()
+            at = max(now, self._next_request.get(host, 0))
+            self._next_request[host] = at + self._delay
+        if at > now:
+            time.sleep(at - now)
+
+
+def _header(resp, name):
+    """\
+    Returns the value of the header `name` as unicode string, the value is
+    decoded as ISO-8859-1, acc. to RFC 2616. Tabs are replaced since they
+    separate the fields of the title cache.
+    """
+    return resp.getheader(name, '').decode('iso-8859-1').replace(u'\t', u' ')
+
+
+def _read_title_cache(filename):
+    """\
+    Returns a dict which maps IRIs to ``(etag, last-modified, title)`` tuples.
+    """
+    with codecs.open(filename, 'rb', 'utf-8') as f:
+        return dict((iri, (etag, modified, title)) for iri, etag, modified, title in
+                    (line.rstrip(u'\n').split(u'\t') for line in f))
+
+
+def _write_title_cache(filename, titles):
+    """\
+    Writes the provided dict of ``(etag, last-modified, title)`` tuples.
+
+    The cache is written to a unique temporary file in the directory of the
+    cache first, concurrent writers do not interfere with each other and an
+    existing cache is replaced only by a complete one.
+    """
+    dirname, basename = os.path.split(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(prefix=basename + '.', suffix='.tmp', dir=dirname)
+    try:
+        with codecs.getwriter('utf-8')(os.fdopen(fd, 'wb')) as f:
+            for iri, (etag, modified, title) in sorted(titles.iteritems()):
+                f.write(u'\t'.join((iri, etag, modified, title.replace(u'\t', u' '))) + u'\n')
+        if os.path.exists(filename):
+            shutil.copymode(filename, tmp)
+        try:
+            os.rename(tmp, filename)
+        except OSError: # Windows does not replace existing files
+            if os.path.exists(filename):
+                os.remove(filename)
+            os.rename(tmp, filename)
+    except:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2011 - 2015 -- Lars Heuer <heuer[at]semagia.com>
+# All rights reserved.
+#
+# License: BSD, see LICENSE.txt for more details.
+#
+"""\
+Tests the MediaTitleResolver and its page fetcher against a local HTTP server.
+
+:author:       Lars Heuer (heuer[at]semagia.com)
+:organization: Semagia - <http://www.semagia.com/>
+:license:      BSD license
+"""
+import os
+import time
+import shutil
+import tempfile
+import threading
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from SocketServer import ThreadingMixIn
+from nose.tools import eq_, ok_
+from cablemap.tm.handler import MediaTitleResolver, _PageFetcher, \
+     _read_title_cache, _write_title_cache
+
+_SERVER = None
+_BASE = None
+_TMP_DIR = None
+_REQUESTS = []
+
+# ETag with a non-ASCII (ISO-8859-1) char
+_ETAG = '"caf\xe9"'
+
+
+class _PageRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        _REQUESTS.append((self.path, self.headers.getheader('if-none-match')))
+        if self.path == '/missing':
+            return self._send(404, '')
+        if self.path == '/moved':
+            return self._send(301, '', [('Location', '%s/page' % _BASE)])
+        if self.path == '/etag':
+            if self.headers.getheader('if-none-match') == _ETAG:
+                return self._send(304, '')
+            return self._send(200, '<html><title>ETag</title></html>', [('ETag', _ETAG)])
+        if self.path == '/latin1':
+            return self._send(200, '<title>Caf\xe9</title>', [('Content-Type', 'text/html; charset=iso-8859-1')])
+        self._send(200, '<html><head><title>\n  A &amp;   B\n</title></head></html>')
+
+    def _send(self, status, body, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _TopicHandler(object):
+    """\
+    Records the topics which are issued by the MediaTitleResolver.
+    """
+    def __init__(self):
+        self.topics = []
+
+    def startTopicMap(self):
+        pass
+
+    def endTopicMap(self):
+        pass
+
+    def startTopic(self, identity):
+        self.topics.append([identity[1]])
+
+    def name(self, value, typ=None):
+        self.topics[-1].append(value)
+
+    def endTopic(self):
+        pass
+
+
+def setup():
+    global _SERVER, _BASE, _TMP_DIR
+    _SERVER = _Server(('127.0.0.1', 0), _PageRequestHandler)
+    _BASE = u'http://127.0.0.1:%d' % _SERVER.server_port
+    thread = threading.Thread(target=_SERVER.serve_forever)
+    thread.daemon = True
+    thread.start()
+    _TMP_DIR = tempfile.mkdtemp()
+
+
+def teardown():
+    _SERVER.shutdown()
+    shutil.rmtree(_TMP_DIR)
+
+
+def _fetch(iri, cached=None, delay=0):
+    fetcher = _PageFetcher(2, 5, delay)
+    try:
+        return fetcher.fetch_title(iri, cached).get()
+    finally:
+        fetcher.close()
+
+
+def test_fetch_title():
+    eq_((u'', u'', u'A & B'), _fetch(_BASE + u'/page'))
+    eq_((u'', u'', u'A & B'), _fetch(_BASE + u'/moved'))
+    eq_(u'Café', _fetch(_BASE + u'/latin1')[2])
+    eq_(None, _fetch(_BASE + u'/missing'))
+
+
+def test_revalidate():
+    entry = _fetch(_BASE + u'/etag')
+    eq_((u'"café"', u'', u'ETag'), entry)
+    del _REQUESTS[:]
+    cached = entry[0], entry[1], u'Cached title'
+    eq_(cached, _fetch(_BASE + u'/etag', cached))
+    eq_([('/etag', _ETAG)], _REQUESTS)
+
+
+def test_rate_limit():
+    fetcher = _PageFetcher(4, 5, 0.2)
+    start = time.time()
+    results = [fetcher.fetch_title(_BASE + u'/page%d' % i) for i in range(3)]
+    eq_([u'A & B'] * 3, [result.get()[2] for result in results])
+    fetcher.close()
+    ok_(time.time() - start >= 0.4)
+
+
+def test_title_cache():
+    cache = os.path.join(_TMP_DIR, 'titles.txt')
+    titles = {_BASE + u'/etag': (u'"café"', u'', u'ETag'),
+              _BASE + u'/page': (u'', u'Mon, 01 Aug 2011 10:00:00 GMT', u'A\tB')}
+    _write_title_cache(cache, titles)
+    titles[_BASE + u'/page'] = (u'', u'Mon, 01 Aug 2011 10:00:00 GMT', u'A B')
+    eq_(titles, _read_title_cache(cache))
+
+
+def test_title_cache_writers():
+    dirname = tempfile.mkdtemp(dir=_TMP_DIR)
+    cache = os.path.join(dirname, 'titles.txt')
+    titles = dict((u'%s/page%d' % (_BASE, i), (u'', u'', u'Title %d' % i)) for i in range(100))
+    errors = []
+    def write():
+        try:
+            for _ in range(10):
+                _write_title_cache(cache, titles)
+        except Exception, ex:
+            errors.append(ex)
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    eq_([], errors)
+    eq_(['titles.txt'], os.listdir(dirname))
+    eq_(titles, _read_title_cache(cache))
+
+
+def test_title_cache_failure():
+    dirname = tempfile.mkdtemp(dir=_TMP_DIR)
+    cache = os.path.join(dirname, 'titles.txt')
+    titles = {_BASE + u'/page': (u'', u'', u'Title')}
+    _write_title_cache(cache, titles)
+    try:
+        _write_title_cache(cache, {_BASE + u'/broken': (u'', u'', None)})
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError('Expected an AttributeError')
+    eq_(['titles.txt'], os.listdir(dirname))
+    eq_(titles, _read_title_cache(cache))
+
+
+def _resolve(resolver, iris):
+    handler = _TopicHandler()
+    resolver._handler = handler
+    resolver.start()
+    resolver.start_cable(u'09BERLIN1', u'09BERLIN1')
+    for iri in iris:
+        resolver.handle_media_iri(iri)
+    resolver.end_cable()
+    eq_(None, resolver._cable_psi)
+    resolver.end()
+    return handler.topics
+
+
+def test_resolver():
+    cache = os.path.join(_TMP_DIR, 'resolver.txt')
+    iris = [_BASE + u'/page', _BASE + u'/missing', _BASE + u'/etag', _BASE + u'/page']
+    expected = [[_BASE + u'/page', u'A & B'], [_BASE + u'/etag', u'ETag']]
+    eq_(expected, _resolve(MediaTitleResolver(_TopicHandler(), cache=cache, delay=0), iris))
+    ok_(os.path.isfile(cache))
+    # Cached titles without validators are not requested again, the others are revalidated
+    del _REQUESTS[:]
+    eq_(expected, _resolve(MediaTitleResolver(_TopicHandler(), cache=cache, delay=0), iris))
+    eq_([('/etag', _ETAG), ('/missing', None)], sorted(_REQUESTS))
+
+
+if __name__ == '__main__':
+    import nose
+    nose.core.runmodule()
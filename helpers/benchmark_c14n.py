@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""\
+Measures the canonicalization of the cable identifiers and references
+while building a reference graph (canonical id -> canonical ids of the
+referenced cables).
+
+The references are parsed once, the graph is built with the uncached
+canonicalization, with ``canonicalize_id`` and with ``canonicalize_ids``.
+
+Usage: python benchmark_c14n.py cables.csv [rounds]
+"""
+import sys
+import time
+from cablemap.core import c14n
+from cablemap.core.utils import cables_from_source
+
+
+def graph_uncached(cables):
+    canonicalize = c14n._canonicalize_id
+    return dict((canonicalize(reference_id), [canonicalize(ref) for ref in refs]) for reference_id, refs in cables)
+
+
+def graph_cached(cables):
+    canonicalize = c14n.canonicalize_id
+    return dict((canonicalize(reference_id), [canonicalize(ref) for ref in refs]) for reference_id, refs in cables)
+
+
+def graph_batch(cables):
+    canonicalize_ids = c14n.canonicalize_ids
+    ids = canonicalize_ids([reference_id for reference_id, _ in cables])
+    return dict(zip(ids, [canonicalize_ids(refs) for _, refs in cables]))
+
+
+def measure(func, cables, rounds):
+    start = time.time()
+    for i in range(rounds):
+        res = func(cables)
+    return res, time.time() - start
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    cables = [(cable.reference_id, [ref.value for ref in cable.references if ref.is_cable()])
+              for cable in cables_from_source(sys.argv[1])]
+    count = sum(len(refs) + 1 for _, refs in cables) * rounds
+    expected = None
+    for title, func in (('uncached', graph_uncached), ('cached', graph_cached), ('batch', graph_batch)):
+        c14n.canonicalize_id.cache_clear()
+        graph, duration = measure(func, cables, rounds)
+        if expected is None:
+            expected = graph
+        elif graph != expected:
+            print('%s: different graph' % title)
+        info = c14n.canonicalize_id.cache_info()
+        total = (info.hits + info.misses) or 1
+        print('%-9s %8.3f s  %6.0f ns/id  hit rate %5.1f%%' % (title, duration, duration * 1e9 / count, info.hits * 100.0 / total))
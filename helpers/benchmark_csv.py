@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""\
+Compares the throughput of the CSV readers.
+
+Usage: python benchmark_csv.py cables.csv
+"""
+import os
+import sys
+import time
+from cablemap.core import utils, predicates
+
+
+def legacy_rows(filename, predicate=None, encoding='utf-8'):
+    """\
+    The former implementation of ``utils.rows_from_csv``.
+    """
+    pred = predicate or bool
+    with open(filename, 'rb') as f:
+        for row in utils._UnicodeReader(f, encoding=encoding, delimiter=',', quotechar='"', escapechar='\\'):
+            if row and pred(row[2]):
+                yield tuple(row)
+
+
+def measure(name, filename, func):
+    size = os.path.getsize(filename) / 1024.0 / 1024.0
+    start = time.time()
+    count = sum(1 for _ in func())
+    duration = time.time() - start
+    print('%-30s %8d rows %8.2f s %8.2f MB/s' % (name, count, duration, size / duration))
+
+
+def benchmark(filename):
+    measure('legacy rows', filename, lambda: legacy_rows(filename))
+    measure('rows_from_csv', filename, lambda: utils.rows_from_csv(filename))
+    measure('rows_from_csv (latin-1)', filename, lambda: utils.rows_from_csv(filename, encoding='latin-1'))
+    measure('cables_from_csv', filename, lambda: utils.cables_from_csv(filename))
+    germany = predicates.origin_filter(predicates.origin_germany)
+    measure('legacy rows (Germany)', filename, lambda: legacy_rows(filename, germany))
+    measure('rows_from_csv (Germany)', filename, lambda: utils.rows_from_csv(filename, germany))
+
+
+if __name__ == '__main__':
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else 'cables.csv')
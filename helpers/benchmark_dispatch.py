@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""\
+Compares the per-event overhead of the handler chain used by
+``generate_topicmaps.py`` with the former ``__getattr__`` based dispatch.
+
+The topic map writers are replaced by handlers which do nothing, the events
+are parsed once and replayed.
+
+Usage: python benchmark_dispatch.py cables.csv [rounds]
+"""
+import sys
+import time
+from cablemap.core import predicates as pred
+from cablemap.core.utils import cables_from_source
+from cablemap.core.handler import CABLE_EVENTS, NoopCableHandler, DelegatingCableHandler, \
+     TeeCableHandler, MultipleCableHandler, CableIdFilter, DefaultMetadataOnlyFilter, \
+     consumed_events, events_from_cable, resolve_event, _dispatcher
+
+
+class LegacyTeeCableHandler(TeeCableHandler):
+    def resolve_event(self, name):
+        return getattr(self, name)
+
+    def __getattr__(self, name):
+        def delegate(*args):
+            getattr(self._first, name)(*args)
+            getattr(self._second, name)(*args)
+        return delegate
+
+
+class LegacyMultipleCableHandler(MultipleCableHandler):
+    def resolve_event(self, name):
+        return getattr(self, name)
+
+    def __getattr__(self, name):
+        def delegate(*args):
+            for handler in self._handlers:
+                getattr(handler, name)(*args)
+        return delegate
+
+
+class LegacyCableIdFilter(CableIdFilter):
+    def resolve_event(self, name):
+        return getattr(self, name)
+
+    def __getattr__(self, name):
+        def noop(*args): pass
+        if self._accept:
+            return getattr(self._handler, name)
+        return noop
+
+
+class LegacyDelegatingCableHandler(DelegatingCableHandler):
+    def resolve_event(self, name):
+        return getattr(self, name)
+
+    def __getattr__(self, name):
+        return getattr(self._handler, name)
+
+
+class LegacyMetadataOnlyFilter(DefaultMetadataOnlyFilter):
+    def resolve_event(self, name):
+        return getattr(self, name)
+
+    def __getattr__(self, name):
+        return getattr(self._handler, name)
+
+
+class WriterHandler(NoopCableHandler):
+    """\
+    Stands in for the topic map writers, it provides a method for each event.
+    """
+    def start(self): pass
+    def end(self): pass
+    def start_cable(self, reference_id, canonical_id): pass
+    def end_cable(self): pass
+
+for _name in CABLE_EVENTS:
+    setattr(WriterHandler, _name, lambda self, *args: None)
+
+
+class SubjectLocatorsHandler(NoopCableHandler):
+    def handle_wikileaks_iri(self, iri):
+        pass
+
+
+class ContentHandler(DelegatingCableHandler):
+    @property
+    def consumed_events(self):
+        return consumed_events(self._handler) & frozenset(['handle_content', 'handle_header'])
+
+    def resolve_event(self, name):
+        if 'start' not in name and 'end' not in name and 'content' not in name and 'header' not in name:
+            return resolve_event(NoopCableHandler(), name)
+        return resolve_event(self._handler, name)
+
+    def __getattr__(self, name):
+        def noop(*args):
+            pass
+        if 'start' not in name and 'end' not in name and 'content' not in name and 'header' not in name:
+            return noop
+        return getattr(self._handler, name)
+
+
+def create_chain(tee, multiple, id_filter, metadata_filter, delegating):
+    """\
+    Returns the handler chain of ``generate_topicmaps.generate_topicmaps``.
+    """
+    def writers():
+        return tee(WriterHandler(), WriterHandler())
+    european_handler = id_filter(writers(), pred.origin_filter(pred.origin_europe))
+    return multiple([metadata_filter(delegating(tee(european_handler, writers())), titlefy_subject=False),
+                     SubjectLocatorsHandler(),
+                     ContentHandler(writers())])
+
+
+def legacy_run(events, handler):
+    handler.start()
+    for name, args in events:
+        getattr(handler, name)(*args)
+    handler.end()
+
+
+def compiled_run(events, handler):
+    dispatch = _dispatcher(handler, consumed_events(handler))
+    dispatch['start']()
+    for name, args in events:
+        dispatch[name](*args)
+    dispatch['end']()
+
+
+def measure(run, handler, events, rounds):
+    start = time.time()
+    for i in range(rounds):
+        run(events, handler)
+    return time.time() - start
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    legacy = create_chain(LegacyTeeCableHandler, LegacyMultipleCableHandler, LegacyCableIdFilter,
+                          LegacyMetadataOnlyFilter, LegacyDelegatingCableHandler)
+    compiled = create_chain(TeeCableHandler, MultipleCableHandler, CableIdFilter,
+                            DefaultMetadataOnlyFilter, DelegatingCableHandler)
+    wanted = consumed_events(compiled)
+    events = []
+    for cable in cables_from_source(sys.argv[1]):
+        events.extend(events_from_cable(cable, wanted))
+    count = len(events) * rounds
+    for title, run, handler in (('__getattr__', legacy_run, legacy), ('compiled', compiled_run, compiled)):
+        duration = measure(run, handler, events, rounds)
+        print('%-12s %8.3f s  %6.0f ns/event' % (title, duration, duration * 1e9 / count))
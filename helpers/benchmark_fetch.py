@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""\
+Compares fetching cables one by one with ``cables_by_ids`` against a local
+stub server which serves the HTML pages of a directory with a latency.
+
+Usage: python benchmark_fetch.py ./cables/ [latency-in-seconds]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from SocketServer import ThreadingMixIn
+from cablemap.core import utils
+from cablemap.core.reader import reference_id_from_filename
+from cablemap.core.utils import cable_by_id, cables_by_ids
+
+
+class CableRequestHandler(BaseHTTPRequestHandler):
+    """\
+    Serves ``/cable/<year>/<month>/<reference-id>`` from the `directory`.
+    """
+    protocol_version = 'HTTP/1.1'
+    directory = None
+    latency = 0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        filename = os.path.join(self.directory, self.path.split('/')[-1] + '.html')
+        status, body = 404, ''
+        if os.path.isfile(filename):
+            with open(filename, 'rb') as f:
+                status, body = 200, f.read()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def start_server(directory, latency=0):
+    """\
+    Starts a stub server and returns it. The cable functions of
+    ``cablemap.core.utils`` use the server.
+    """
+    CableRequestHandler.directory = directory
+    CableRequestHandler.latency = latency
+    server = StubServer(('127.0.0.1', 0), CableRequestHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    utils._WL_CABLE_BASE = u'http://127.0.0.1:%d/cable/' % server.server_port
+    return server
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    directory = sys.argv[1]
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    server = start_server(directory, latency)
+    ids = [reference_id_from_filename(name) for name in sorted(os.listdir(directory)) if name.endswith('.html')]
+    # Known by cable2month, no Cablegatesearch lookup
+    ids = [reference_id for reference_id in ids if utils._cable_month(reference_id)]
+    cache = tempfile.mkdtemp()
+    try:
+        start = time.time()
+        for reference_id in ids:
+            cable_by_id(reference_id)
+        print('one by one     %d cables %8.3f s' % (len(ids), time.time() - start))
+        for concurrency in (4, 16):
+            start = time.time()
+            list(cables_by_ids(ids, concurrency, cache if concurrency == 16 else None))
+            print('concurrency %2d %d cables %8.3f s' % (concurrency, len(ids), time.time() - start))
+        start = time.time()
+        list(cables_by_ids(ids, 16, cache))
+        print('cached         %d cables %8.3f s' % (len(ids), time.time() - start))
+    finally:
+        shutil.rmtree(cache)
+        server.shutdown()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""\
+Compares the throughput of the HTML cable parser with the raw read speed.
+
+Usage: python benchmark_html.py ./cables/
+"""
+import os
+import re
+import sys
+import time
+import codecs
+from cablemap.core import reader, utils
+from cablemap.core.models import Cable
+
+_CONTENT_PATTERN = re.compile(ur'(?:<code><pre>)(.+?)(?:</pre></code>)', re.DOTALL|re.UNICODE)
+_META_PATTERN = re.compile(r'''<table.*?class.+?["']cable["']\s*>.+?<a[^>]+>(.+?)</a>.+<td>\s*<a.+?>(.+?)</a>.+<td>\s*<a.+?>(.+?)</a>.+<td>\s*<a.+?>(.+?)</a>''', re.MULTILINE|re.DOTALL)
+_LINK_PATTERN = re.compile(ur'<a[^>]*>', re.UNICODE)
+_HTML_TAG_PATTERN = re.compile(r'</?[a-zA-Z]+>')
+_BACKSLASH_PATTERN = re.compile(r'\\[ ]*\n|\\[ ]*$')
+
+
+def _legacy_clean_html(html):
+    content = html.replace(u'&#x000A;', u'\n').replace(u'¶', '')
+    content = _LINK_PATTERN.sub(u'', content)
+    content = _HTML_TAG_PATTERN.sub(u'', content)
+    return _BACKSLASH_PATTERN.sub(u'\n', content)
+
+
+def legacy_cable_from_file(filename):
+    """\
+    The former implementation of ``models.cable_from_file``.
+    """
+    html = codecs.open(filename, 'rb', 'utf-8').read()
+    cable = Cable(reader.reference_id_from_filename(filename))
+    end_idx = html.rindex('</table>')
+    start_idx = html.rindex("<table class='cable'>", 0, end_idx)
+    m = _META_PATTERN.search(html, start_idx, end_idx)
+    _, cable.created, classification, cable.origin = m.groups()
+    cable.classification = classification.upper()
+    blocks = _CONTENT_PATTERN.findall(html)
+    cable.header = _legacy_clean_html(blocks[0]) if len(_CONTENT_PATTERN.findall(html)) == 2 else ''
+    cable.content = _legacy_clean_html(blocks[-1])
+    return cable
+
+
+def read_files(directory, encoding=None):
+    for filename in utils.cablefiles_from_directory(directory):
+        if encoding:
+            yield codecs.open(filename, 'rb', encoding).read()
+        else:
+            with open(filename, 'rb') as f:
+                yield f.read()
+
+
+def measure(name, directory, size, func):
+    start = time.time()
+    count = sum(1 for _ in func())
+    duration = time.time() - start
+    print('%-25s %8d files %8.2f s %8.2f MB/s' % (name, count, duration, size / duration))
+
+
+def benchmark(directory):
+    files = list(utils.cablefiles_from_directory(directory))
+    size = sum(os.path.getsize(f) for f in files) / 1024.0 / 1024.0
+    measure('read', directory, size, lambda: read_files(directory))
+    measure('read (utf-8)', directory, size, lambda: read_files(directory, 'utf-8'))
+    measure('legacy cable_from_file', directory, size, lambda: (legacy_cable_from_file(f) for f in files))
+    measure('cables_from_directory', directory, size, lambda: utils.cables_from_directory(directory))
+
+
+if __name__ == '__main__':
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else './cables/')
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""\
+Compares the former chain of substring tests for invalid references in
+``parse_references`` with the pattern built from ``ignored-references.txt``.
+
+The invalid references are collected from the cables, each valid reference
+is turned into two invalid ones as well (an unknown station and a month name
+instead of the station). The duration of ``parse_references`` is reported
+with and without debug logging.
+
+Usage: python benchmark_ignored_references.py cables.csv [rounds]
+"""
+import sys
+import time
+import logging
+from cablemap.core import reader
+from cablemap.core.utils import cables_from_source
+
+
+def chain(reference):
+    return 'CORRUPTION' not in reference and 'ECRET' not in reference and 'PARISPOINT' not in reference and 'TELCON' not in reference and 'FORTHE' not in reference and 'ZOCT' not in reference and 'ZSEP' not in reference and 'ZMAY' not in reference and 'ZNOV' not in reference and 'ZAUG' not in reference and 'PRIORITY' not in reference and 'ZJAN' not in reference and 'ZFEB' not in reference and 'ZJUN' not in reference and'ZJUL' not in reference and 'PREVIO' not in reference and 'SEPTEMBER' not in reference and 'ZAPR' not in reference and 'ZFEB' not in reference and 'PART' not in reference and 'ONFIDENTIAL' not in reference and 'SECRET' not in reference and 'SECTION' not in reference and 'TODAY' not in reference and 'DAILY' not in reference and 'OUTOF' not in reference and 'PROVIDING' not in reference and 'NUMBER' not in reference and 'APRIL' not in reference and 'OCTOBER' not in reference and 'MAIL' not in reference and 'DECEMBER' not in reference and 'FEBRUAY' not in reference and 'AUGUST' not in reference and 'MARCH' not in reference and 'JULY' not in reference and 'JUNE' not in reference and 'MAIL' not in reference and 'JANUARY' not in reference and '--' not in reference and 'PARAGRAPH' not in reference and 'ANDPREVIOUS' not in reference and 'UNCLAS' not in reference and 'ONMARCH' not in reference and 'ONAPRIL' not in reference and 'FEBRUARY' not in reference and 'ONMAY' not in reference and 'ONJULY' not in reference and 'ONJUNE' not in reference and 'NOVEMBER' not in reference and not 'CONFIDENTIAL' in reference
+
+
+def pattern(reference, search=reader._IGNORED_REFERENCE_PATTERN.search):
+    return not search(reference)
+
+
+def invalid_references(cables):
+    """\
+    Returns invalid references derived from the references of the cables.
+    """
+    res = []
+    split_reference_id = reader.split_reference_id
+    def split(reference):
+        parts = split_reference_id(reference)
+        if not parts:
+            res.append(reference)
+        else:
+            year, station, serial = parts
+            res.append(year + station + u'X' + serial)
+            res.append(year + u'JANUARY' + serial)
+        return parts
+    reader.split_reference_id = split
+    try:
+        for cable in cables:
+            reader.parse_references(cable.content, cable.created[:4], cable.reference_id)
+    finally:
+        reader.split_reference_id = split_reference_id
+    return res
+
+
+def measure(func, *args):
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+def parse(cables, rounds):
+    for i in range(rounds):
+        for cable in cables:
+            reader.parse_references(cable.content, cable.created[:4], cable.reference_id)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    cables = list(cables_from_source(sys.argv[1]))
+    references = invalid_references(cables)
+    for reference in references:
+        if chain(reference) != pattern(reference):
+            print('mismatch %r' % reference)
+    count = len(references) * rounds * 20
+    for title, func in (('chain', chain), ('pattern', pattern)):
+        duration = measure(lambda: [func(r) for i in xrange(rounds * 20) for r in references])
+        print('%-8s %d references %8.3f s  %6.0f ns/reference' % (title, len(references), duration, duration * 1e9 / count))
+    logging.getLogger('cablemap.core.reader').addHandler(logging.NullHandler())
+    for level in (logging.DEBUG, logging.WARNING):
+        logging.getLogger('cablemap.core.reader').setLevel(level)
+        print('parse_references %-7s %8.3f s' % (logging.getLevelName(level), measure(parse, cables, rounds)))
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""\
+Measures ``origin_filter(origin_europe)`` on the reference identifiers of the
+cables with and without the cache of the canonicalized year / origin split.
+
+Usage: python benchmark_predicates.py cables.csv [rounds]
+"""
+import sys
+import time
+from cablemap.core import predicates as pred
+from cablemap.core.c14n import canonicalize_id
+from cablemap.core.utils import cables_from_source
+
+
+def uncached(cable_id):
+    return pred.origin_europe(pred._YEAR_ORIGIN_PATTERN.match(canonicalize_id(cable_id)).group(2))
+
+
+def measure(predicate, reference_ids, rounds):
+    start = time.time()
+    for i in range(rounds):
+        for reference_id in reference_ids:
+            predicate(reference_id)
+    return time.time() - start
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    reference_ids = [cable.reference_id for cable in cables_from_source(sys.argv[1])]
+    count = len(reference_ids) * rounds
+    for title, predicate in (('uncached', uncached), ('cached', pred.origin_filter(pred.origin_europe))):
+        duration = measure(predicate, reference_ids, rounds)
+        print('%-9s %8.3f s  %6.0f ns/id' % (title, duration, duration * 1e9 / count))
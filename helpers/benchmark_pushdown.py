@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""\
+Compares reading the cables of ``year_in('09') & region('europe')`` by
+scanning a CSV file with reading them by the CSV index.
+
+The index is created if it does not exist.
+
+Usage: python benchmark_pushdown.py cables.csv
+"""
+import sys
+import time
+from cablemap.core import predicates as pred
+from cablemap.core.utils import cables_from_csv, build_csv_index, _current_csv_index
+
+
+def measure(filename, predicate):
+    start = time.time()
+    count = 0
+    for cable in cables_from_csv(filename, predicate):
+        cable.subject
+        count += 1
+    return count, time.time() - start
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    filename = sys.argv[1]
+    predicate = pred.year_in('09') & pred.region('europe')
+    if not _current_csv_index(filename, None):
+        build_csv_index(filename)
+    # A plain function hides the structure of the predicate, the file is scanned
+    for title, func in (('scan', lambda reference_id: predicate(reference_id)), ('index', predicate)):
+        print('%-6s %d cables %8.3f s' % ((title,) + measure(filename, func)))
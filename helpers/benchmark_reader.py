@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""\
+Measures the parsers of the subject, TAGS, references and summary.
+
+"separate" calls one parser for all cables before the next parser is
+called, so each parser has to locate the sections of a cable on its own.
+"fused" calls all parsers per cable with one ``HeaderZone``, so the
+sections are located once.
+
+Usage: python benchmark_reader.py cables.csv [max. number of cables]
+"""
+import sys
+import time
+from itertools import islice
+from cablemap.core import reader
+from cablemap.core.utils import cables_from_csv
+
+
+def _parsers(cable, zone=None):
+    year = cable.created[:4]
+    reference_id = cable.reference_id
+    return (lambda c: reader.parse_subject(c, reference_id, zone=zone),
+            lambda c: reader.parse_tags(c, reference_id, zone=zone),
+            lambda c: reader.parse_references(c, year, reference_id, zone=zone),
+            lambda c: reader.parse_summary(c, reference_id, zone=zone))
+
+
+def separate(cables):
+    for i in range(4):
+        for cable in cables:
+            _parsers(cable)[i](cable.content)
+
+
+def fused(cables):
+    for cable in cables:
+        for parse in _parsers(cable, reader.HeaderZone(cable.content)):
+            parse(cable.content)
+
+
+def measure(name, func, cables):
+    start = time.time()
+    func(cables)
+    duration = time.time() - start
+    print('%-10s %8d cables %8.2f s %10.1f cables/s' % (name, len(cables), duration, len(cables) / duration))
+
+
+def benchmark(filename, limit=None):
+    cables = list(islice(cables_from_csv(filename), limit))
+    measure('separate', separate, cables)
+    measure('fused', fused, cables)
+
+
+if __name__ == '__main__':
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else 'cables.csv',
+              int(sys.argv[2]) if len(sys.argv) > 2 else None)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""\
+Compares ``split_reference_id`` with the ``REFERENCE_ID_PATTERN`` regex and
+checks that both accept the same reference identifiers.
+
+The reference identifiers are read from the cables, some malformed variants
+of each identifier are added.
+
+Usage: python benchmark_reference_ids.py cables.csv [rounds]
+"""
+import sys
+import time
+from cablemap.core.utils import cables_from_source
+from cablemap.core.consts import REFERENCE_ID_PATTERN, split_reference_id, split_reference_ids
+
+
+def variants(reference_id):
+    yield reference_id
+    yield reference_id.lower()
+    yield reference_id + u'\n'
+    yield reference_id + u'12345678'
+    yield u'1' + reference_id
+    yield reference_id[2:]
+    yield reference_id.rstrip(u'0123456789')
+
+
+def regex_split(reference_ids):
+    match = REFERENCE_ID_PATTERN.match
+    res = []
+    for reference_id in reference_ids:
+        m = match(reference_id)
+        res.append(m.groups() if m else None)
+    return res
+
+
+def measure(func, reference_ids, rounds):
+    start = time.time()
+    for i in range(rounds):
+        func(reference_ids)
+    return time.time() - start
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    reference_ids = [variant for cable in cables_from_source(sys.argv[1]) for variant in variants(cable.reference_id)]
+    expected = regex_split(reference_ids)
+    for reference_id, parts, split in zip(reference_ids, expected, split_reference_ids(reference_ids)):
+        if parts != split:
+            print('mismatch %r: %r != %r' % (reference_id, parts, split))
+    count = len(reference_ids) * rounds
+    for title, func in (('regex', regex_split),
+                        ('split', lambda ids: [split_reference_id(i) for i in ids]),
+                        ('batch', split_reference_ids)):
+        duration = measure(func, reference_ids, rounds)
+        print('%-6s %8.3f s  %6.0f ns/id' % (title, duration, duration * 1e9 / count))
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""\
+Compares the TAG kind lookup by scanning the TAG lists against the
+``cablemap.core.tags`` dictionary and its batch variant.
+
+Usage: python benchmark_tags.py [rounds]
+"""
+import os
+import sys
+import time
+import codecs
+from cablemap.core import consts, tags
+
+
+def _read_tags(filename):
+    with codecs.open(os.path.join(os.path.dirname(tags.__file__), filename), 'rb', 'utf-8') as f:
+        return [l.upper().rstrip() for l in f]
+
+_TAGS_SUBJECT = _read_tags('subject-tags.txt')
+_TAGS_ORG = _read_tags('organization-tags.txt')
+
+
+def list_tag_kind(tag, default=consts.TAG_KIND_UNKNOWN):
+    """\
+    The former implementation of ``cablemap.core.utils.tag_kind``.
+    """
+    if len(tag) == 2:
+        return consts.TAG_KIND_GEO
+    if u',' in tag:
+        return consts.TAG_KIND_PERSON
+    if tag[0] in u'Kk' and len(tag) == 4:
+        return consts.TAG_KIND_PROGRAM
+    t = tag.upper()
+    if t in _TAGS_SUBJECT:
+        return consts.TAG_KIND_SUBJECT
+    if t in _TAGS_ORG:
+        return consts.TAG_KIND_ORG
+    return default
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        print(__doc__)
+        sys.exit(1)
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    sample = [u'PREL', u'PGOV', u'OBAMA, BARACK', u'GM', u'KIPR', u'NASA', u'phum', u'UNKNOWN'] \
+             + _TAGS_SUBJECT[-20:] + _TAGS_ORG[-20:]
+    sample *= rounds * 10
+    assert [list_tag_kind(tag) for tag in sample] == tags.tag_kinds(sample)
+    for name, func in (('list scan', lambda: [list_tag_kind(tag) for tag in sample]),
+                       ('dictionary', lambda: [tags.tag_kind(tag) for tag in sample]),
+                       ('batch', lambda: tags.tag_kinds(sample))):
+        start = time.time()
+        func()
+        elapsed = time.time() - start
+        print('%-10s %d tags %8.3f s %8.0f ns/tag' % (name, len(sample), elapsed, elapsed / len(sample) * 1e9))
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""\
+Compares titlefying the subjects of all cables of a source with the former
+``titlefy`` implementation (one regex alternation of all acronyms) against
+``titlefy`` and ``titlefy_many``. All results must be identical.
+
+Usage: python benchmark_titlefy.py cables.csv [rounds]
+"""
+import re
+import sys
+import time
+import string
+from cablemap.core import utils
+from cablemap.core.utils import cables_from_source, titlefy, titlefy_many
+
+_OLD_SMALL_PATTERN = re.compile(r'^(([0-9]+(th|st|rd|nd))|(a)|(an)|(and)|(as)|(at)|(but)|(by)|(en)|(for)|(if)|(in)|(of)|(on)|(or)|(the)|(to)|(v\.?)|(via)|(vs\.?))$', re.IGNORECASE)
+_OLD_BIG_PATTERN = re.compile(ur"^([%s]?(%s)|(xx+)|(XX+)|(\([A-Z]{2,4}\):?))(?:[%s]?)(([,:;\.\-])|(?:'|’)([a-z]{1,3}))?$" % (string.punctuation, r'|'.join(utils._ACRONYMS), string.punctuation), re.UNICODE|re.IGNORECASE)
+
+
+def old_titlefy(subject):
+    """\
+    The former implementation of ``cablemap.core.utils.titlefy``.
+    """
+    def clean_word(word):
+        return utils._APOS_PATTERN.sub(lambda m: u'%s%s%s' % (m.group(1), m.group(2) if not m.group(2) == ',' else u"'", m.group(3).lower()), word)
+    def titlefy_word(word):
+        if utils._is_number(word):
+            return word.lower()
+        if _OLD_BIG_PATTERN.match(word):
+            return clean_word(word.upper())
+        return clean_word(utils._SPECIAL_WORDS.get(word, word.title()))
+    if not subject:
+        return None if subject is None else u''
+    res = []
+    append = res.append
+    wl = subject.strip().split()
+    append(titlefy_word(wl[0]))
+    for word in wl[1:]:
+        if _OLD_SMALL_PATTERN.match(word):
+            if res[-1][-1] not in ':-':
+                if word == u'A' and res[-1] == u'and' and res[-2] == 'Q':
+                    append(word.upper())
+                else:
+                    append(word.lower())
+            else:
+                append(titlefy_word(word))
+        else:
+            append(titlefy_word(word))
+    return u' '.join(res)
+
+
+def measure(title, func, subjects, rounds):
+    start = time.time()
+    for i in range(rounds):
+        res = func(subjects)
+    elapsed = time.time() - start
+    count = len(subjects) * rounds
+    print('%-14s %d subjects %8.3f s %8.0f ns/subject' % (title, count, elapsed, elapsed / count * 1e9))
+    return res
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    subjects = [cable.subject for cable in cables_from_source(sys.argv[1])]
+    expected = measure('old titlefy', lambda subjects: [old_titlefy(s) for s in subjects], subjects, 1)
+    titlefy.cache_clear()
+    utils._titlefy_word.clear()
+    assert expected == measure('titlefy (cold)', lambda subjects: [titlefy(s) for s in subjects], subjects, 1)
+    # Cached words, uncached subjects
+    assert expected == measure('titlefy words', lambda subjects: [utils._titlefy(s) for s in subjects], subjects, rounds)
+    assert expected == measure('titlefy', lambda subjects: [titlefy(s) for s in subjects], subjects, rounds)
+    assert expected == measure('titlefy_many', titlefy_many, subjects, rounds)
+    print(titlefy.cache_info())
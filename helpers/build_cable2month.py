@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""\
+Creates the cable -> month index of cablemap.core (``cable2month.bin``) from
+a CSV file with ``<reference-id>,<month>`` rows.
+
+The source of the index is ``cablemap/core/cable2month.csv.gz``. Update the
+source and run this script to change the index.
+
+Usage: python build_cable2month.py [cable2month.csv[.gz]]
+"""
+import sys
+from cablemap.core import utils
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        print(__doc__)
+        sys.exit(1)
+    utils._build_cable2month(*sys.argv[1:])
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""\
+Parses the cables once and writes them into a cable store, c.f.
+``cablemap.core.store``. The store can be used as source for
+``handle_source`` afterwards.
+
+Prints the time to replay the source and the store.
+
+Usage: python build_store.py cables.csv ./cables.store
+"""
+import sys
+import time
+from cablemap.core import cables_from_source, handle_source
+from cablemap.core.handler import NoopCableHandler
+from cablemap.core.store import write_store, cables_from_store
+
+
+def measure(name, func):
+    start = time.time()
+    func()
+    print('%-30s %8.2f s' % (name, time.time() - start))
+
+
+def build_store(src, path):
+    measure('write store', lambda: write_store(path, cables_from_source(src)))
+    handler = NoopCableHandler()
+    measure('handle_source (source)', lambda: handle_source(src, handler))
+    measure('handle_source (store)', lambda: handle_source(path, handler))
+    columns = ('created', 'origin', 'classification', 'subject', 'tags', 'references')
+    measure('metadata columns (store)', lambda: sum(1 for _ in cables_from_store(path, columns=columns)))
+
+
+if __name__ == '__main__':
+    build_store(sys.argv[1] if len(sys.argv) > 1 else 'cables.csv',
+                sys.argv[2] if len(sys.argv) > 2 else './cables.store')
@@ -4,14 +4,15 @@ This module reports malformed cable ids.
 """
 import os
 import re
-from cablemap.core.consts import REFERENCE_ID_PATTERN, MALFORMED_CABLE_IDS, INVALID_CABLE_IDS
+from cablemap.core.consts import split_reference_ids, MALFORMED_CABLE_IDS, INVALID_CABLE_IDS
 
 def find_malformed_ids(in_dir):
     dct = {}
     for root, dirs, files in os.walk(in_dir):
-        for name in (n for n in files if '.html' in n):
-            reference_id = name[:name.rindex('.')]
-            if not REFERENCE_ID_PATTERN.match(reference_id):
+        names = [n for n in files if '.html' in n]
+        reference_ids = [name[:name.rindex('.')] for name in names]
+        for reference_id, name, parts in zip(reference_ids, names, split_reference_ids(reference_ids)):
+            if not parts:
                 dct[reference_id] = os.path.join(root, name)
     return dct
     
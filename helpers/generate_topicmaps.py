@@ -9,7 +9,8 @@ from mio.ctm.miohandler import CTMHandler
 from mio.xtm.miohandler import XTM21Handler
 from cablemap.core import handle_source, predicates as pred
 from cablemap.core.handler import DefaultMetadataOnlyFilter, DebitlyFilter, TeeCableHandler, \
-     MultipleCableHandler, DelegatingCableHandler, CableIdFilter
+     ParallelMultipleCableHandler, DelegatingCableHandler, NoopCableHandler, CableIdFilter, \
+     consumed_events, resolve_event
 from cablemap.tm import psis
 from cablemap.tm.handler import create_ctm_handler, create_xtm_handler, \
      create_ctm_miohandler, create_xtm_miohandler, MediaTitleResolver, BaseMIOCableHandler
@@ -38,16 +39,21 @@ class SubjectLocatorsCableHandler(BaseMIOCableHandler):
     def handle_wikileaks_iri(self, iri):
         self._handler.subjectLocator(iri)
 
+# The events which are issued by the ContentCableHandler
+_CONTENT_EVENTS = frozenset(['start', 'end', 'start_cable', 'end_cable', 'handle_content', 'handle_header'])
+
 class ContentCableHandler(DelegatingCableHandler):
     """\
     
     """
-    def __getattr__(self, name):
-        def noop(*args):
-            pass
-        if 'start' not in name and 'end' not in name and 'content' not in name and 'header' not in name:
-            return noop
-        return getattr(self._handler, name)
+    @property
+    def consumed_events(self):
+        return consumed_events(self._handler) & _CONTENT_EVENTS
+
+    def resolve_event(self, name):
+        if name not in _CONTENT_EVENTS:
+            return resolve_event(NoopCableHandler(), name)
+        return resolve_event(self._handler, name)
 
 def slo_handler(files, filename='cable-subject-locators'):
     ctm, xtm = openfile(filename + '.ctm'), openfile(filename + '.xtm')
@@ -62,6 +68,12 @@ def slo_handler(files, filename='cable-subject-locators'):
 def openfile(name):
     return open(os.path.join(os.path.dirname(__file__), name), 'wb')
 
+# Keeps the expanded bit.ly IRIs across runs
+_BITLY_CACHE = os.path.join(os.path.dirname(__file__), 'bitly-cache.txt')
+
+def debitly(handler):
+    return DebitlyFilter(handler, cache=_BITLY_CACHE, budget=2)
+
 def generate_topicmaps(src, handle_media=False):
     def tee(files, filename):
         ctm = openfile(filename + '.ctm')
@@ -73,16 +85,16 @@ def generate_topicmaps(src, handle_media=False):
     handlers = []
     european_handler = CableIdFilter(tee(files, 'european-cables'), pred.origin_filter(pred.origin_europe))
     all_cables_handler = tee(files, 'cables')
-    handlers.append(DefaultMetadataOnlyFilter(DebitlyFilter(TeeCableHandler(european_handler, all_cables_handler))))
+    handlers.append(DefaultMetadataOnlyFilter(debitly(TeeCableHandler(european_handler, all_cables_handler))))
     handlers.append(slo_handler(files))
     handlers.append(ContentCableHandler(tee(files, 'cable-content')))
     if handle_media:
         ctm, xtm = openfile('media-iris.ctm'), openfile('media-iris.xtm')
         files.append(ctm)
         files.append(xtm)
-        h = DebitlyFilter(MediaTitleResolver(handler.TeeMapHandler(create_ctm_miohandler(ctm), create_xtm_miohandler(xtm))))
+        h = debitly(MediaTitleResolver(handler.TeeMapHandler(create_ctm_miohandler(ctm), create_xtm_miohandler(xtm))))
         handlers.append(h)
-    handle_source(src, MultipleCableHandler(handlers))
+    handle_source(src, ParallelMultipleCableHandler(handlers))
     for f in files:
         f.close()
 